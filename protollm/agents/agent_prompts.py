@@ -8,7 +8,7 @@ from protollm.agents.agent_utils.parsers import (chat_parser, planner_parser,
 
 def build_planner_prompt(
     tools_rendered: str,
-    last_memory: str,
+    last_memory: str = "",
     n_steps: int = 5,
     additional_hints=None,
     problem_statement=None,
@@ -17,6 +17,12 @@ def build_planner_prompt(
     examples=None,
     image_description=None,
 ) -> ChatPromptTemplate:
+    """
+    Builds the prompt of the planner.
+
+    The static part of the prompt goes first, so the provider can reuse its cached prefix.
+    last_memory and image_description are the defaults, they can be passed on invoke with the input.
+    """
     image_description = image_description or "No attached."
     problem_statement = (
         problem_statement
@@ -70,12 +76,13 @@ def build_planner_prompt(
         {examples}
 
         Available tools: {tools_rendered}
-        Previous context: {last_memory}
         Additional hints: {additional_hints}
-        Decripton of attached image: {image_description}
-        User request: {input}
 
         {format_instructions}
+
+        Previous context: {last_memory}
+        Decripton of attached image: {image_description}
+        User request: {input}
         """
     return ChatPromptTemplate.from_messages(
         [("system", template), ("human", "{input}")]
@@ -94,12 +101,18 @@ def build_planner_prompt(
 
 def build_replanner_prompt(
     tools_rendered: str,
-    last_memory: str,
+    last_memory: str = "",
     problem_statement=None,
     rules=None,
     examples=None,
     additional_hint=None,
 ) -> ChatPromptTemplate:
+    """
+    Builds the prompt of the replanner.
+
+    The static part of the prompt goes first, so the provider can reuse its cached prefix.
+    last_memory is the default, it can be passed on invoke with the input, plan and past steps.
+    """
     problem_statement = (
         problem_statement
         or """You are a replanning expert. Your job is to adjust the original step-by-step plan based on completed tasks."""
@@ -139,14 +152,6 @@ def build_replanner_prompt(
     return ChatPromptTemplate.from_template(
         """
     {problem_statement}
-    
-    Objective: {input}
-
-    Original plan:
-    {plan}
-
-    Completed steps (remove these from plan):
-    {past_steps}
 
     Update the plan according to the following rules:
     {rules}
@@ -155,12 +160,21 @@ def build_replanner_prompt(
 
     {examples}
 
-    Context:
-    Previous memory: {last_memory}
     Available tools: {tools_rendered}
     Additional hints: {additional_hint}
 
     {format_instructions}
+
+    Context:
+    Previous memory: {last_memory}
+
+    Objective: {input}
+
+    Original plan:
+    {plan}
+
+    Completed steps (remove these from plan):
+    {past_steps}
     """
     ).partial(
         problem_statement=problem_statement,
@@ -184,6 +198,12 @@ def build_supervisor_prompt(
     examples=None,
     enhancemen_significance=None,
 ) -> ChatPromptTemplate:
+    """
+    Builds the prompt of the supervisor.
+
+    The static part of the prompt goes first, so the provider can reuse its cached prefix.
+    last_memory is the default, it can be passed on invoke with the input.
+    """
     tools_descp_for_agents = ""
     for agent, tools in tools_for_agents.items():
         tools_descp_for_agents += f"- {agent} has tools: {', '.join(tools)}\n"
@@ -229,15 +249,18 @@ def build_supervisor_prompt(
         + "Example outputs:\n"
         + examples
         + enhancemen_significance
-        + "Previous conversation context:\n"
-        f"{last_memory}\n\n"
-        "{format_instructions}"
+        + "{format_instructions}"
+        "Previous conversation context:\n"
+        "{last_memory}\n\n"
         "User request: {input}"
     )
 
     return ChatPromptTemplate.from_messages(
         [("system", supervisor_system_prompt)]
-    ).partial(format_instructions=supervisor_parser.get_format_instructions())
+    ).partial(
+        format_instructions=supervisor_parser.get_format_instructions(),
+        last_memory=last_memory,
+    )
 
 
 worker_prompt = "You are a helpful assistant. You can use provided tools. \
@@ -260,16 +283,19 @@ def build_summary_prompt(additional_hints="", problem_statement=None, rules=None
         You must double check that your respond is the answer to user query."""
     )
 
+    # The static part of the prompt goes first, so the provider can reuse its cached prefix
     summary_prompt = ChatPromptTemplate.from_template(
         """{problem_statement}
         {rules}
+        """
+        + additional_hints
+        + """
 
         Your objective is this:
         User query: {query};
         System_response: {system_response};
         intermediate_thoughts: {intermediate_thoughts};
         """
-        + additional_hints
     ).partial(problem_statement=problem_statement, rules=rules)
     return summary_prompt
 
@@ -343,10 +369,8 @@ def build_chat_prompt(
     """
     )
 
+    # The previous discussion goes last, so the provider can reuse the cached prefix of the prompt
     system = f"""
-    Here is what the user and system previously discussed:
-    {last_memory}
-
     {problem_statement}
 
     If a user asks about your capabilities, tell him something from this:
@@ -359,6 +383,9 @@ def build_chat_prompt(
     }}
     }}\n\n
     {chat_parser.get_format_instructions()}
+
+    Here is what the user and system previously discussed:
+    {last_memory}
     """
 
     return SystemMessage(content=system)
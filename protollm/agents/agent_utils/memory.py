@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+from langchain_core.embeddings import Embeddings
+from langgraph.store.base import BaseStore, PutOp
+from langgraph.store.memory import InMemoryStore
+
+
+class BaseMemory(ABC):
+    """
+    Long-term memory of the agents, the texts are stored per user and searched by their meaning.
+
+    The relevant memories are put into the state by initialize_state, the answers are saved by GraphBuilder.
+    """
+
+    def __init__(self, top_k: int = 3):
+        self.top_k = top_k
+
+    @abstractmethod
+    def add(self, user_id: str, texts: Sequence[str]) -> None:
+        """Saves the texts to the memory of the user"""
+
+    @abstractmethod
+    def search(self, user_id: str, query: str, k: Optional[int] = None) -> List[str]:
+        """Returns k memories of the user most relevant to the query"""
+
+    async def aadd(self, user_id: str, texts: Sequence[str]) -> None:
+        await asyncio.to_thread(self.add, user_id, texts)
+
+    async def asearch(
+        self, user_id: str, query: str, k: Optional[int] = None
+    ) -> List[str]:
+        return await asyncio.to_thread(self.search, user_id, query, k)
+
+    @staticmethod
+    def format(memories: Sequence[str]) -> str:
+        return "\n".join(f"- {memory}" for memory in memories)
+
+
+class StoreMemory(BaseMemory):
+    """
+    Memory based on a LangGraph store with a vector index, e.g. InMemoryStore or PostgresStore.
+
+    The memories of a user are kept in the (user_id, "memory") namespace.
+    """
+
+    def __init__(self, store: BaseStore, top_k: int = 3):
+        super().__init__(top_k)
+        self.store = store
+
+    @classmethod
+    def from_embeddings(
+        cls, embeddings: Embeddings, dims: int, top_k: int = 3
+    ) -> "StoreMemory":
+        """Creates the memory in the process memory, the search is done by cosine similarity"""
+        return cls(InMemoryStore(index={"embed": embeddings, "dims": dims}), top_k)
+
+    @staticmethod
+    def _get_namespace(user_id: str) -> tuple[str, str]:
+        return user_id, "memory"
+
+    def _get_put_ops(self, user_id: str, texts: Sequence[str]) -> List[PutOp]:
+        namespace = self._get_namespace(user_id)
+        return [
+            PutOp(namespace, str(uuid.uuid4()), {"text": text}, index=["text"])
+            for text in texts
+        ]
+
+    def add(self, user_id: str, texts: Sequence[str]) -> None:
+        # All the texts are embedded at once
+        self.store.batch(self._get_put_ops(user_id, texts))
+
+    async def aadd(self, user_id: str, texts: Sequence[str]) -> None:
+        await self.store.abatch(self._get_put_ops(user_id, texts))
+
+    def search(self, user_id: str, query: str, k: Optional[int] = None) -> List[str]:
+        items = self.store.search(
+            self._get_namespace(user_id), query=query, limit=k or self.top_k
+        )
+        return [item.value["text"] for item in items if "text" in item.value]
+
+    async def asearch(
+        self, user_id: str, query: str, k: Optional[int] = None
+    ) -> List[str]:
+        items = await self.store.asearch(
+            self._get_namespace(user_id), query=query, limit=k or self.top_k
+        )
+        return [item.value["text"] for item in items if "text" in item.value]
+
+
+class ChromaMemory(BaseMemory):
+    """
+    Memory based on a Chroma collection with HNSW index.
+
+    The collection is saved to persist_directory if it is set, so the memory is shared between the processes,
+    otherwise it is kept in the process memory.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        persist_directory: Optional[Union[str, Path]] = None,
+        collection_name: str = "agents_memory",
+        top_k: int = 3,
+    ):
+        from langchain_chroma import Chroma
+
+        super().__init__(top_k)
+        self.collection = Chroma(
+            collection_name=collection_name,
+            embedding_function=embeddings,
+            persist_directory=str(persist_directory) if persist_directory else None,
+            collection_metadata={"hnsw:space": "cosine"},
+        )
+
+    def add(self, user_id: str, texts: Sequence[str]) -> None:
+        self.collection.add_texts(
+            list(texts), metadatas=[{"user_id": user_id} for _ in texts]
+        )
+
+    async def aadd(self, user_id: str, texts: Sequence[str]) -> None:
+        await self.collection.aadd_texts(
+            list(texts), metadatas=[{"user_id": user_id} for _ in texts]
+        )
+
+    def search(self, user_id: str, query: str, k: Optional[int] = None) -> List[str]:
+        docs = self.collection.similarity_search(
+            query, k=k or self.top_k, filter={"user_id": user_id}
+        )
+        return [doc.page_content for doc in docs]
+
+    async def asearch(
+        self, user_id: str, query: str, k: Optional[int] = None
+    ) -> List[str]:
+        docs = await self.collection.asimilarity_search(
+            query, k=k or self.top_k, filter={"user_id": user_id}
+        )
+        return [doc.page_content for doc in docs]
@@ -1,7 +1,11 @@
 import base64
+import threading
 from io import BytesIO
+from typing import Any
 
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import HumanMessage
+from langchain_core.outputs import LLMResult
 from PIL import Image
 
 
@@ -36,3 +40,46 @@ def prompt_func(data):
     content_parts.append(text_part)
 
     return HumanMessage(content=content_parts)
+
+
+class PromptCacheCounter(BaseCallbackHandler):
+    """
+    Counts the prompt tokens of the LLM calls and the part of them read from the provider prefix cache.
+
+    The cached tokens are taken from the usage metadata of the responses, e.g. OpenAI API
+    and vLLM with --enable-prompt-tokens-details report them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.llm_calls = 0
+
+    @property
+    def prompt_tokens_saved(self) -> int:
+        return self.cached_prompt_tokens
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                cache_read = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                with self._lock:
+                    self.llm_calls += 1
+                    self.prompt_tokens += usage.get("input_tokens", 0)
+                    self.cached_prompt_tokens += cache_read
+
+    def reset(self):
+        with self._lock:
+            self.prompt_tokens = 0
+            self.cached_prompt_tokens = 0
+            self.llm_calls = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(llm_calls={self.llm_calls}, prompt_tokens={self.prompt_tokens}, "
+            f"prompt_tokens_saved={self.prompt_tokens_saved})"
+        )
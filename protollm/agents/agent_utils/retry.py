@@ -0,0 +1,206 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Optional
+
+from langchain_core.exceptions import OutputParserException
+
+# Parts of the exception class names of the network errors of the LLM providers clients
+_TRANSIENT_ERROR_NAMES = (
+    "Timeout",
+    "Connection",
+    "RateLimit",
+    "ServiceUnavailable",
+    "Overloaded",
+    "InternalServer",
+)
+
+_NOT_REPAIRED = object()
+
+
+class ErrorKind(str, Enum):
+    parse = "parse"  # the answer of the LLM can't be parsed, it is repaired or requested again at once
+    transient = "transient"  # network errors and overloaded provider, retried after a delay
+    fatal = "fatal"  # client errors, which won't disappear on retry
+    other = "other"  # any other error, retried after a delay
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """Defines how the node should react on the error"""
+    if isinstance(error, OutputParserException):
+        return ErrorKind.parse
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        if status_code in (408, 409, 429) or status_code >= 500:
+            return ErrorKind.transient
+        if 400 <= status_code < 500:
+            return ErrorKind.fatal
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return ErrorKind.transient
+    error_name = type(error).__name__
+    if any(name in error_name for name in _TRANSIENT_ERROR_NAMES):
+        return ErrorKind.transient
+    return ErrorKind.other
+
+
+class RetriesExhaustedError(Exception):
+    """The call has failed after all the attempts or the deadline is reached"""
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry policy shared by the universal agents nodes.
+
+    Parameters
+    ----------
+    max_retries : int
+        Maximum number of attempts of a call.
+    initial_delay : float
+        Delay before the second attempt in seconds, it is multiplied by backoff for each next attempt.
+    backoff : float
+        Multiplier of the delay.
+    max_delay : float
+        Upper bound of the delay in seconds.
+    jitter : float
+        Part of the delay, which is randomized, so the clients don't retry simultaneously.
+    deadline : float, optional
+        Maximum time in seconds spent on one request, no attempt is started after it.
+        GraphBuilder counts it from the start of the request, a node called directly counts it from its start.
+        An asynchronous attempt in progress is cancelled at the deadline, a synchronous one can't be
+        interrupted, so it is bounded only by the timeout of the LLM client.
+    """
+
+    max_retries: int = 1
+    initial_delay: float = 1.0
+    backoff: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 0.5
+    deadline: Optional[float] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RetryPolicy":
+        """
+        Returns the policy from config['configurable']['retry_policy'], which is a RetryPolicy
+        or a dict with its parameters. The number of attempts defaults to config['configurable']['max_retries'].
+        """
+        configurable = config["configurable"]
+        policy = configurable.get("retry_policy")
+        if isinstance(policy, RetryPolicy):
+            return policy
+        params = {"max_retries": configurable.get("max_retries", cls.max_retries)}
+        params.update(policy or {})
+        return cls(**params)
+
+    def get_deadline(self) -> Optional[float]:
+        """Returns the time.monotonic() value after which no attempts are started"""
+        if self.deadline is None:
+            return None
+        return time.monotonic() + self.deadline
+
+    def get_delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.initial_delay * self.backoff**attempt)
+        return delay * (1 - self.jitter * random.random())
+
+    def _next_delay(
+        self, error: Exception, attempt: int, deadline: Optional[float], name: str
+    ) -> Optional[float]:
+        """Returns the delay before the next attempt or None if the call must not be retried"""
+        kind = classify_error(error)
+        if kind is ErrorKind.fatal:
+            print(f"{name} failed: {error}. The error is not retryable")
+            return None
+        if attempt + 1 >= self.max_retries:
+            print(f"{name} failed: {error}. No retries left")
+            return None
+        delay = 0.0 if kind is ErrorKind.parse else self.get_delay(attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            print(f"{name} failed: {error}. Deadline is reached")
+            return None
+        print(f"{name} failed: {error}. Retry ({attempt + 1}/{self.max_retries})")
+        return delay
+
+
+def _repair(
+    error: Exception, repair: Optional[Callable[[OutputParserException], Any]], name: str
+) -> Any:
+    if repair is None or classify_error(error) is not ErrorKind.parse:
+        return _NOT_REPAIRED
+    try:
+        result = repair(error)
+    except Exception:
+        print(f"{name}: failed to recover from parser error")
+        return _NOT_REPAIRED
+    return _NOT_REPAIRED if result is None else result
+
+
+def run_with_retry(
+    call: Callable[[], Any],
+    policy: RetryPolicy,
+    name: str,
+    repair: Optional[Callable[[OutputParserException], Any]] = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Calls the function according to the retry policy.
+
+    If the result of the LLM can't be parsed, repair is called with the parser error first,
+    the result of repair is returned unless it is None.
+    Raises RetriesExhaustedError if all the attempts have failed.
+
+    The deadline only prevents new attempts, the attempt in progress isn't interrupted,
+    so the call should have its own timeout, e.g. the timeout of the LLM client.
+    """
+    if deadline is None:
+        deadline = policy.get_deadline()
+    for attempt in range(policy.max_retries):
+        try:
+            return call()
+        except Exception as error:
+            result = _repair(error, repair, name)
+            if result is not _NOT_REPAIRED:
+                return result
+            delay = policy._next_delay(error, attempt, deadline, name)
+            if delay is None:
+                raise RetriesExhaustedError(name) from error
+            time.sleep(delay)
+    raise RetriesExhaustedError(name)
+
+
+async def arun_with_retry(
+    call: Callable[[], Awaitable[Any]],
+    policy: RetryPolicy,
+    name: str,
+    repair: Optional[Callable[[OutputParserException], Any]] = None,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Asynchronous version of run_with_retry, the delays don't block the event loop.
+
+    The attempt in progress is cancelled at the deadline, the timeout is handled as a transient error.
+    """
+    if deadline is None:
+        deadline = policy.get_deadline()
+    for attempt in range(policy.max_retries):
+        try:
+            if deadline is None:
+                return await call()
+            return await asyncio.wait_for(call(), max(0.0, deadline - time.monotonic()))
+        except Exception as error:
+            result = _repair(error, repair, name)
+            if result is not _NOT_REPAIRED:
+                return result
+            delay = policy._next_delay(error, attempt, deadline, name)
+            if delay is None:
+                raise RetriesExhaustedError(name) from error
+            await asyncio.sleep(delay)
+    raise RetriesExhaustedError(name)
+
+
+def get_request_deadline(config: dict) -> Optional[float]:
+    """Returns the deadline of the current request set by GraphBuilder"""
+    return config["configurable"].get("request_deadline")
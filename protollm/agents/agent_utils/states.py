@@ -1,16 +1,191 @@
+import hashlib
+import json
 import operator
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Annotated, List, Set, Tuple
+from typing import Annotated, Any, Iterable, List, Optional, Tuple
 
+from langchain_core.messages import BaseMessage
+from langgraph.store.base import BaseStore, Op, PutOp, Result
+from langgraph.store.memory import InMemoryStore
 from typing_extensions import TypedDict
 
+from protollm.agents.agent_utils.memory import BaseMemory
+
+# Number of the last steps kept in past_steps, the older ones are compacted into one step with their tasks
+MAX_PAST_STEPS = 10
+# Maximum length of the compacted tasks of the older steps
+MAX_EARLIER_TASKS_LENGTH = 2000
+EARLIER_STEPS_TASK = "Earlier completed tasks"
+
+# Number of the last agents calls kept in nodes_calls
+MAX_NODES_CALLS = 50
+# Number of the last transcripts kept by the default transcripts store
+MAX_TRANSCRIPTS = 1000
+TRANSCRIPT_REFERENCE_PREFIX = "transcript:"
+TRANSCRIPTS_NAMESPACE = ("transcripts",)
+
+
+class BoundedInMemoryStore(InMemoryStore):
+    """InMemoryStore, which keeps max_items last put items, the older ones are deleted"""
+
+    def __init__(self, max_items: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_items = max_items
+        self._keys: OrderedDict = OrderedDict()
+        self._keys_lock = threading.Lock()
+
+    def _get_eviction_ops(self, ops: List[Op]) -> List[PutOp]:
+        with self._keys_lock:
+            for op in ops:
+                if not isinstance(op, PutOp):
+                    continue
+                if op.value is None:
+                    self._keys.pop((op.namespace, op.key), None)
+                else:
+                    self._keys[(op.namespace, op.key)] = None
+                    self._keys.move_to_end((op.namespace, op.key))
+            eviction_ops = []
+            while len(self._keys) > self.max_items:
+                (namespace, key), _ = self._keys.popitem(last=False)
+                eviction_ops.append(PutOp(namespace, key, None))
+            return eviction_ops
+
+    def batch(self, ops: Iterable[Op]) -> List[Result]:
+        ops = list(ops)
+        results = super().batch(ops)
+        eviction_ops = self._get_eviction_ops(ops)
+        if eviction_ops:
+            super().batch(eviction_ops)
+        return results
+
+    async def abatch(self, ops: Iterable[Op]) -> List[Result]:
+        ops = list(ops)
+        results = await super().abatch(ops)
+        eviction_ops = self._get_eviction_ops(ops)
+        if eviction_ops:
+            await super().abatch(eviction_ops)
+        return results
+
+
+# Default side store of the agents transcripts, nodes_calls keeps references to them.
+# It is replaced by config["configurable"]["transcripts_store"], e.g. by a persistent LangGraph store with TTL.
+transcripts_store: BaseStore = BoundedInMemoryStore(MAX_TRANSCRIPTS)
+
+
+def get_transcripts_store(config: Optional[dict] = None) -> BaseStore:
+    """Returns the transcripts store set by config["configurable"]["transcripts_store"] or the default one"""
+    store = (config or {}).get("configurable", {}).get("transcripts_store")
+    return store if store is not None else transcripts_store
+
+
+def _as_list(items: Optional[Iterable]) -> list:
+    if not items:
+        return []
+    if isinstance(items, (set, frozenset)):
+        # The order of a set is arbitrary, it is sorted to keep the prompts deterministic
+        return sorted(items, key=repr)
+    return list(items)
+
+
+def merge_past_steps(
+    left: Optional[Iterable[Tuple[str, str]]], right: Optional[Iterable[Tuple[str, str]]]
+) -> List[Tuple[str, str]]:
+    """
+    Reducer of past_steps, it keeps the (task, result) pairs in the order of their completion without duplicates.
+
+    Only the last MAX_PAST_STEPS steps are kept, the tasks of the older ones are compacted into
+    the first (EARLIER_STEPS_TASK, tasks) step, so the size of the prompts with the past steps is bounded.
+    """
+    steps, earlier_tasks = [], ""
+    for step in _as_list(left) + _as_list(right):
+        task, result = step
+        if task == EARLIER_STEPS_TASK:
+            # The update of a subgraph contains the compacted steps of the state it started with
+            earlier_tasks = max(earlier_tasks, result, key=len)
+        else:
+            steps.append((task, result))
+    steps = list(dict.fromkeys(steps))
+
+    if len(steps) > MAX_PAST_STEPS:
+        older_steps, steps = steps[:-MAX_PAST_STEPS], steps[-MAX_PAST_STEPS:]
+        tasks = earlier_tasks.split("; ") if earlier_tasks else []
+        # The steps of the state and of the update of a subgraph can be compacted twice
+        tasks.extend(
+            dict.fromkeys(
+                str(task) for task, _ in older_steps if str(task) not in tasks
+            )
+        )
+        earlier_tasks = "; ".join(tasks)
+        if len(earlier_tasks) > MAX_EARLIER_TASKS_LENGTH:
+            earlier_tasks = "..." + earlier_tasks[-MAX_EARLIER_TASKS_LENGTH:]
+    if earlier_tasks:
+        steps.insert(0, (EARLIER_STEPS_TASK, earlier_tasks))
+    return steps
+
+
+def _offload_transcript(transcript: Any, store: BaseStore) -> str:
+    """Saves the transcript to the transcripts store and returns the reference to it"""
+    if isinstance(transcript, str) and transcript.startswith(TRANSCRIPT_REFERENCE_PREFIX):
+        return transcript
+    if isinstance(transcript, str):
+        messages = [transcript]
+    else:
+        messages = [
+            (m.type, m.content) if isinstance(m, BaseMessage) else m for m in transcript
+        ]
+    data = json.dumps(messages, ensure_ascii=False, default=str)
+    # The same transcript has the same reference, so the state can be merged several times
+    key = hashlib.sha256(data.encode()).hexdigest()
+    store.put(TRANSCRIPTS_NAMESPACE, key, {"messages": json.loads(data)}, index=False)
+    return TRANSCRIPT_REFERENCE_PREFIX + key
+
+
+def offload_nodes_calls(
+    nodes_calls: Optional[Iterable[Tuple[str, Any]]], config: Optional[dict] = None
+) -> List[Tuple[str, str]]:
+    """
+    Saves the transcripts of the agents calls to the transcripts store of the config,
+    returns (node name, reference) pairs to update nodes_calls with.
+    """
+    store = get_transcripts_store(config)
+    return [
+        (node_name, _offload_transcript(transcript, store))
+        for node_name, transcript in _as_list(nodes_calls)
+    ]
+
+
+def merge_nodes_calls(
+    left: Optional[Iterable[Tuple[str, Any]]], right: Optional[Iterable[Tuple[str, Any]]]
+) -> List[Tuple[str, Any]]:
+    """
+    Reducer of nodes_calls, it keeps the (node name, transcript reference) pairs of the last MAX_NODES_CALLS calls
+    in their order. The transcripts are offloaded by the agent nodes with offload_nodes_calls,
+    the transcripts, which are not offloaded, are kept in the state as is.
+    """
+    calls = {}
+    for node_name, transcript in _as_list(left) + _as_list(right):
+        # The transcripts, which are not offloaded, are lists of messages, which are not hashable
+        key = (node_name, transcript if isinstance(transcript, str) else id(transcript))
+        calls.setdefault(key, (node_name, transcript))
+    return list(calls.values())[-MAX_NODES_CALLS:]
+
+
+def load_transcript(reference: str, config: Optional[dict] = None) -> Optional[list]:
+    """Returns the messages of the agent call by its reference from nodes_calls"""
+    item = get_transcripts_store(config).get(
+        TRANSCRIPTS_NAMESPACE, reference.removeprefix(TRANSCRIPT_REFERENCE_PREFIX)
+    )
+    return item.value["messages"] if item else None
+
 
 class PlanExecute(TypedDict):
     input: str
     plan: List[str]
 
-    past_steps: Annotated[Set[Tuple[str, str]], operator.or_]
-    nodes_calls: Annotated[Set[Tuple[str, tuple]], operator.or_]
+    past_steps: Annotated[List[Tuple[str, str]], merge_past_steps]
+    nodes_calls: Annotated[List[Tuple[str, str]], merge_nodes_calls]
 
     next: str
     response: str
@@ -25,28 +200,44 @@ class PlanExecute(TypedDict):
     attached_img: Path
 
 
-def load_summary(user_id: str) -> str:
-    from protollm.agents.universal_agents import store
+def initialize_state(
+    user_input: str, user_id: str, memory: Optional[BaseMemory] = None
+) -> PlanExecute:
+    """
+    Creates the initial state of the graph.
+
+    If the memory is set, last_memory contains the memories of the user most relevant to the input,
+    they are found by one search in the memory index. Otherwise, it is empty.
+    """
+    last_memory = ""
+    if memory is not None:
+        last_memory = memory.format(memory.search(user_id, user_input))
+    return _get_initial_state(user_input, last_memory)
+
 
-    namespace = (user_id, "memory")
-    item = store.get(namespace, "latest-summary")
-    return item.value.get("summary", "") if item else ""
+async def ainitialize_state(
+    user_input: str, user_id: str, memory: Optional[BaseMemory] = None
+) -> PlanExecute:
+    """Asynchronous version of initialize_state."""
+    last_memory = ""
+    if memory is not None:
+        last_memory = memory.format(await memory.asearch(user_id, user_input))
+    return _get_initial_state(user_input, last_memory)
 
 
-def initialize_state(user_input: str, user_id: str) -> PlanExecute:
-    memory = load_summary(user_id)
+def _get_initial_state(user_input: str, last_memory: str) -> PlanExecute:
     return {
         "input": user_input,
         "plan": [],
-        "past_steps": set(),
-        "nodes_calls": set(),
+        "past_steps": [],
+        "nodes_calls": [],
         "next": "",
         "response": "",
         "visualization": "",
         "language": "",
         "translation": "",
         "automl_results": "",
-        "last_memory": memory,
+        "last_memory": last_memory,
         "attached_img": "",
         "metadata": {},
     }
@@ -1,9 +1,21 @@
+from typing import List, Optional
+
+from langchain_core.runnables import Runnable, RunnableLambda
 from langgraph.graph import END, START, StateGraph
 
-from protollm.agents.agent_utils.states import PlanExecute, initialize_state
-from protollm.agents.universal_agents import (chat_node, plan_node,
-                                              replan_node, summary_node,
-                                              supervisor_node, web_search_node)
+from protollm.agents.agent_utils.memory import BaseMemory
+from protollm.agents.agent_utils.prompt_utils import PromptCacheCounter
+from protollm.agents.agent_utils.retry import RetryPolicy
+from protollm.agents.agent_utils.states import (PlanExecute,
+                                                ainitialize_state,
+                                                initialize_state)
+from protollm.agents.universal_agents import (achat_node, aplan_node,
+                                              areplan_node, asummary_node,
+                                              asupervisor_node, chat_node,
+                                              plan_node, replan_node,
+                                              summary_node, supervisor_node,
+                                              web_search_node,
+                                              with_offloaded_transcripts)
 
 
 class GraphBuilder:
@@ -16,10 +28,16 @@ class GraphBuilder:
             - configurable (dict): Configurations for the agents and tools.
                 - llm: BaseChatModel
                 - max_retries (int): Number of retries for failed tasks.
+                - retry_policy (RetryPolicy | dict, optional): Retry policy shared by the universal agents,
+                  the delays between the retries and the deadline of a request. By default only max_retries is limited.
                 - scenario_agents (list): List of scenario agent names.
                 - scenario_agent_funcs (dict): Mapping of agent names to their function (link on ready agent-node).
                 - tools_for_agents (dict): Description of tools available for each agent.
                 - tools_descp: Rendered descriptions of tools.
+                - memory (BaseMemory, optional): Long-term memory of the users, e.g. StoreMemory or ChromaMemory.
+                  The memories relevant to the input are passed to the agents, the answers are saved to it.
+                - transcripts_store (BaseStore, optional): Store of the agents transcripts from nodes_calls,
+                  e.g. a persistent LangGraph store with TTL. By default the last MAX_TRANSCRIPTS are kept in memory.
 
     Example:
         conf = {
@@ -27,6 +45,7 @@ class GraphBuilder:
             "configurable": {
                 "llm": model,
                 "max_retries": 1,
+                "retry_policy": {"initial_delay": 1.0, "jitter": 0.5, "deadline": 120},
                 "scenario_agents": ["chemist_node"],
                 "scenario_agent_funcs": {"chemist_node": chemist_node},
                 "tools_for_agents": {
@@ -35,10 +54,21 @@ class GraphBuilder:
                 "tools_descp": tools_rendered,
             }
         }
+
+    The graph can be run synchronously by 'stream' or asynchronously by 'astream' and 'ainvoke'.
+    In the asynchronous mode the universal agents don't block the event loop, and the scenario agents
+    chosen by the supervisor for one step are run concurrently. Scenario agents can be 'async def' functions,
+    the synchronous ones are run in threads then.
+
+    The prompt chains of the universal agents are built once for the configuration, the static part of
+    their prompts goes first, so the prefix cache of the provider (e.g. vLLM) is hit. 'prompt_cache_counter'
+    reports the prompt tokens and the prompt tokens saved by the cache over the runs of the graph.
     """
 
     def __init__(self, conf: dict):
         self.conf = conf
+        self.retry_policy = RetryPolicy.from_config(conf)
+        self.prompt_cache_counter = PromptCacheCounter()
         self.app = self._build()
 
     def _should_end_chat(self, state) -> str:
@@ -107,15 +137,20 @@ class GraphBuilder:
     def _build(self):
         """Build graph based on a non-dynamic agent skeleton"""
         workflow = StateGraph(PlanExecute)
-        workflow.add_node("chat", chat_node)
-        workflow.add_node("planner", plan_node)
-        workflow.add_node("supervisor", supervisor_node)
-        workflow.add_node("replan_node", replan_node)
-        workflow.add_node("summary", summary_node)
+        # Each node has synchronous and asynchronous implementations for stream and astream
+        workflow.add_node("chat", RunnableLambda(chat_node, afunc=achat_node))
+        workflow.add_node("planner", RunnableLambda(plan_node, afunc=aplan_node))
+        workflow.add_node(
+            "supervisor", RunnableLambda(supervisor_node, afunc=asupervisor_node)
+        )
+        workflow.add_node("replan_node", RunnableLambda(replan_node, afunc=areplan_node))
+        workflow.add_node("summary", RunnableLambda(summary_node, afunc=asummary_node))
 
         for agent_name, node in self.conf["configurable"][
             "scenario_agent_funcs"
         ].items():
+            if not isinstance(node, Runnable):
+                node = with_offloaded_transcripts(node)
             workflow.add_node(agent_name, node)
             workflow.add_edge(agent_name, "replan_node")
 
@@ -142,18 +177,96 @@ class GraphBuilder:
 
         return workflow.compile()
 
-    def stream(self, inputs: dict, image_path: str = "", user_id: str = "1"):
-        """Start streaming the input through the graph."""
+    @property
+    def memory(self) -> Optional[BaseMemory]:
+        return self.conf["configurable"].get("memory")
+
+    def _initialize_state(self, inputs: dict, image_path: str, user_id: str) -> PlanExecute:
+        if 'attached_img' in inputs.keys():
+            image_path = inputs['attached_img']
+
+        state = initialize_state(
+            user_input=inputs["input"], user_id=user_id, memory=self.memory
+        )
+        state["attached_img"] = image_path
+        return state
+
+    async def _ainitialize_state(
+        self, inputs: dict, image_path: str, user_id: str
+    ) -> PlanExecute:
         if 'attached_img' in inputs.keys():
             image_path = inputs['attached_img']
-        
-        state = initialize_state(user_input=inputs["input"], user_id=user_id)
+
+        state = await ainitialize_state(
+            user_input=inputs["input"], user_id=user_id, memory=self.memory
+        )
         state["attached_img"] = image_path
+        return state
 
-        for event in self.app.stream(state, config=self.conf):
-            for k, v in event.items():
-                yield (v)
+    @staticmethod
+    def _get_memory_records(inputs: dict, response) -> List[str]:
+        if not isinstance(response, str) or not response:
+            return []
+        return [f"Question: {inputs['input']}\nAnswer: {response}"]
+
+    def _save_memory(self, inputs: dict, response, user_id: str):
+        records = self._get_memory_records(inputs, response)
+        if self.memory is not None and records:
+            self.memory.add(user_id, records)
+
+    async def _asave_memory(self, inputs: dict, response, user_id: str):
+        records = self._get_memory_records(inputs, response)
+        if self.memory is not None and records:
+            await self.memory.aadd(user_id, records)
+
+    def _get_run_config(self) -> dict:
+        """Returns the config of one request, the deadline of its retries is counted from now"""
+        callbacks = self.conf.get("callbacks")
+        if callbacks is None or isinstance(callbacks, list):
+            callbacks = [*(callbacks or []), self.prompt_cache_counter]
+        else:
+            callbacks = callbacks.copy()
+            callbacks.add_handler(self.prompt_cache_counter)
+        return {
+            **self.conf,
+            "callbacks": callbacks,
+            "configurable": {
+                **self.conf["configurable"],
+                "retry_policy": self.retry_policy,
+                "request_deadline": self.retry_policy.get_deadline(),
+            },
+        }
+
+    @staticmethod
+    def _print_answer(v):
         try:
             print("\n\nFINALLY ANSWER: ", v["response"].content)
         except:
             print("\n\nFINALLY ANSWER: ", v["response"])
+
+    def stream(self, inputs: dict, image_path: str = "", user_id: str = "1"):
+        """Start streaming the input through the graph."""
+        state = self._initialize_state(inputs, image_path, user_id)
+
+        for event in self.app.stream(state, config=self._get_run_config()):
+            for k, v in event.items():
+                yield (v)
+        self._print_answer(v)
+        self._save_memory(inputs, v.get("response"), user_id)
+
+    async def astream(self, inputs: dict, image_path: str = "", user_id: str = "1"):
+        """Start streaming the input through the graph asynchronously."""
+        state = await self._ainitialize_state(inputs, image_path, user_id)
+
+        async for event in self.app.astream(state, config=self._get_run_config()):
+            for k, v in event.items():
+                yield (v)
+        self._print_answer(v)
+        await self._asave_memory(inputs, v.get("response"), user_id)
+
+    async def ainvoke(self, inputs: dict, image_path: str = "", user_id: str = "1") -> dict:
+        """Run the input through the graph asynchronously and return the final state."""
+        state = await self._ainitialize_state(inputs, image_path, user_id)
+        result = await self.app.ainvoke(state, config=self._get_run_config())
+        await self._asave_memory(inputs, result.get("response"), user_id)
+        return result
@@ -1,12 +1,14 @@
-import copy
+import dataclasses
+import inspect
 import json
-import time
-from typing import Annotated, Dict, List, Union
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
 
 from langchain_core.exceptions import OutputParserException
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import create_react_agent
-from langgraph.store.memory import InMemoryStore
 from langgraph.types import Command
 
 from protollm.agents.agent_prompts import (build_chat_prompt,
@@ -22,10 +24,15 @@ from protollm.agents.agent_utils.prompt_utils import (convert_to_base64,
                                                       prompt_func)
 from protollm.agents.agent_utils.pydantic_models import (Plan, ReplanAction,
                                                          Response)
-from protollm.tools.web_tools import web_tools_rendered
+from protollm.agents.agent_utils.retry import (RetriesExhaustedError,
+                                               RetryPolicy, arun_with_retry,
+                                               get_request_deadline,
+                                               run_with_retry)
+from protollm.agents.agent_utils.states import offload_nodes_calls
+from protollm.tools.web_tools import CachedTool, web_tools_rendered
 
-# TODO: make real embedder, not dummy
-store = InMemoryStore(index={"embed": lambda x: [[1.0, 2.0] for _ in x], "dims": 2})
+# Maximum length of the result of a past step in the prompts
+MAX_STEP_RESULT_LENGTH = 4000
 
 
 def subgraph_start_node(state, config):
@@ -37,6 +44,181 @@ def subgraph_end_node(state, config):
     return state
 
 
+# Maximum number of the agents and chains kept for reuse, e.g. for several GraphBuilder configurations
+MAX_CACHED_AGENTS = 64
+
+
+class _AgentsCache:
+    """
+    Thread-safe cache of the agents and chains, the least recently used ones are evicted above max_size.
+
+    The objects, which ids are used in the key, are kept together with the value, so their ids are not reused
+    while the value is cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any], *key_objects: Any) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (key_objects, build())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return self._entries[key][1]
+
+
+_agents_cache = _AgentsCache(MAX_CACHED_AGENTS)
+
+
+def _get_worker_agent(llm, tools: list):
+    """
+    Returns the ReAct agent for the llm and the tools, it is created once for the same llm and tools objects.
+    """
+    key = ("worker_agent", id(llm), *(id(tool) for tool in tools))
+    return _agents_cache.get(
+        key, lambda: create_react_agent(llm, tools, prompt=worker_prompt), llm, tools
+    )
+
+
+def _get_chain(build_chain: Callable, llm, *args):
+    """
+    Returns the chain built by build_chain(llm, *args), it is built once for the llm object and the values
+    of the other arguments, so the changed prompts give a new chain. The dynamic fields of the prompt are passed on invoke.
+    """
+    key = (build_chain, id(llm), json.dumps(args, sort_keys=True, default=str))
+    return _agents_cache.get(key, lambda: build_chain(llm, *args), llm)
+
+
+def _offload_update_transcripts(update, config: dict):
+    """Replaces the transcripts in nodes_calls of the node update by their references in the transcripts store"""
+    if isinstance(update, Command) and isinstance(update.update, dict):
+        if "nodes_calls" in update.update:
+            nodes_calls = offload_nodes_calls(update.update["nodes_calls"], config)
+            return dataclasses.replace(
+                update, update={**update.update, "nodes_calls": nodes_calls}
+            )
+    elif isinstance(update, dict) and "nodes_calls" in update:
+        return {**update, "nodes_calls": offload_nodes_calls(update["nodes_calls"], config)}
+    return update
+
+
+def with_offloaded_transcripts(agent_func: Callable) -> Callable:
+    """
+    Wraps the agent function to offload the transcripts of its nodes_calls
+    to the transcripts store of the config, the state keeps only the references to them.
+    """
+    takes_config = len(inspect.signature(agent_func).parameters) > 1
+
+    if inspect.iscoroutinefunction(agent_func):
+
+        async def async_agent_node(state, config):
+            update = await (
+                agent_func(state, config) if takes_config else agent_func(state)
+            )
+            return _offload_update_transcripts(update, config)
+
+        return async_agent_node
+
+    def agent_node(state, config):
+        update = agent_func(state, config) if takes_config else agent_func(state)
+        return _offload_update_transcripts(update, config)
+
+    return agent_node
+
+
+def _with_parallel_task(agent_func: Callable, node_name: str) -> Callable:
+    """Wraps the agent function to add its task from state['parallel_tasks'] to state"""
+
+    if inspect.iscoroutinefunction(agent_func):
+
+        async def async_agent_node(state, config):
+            state = state.copy()
+            state["task"] = state["parallel_tasks"][node_name]
+            return await agent_func(state, config)
+
+        return async_agent_node
+
+    def agent_node(state, config):
+        state = state.copy()
+        state["task"] = state["parallel_tasks"][node_name]
+        return agent_func(state, config)
+
+    return agent_node
+
+
+@lru_cache(maxsize=128)
+def _get_parallel_subgraph(agents: Tuple[Tuple[str, Callable], ...]):
+    """
+    Compiles the subgraph, which runs the agents in parallel, once for each combination of agents.
+
+    Parameters
+    ----------
+    agents : tuple
+        Pairs of the node name in the subgraph and the agent function.
+
+    Returns
+    -------
+    CompiledStateGraph
+        The subgraph, each agent gets its task from state['parallel_tasks'] by the node name.
+        If the subgraph is run asynchronously, the agents are run concurrently.
+    """
+    from protollm.agents.agent_utils.states import PlanExecute
+
+    subgraph = StateGraph(PlanExecute)
+    subgraph.add_node("subgraph_start_node", subgraph_start_node)
+    subgraph.add_node("subgraph_end_node", subgraph_end_node)
+    subgraph.add_edge(START, "subgraph_start_node")
+    for node_name, agent_func in agents:
+        subgraph.add_node(
+            node_name,
+            _with_parallel_task(with_offloaded_transcripts(agent_func), node_name),
+        )
+        subgraph.add_edge("subgraph_start_node", node_name)
+        subgraph.add_edge(node_name, "subgraph_end_node")
+    subgraph.add_edge("subgraph_end_node", END)
+    return subgraph.compile()
+
+
+def _get_web_agent(config: dict):
+    llm = config["configurable"]["llm"]
+
+    if "web_tools" in config["configurable"].keys():
+        web_tools = config["configurable"]["web_tools"]
+    else:
+        from protollm.tools.web_tools import web_tools
+
+    web_tools = list(web_tools or [])
+    # The tools are wrapped once, so their results are reused by the next calls
+    cached_tools = _agents_cache.get(
+        ("web_tools", *(id(tool) for tool in web_tools)),
+        lambda: [
+            tool if isinstance(tool, CachedTool) else CachedTool(tool)
+            for tool in web_tools
+        ],
+        web_tools,
+    )
+    return _get_worker_agent(llm, cached_tools)
+
+
+def _web_search_update(task: str, agent_response: dict, config: dict) -> Command:
+    for i, m in enumerate(agent_response["messages"]):
+        if m.content == []:
+            agent_response["messages"][i].content = ""
+    return Command(
+        update={
+            "past_steps": [(task, agent_response["messages"][-1].content)],
+            # the state keeps the reference to the transcript in the transcripts store
+            "nodes_calls": offload_nodes_calls(
+                [("web_search", agent_response["messages"])], config
+            ),
+        }
+    )
+
+
 def web_search_node(state: dict, config: dict):
     """
     Executes a web search task using a language model (LLM) and predefined web tools.
@@ -50,6 +232,7 @@ def web_search_node(state: dict, config: dict):
         Configuration dictionary containing:
             - 'llm' (BaseChatModel): An instance of the language model used for reasoning and task execution.
             - 'max_retries' (int): The maximum number of retry attempts if the web search fails.
+            - 'retry_policy' (RetryPolicy | dict, optional): Delays and deadline of the retries.
             - 'web_tools' (List[BaseTool]): A list of predefined web tools to be used by the agent (can be empty).
     Returns
     -------
@@ -59,50 +242,127 @@ def web_search_node(state: dict, config: dict):
     Notes
     -----
     - If web tools are not provided, the function creates an agent without them.
+    - The agent is created once for the same llm and web tools and reused by the next calls.
+    - The results of the web tools are cached, the tools are wrapped by CachedTool.
     - The function attempts to perform the task from the first step of the plan.
-    - Retries are handled with exponential backoff on failure.
+    - Retries are handled by the retry policy with exponential backoff and jitter.
     - If all attempts fail, returns a fallback response.
     """
-    llm = config["configurable"]["llm"]
-    max_retries = config["configurable"]["max_retries"]
+    retry_policy = RetryPolicy.from_config(config)
+    web_agent = _get_web_agent(config)
+    task = state["task"]
 
-    if "web_tools" in config["configurable"].keys():
-        web_tools = config["configurable"]["web_tools"]
-    else:
-        from protollm.tools.web_tools import web_tools
+    def search():
+        agent_response = web_agent.invoke(
+            {"messages": [("user", task + " You must search!")]}
+        )
+        return _web_search_update(task, agent_response, config)
+
+    try:
+        return run_with_retry(
+            search, retry_policy, "Web Search", deadline=get_request_deadline(config)
+        )
+    except RetriesExhaustedError:
+        return None
 
-    web_agent = create_react_agent(llm, web_tools or [], prompt=worker_prompt)
+
+async def aweb_search_node(state: dict, config: dict):
+    """Asynchronous version of web_search_node."""
+    retry_policy = RetryPolicy.from_config(config)
+    web_agent = _get_web_agent(config)
     task = state["task"]
 
-    for attempt in range(max_retries):
-        try:
-            agent_response = web_agent.invoke(
-                {"messages": [("user", task + " You must search!")]}
-            )
-            for i, m in enumerate(agent_response["messages"]):
-                if m.content == []:
-                    agent_response["messages"][i].content = ""
-            return Command(
-                update={
-                    "past_steps": Annotated[set, "or_"](
-                        {(task, agent_response["messages"][-1].content)}
-                    ),
-                    "nodes_calls": Annotated[set, "or_"](
-                        {
-                            (
-                                "web_search",
-                                tuple(
-                                    (m.type, m.content)
-                                    for m in agent_response["messages"]
-                                ),
-                            )
-                        }
-                    ),
-                }
+    async def search():
+        agent_response = await web_agent.ainvoke(
+            {"messages": [("user", task + " You must search!")]}
+        )
+        return _web_search_update(task, agent_response, config)
+
+    try:
+        return await arun_with_retry(
+            search, retry_policy, "Web Search", deadline=get_request_deadline(config)
+        )
+    except RetriesExhaustedError:
+        return None
+
+
+def _get_supervisor_chain(config: dict):
+    config["configurable"]["tools_for_agents"]["web_search"] = [web_tools_rendered]
+    return _get_chain(
+        _build_supervisor_chain,
+        config["configurable"]["llm"],
+        config["configurable"]["scenario_agents"],
+        config["configurable"]["tools_for_agents"],
+        config["configurable"]["prompts"]["supervisor"],
+    )
+
+
+def _build_supervisor_chain(
+    llm, scenario_agents: list, tools_for_agents: dict, prompts: dict
+):
+    problem_statement = prompts["problem_statement"]
+    problem_statement_continue = prompts["problem_statement_continue"]
+    rules = prompts["rules"]
+    examples = prompts["examples"]
+    additional_rules = prompts["additional_rules"]
+    enhancemen_significance = prompts["enhancemen_significance"]
+
+    return (
+        build_supervisor_prompt(
+            scenario_agents,
+            tools_for_agents,
+            problem_statement=problem_statement,
+            problem_statement_continue=problem_statement_continue,
+            rules=rules,
+            examples=examples,
+            additional_rules=additional_rules,
+            enhancemen_significance=enhancemen_significance,
+        )
+        | llm
+        | supervisor_parser
+    )
+
+
+def _get_supervisor_task(plan: list) -> Tuple[Union[str, list], str]:
+    plan_str = "\n".join(f"{i + 1}. {step}" for i, step in enumerate(plan))
+    task = plan[0]
+    task_formatted = f"""For the following plan:
+    {plan_str}\n\nYou are tasked with executing: {task}."""
+    return task, task_formatted
+
+
+def _get_parallel_run(state: dict, config: dict, task: Union[str, list], response):
+    """Returns the subgraph with the agents chosen by the supervisor and its input state"""
+    agents, parallel_tasks = [], {}
+    for i, node_name in enumerate(response.next):
+        # get task for current agent from plan
+        if isinstance(task, list) and i < len(task):
+            task_for_agent = task[i]
+        else:
+            task_for_agent = task
+
+        # the same agent can be called several times with different tasks
+        subgraph_node_name = (
+            node_name if node_name not in parallel_tasks else f"{node_name}_{i}"
+        )
+        agents.append(
+            (
+                subgraph_node_name,
+                config["configurable"]["scenario_agent_funcs"][node_name],
             )
-        except Exception as e:
-            print(f"Web Search failed: {str(e)}. Retrying ({attempt+1}/{max_retries})")
-            time.sleep(1.2**attempt)
+        )
+        parallel_tasks[subgraph_node_name] = task_for_agent
+
+    subgraph = _get_parallel_subgraph(tuple(agents))
+    return subgraph, {**state, "parallel_tasks": parallel_tasks}
+
+
+def _supervisor_fallback(state: dict) -> dict:
+    state[
+        "response"
+    ] = "I can't answer your question right now. Maybe I can assist with something else?"
+    state["end"] = True
+    return state
 
 
 def supervisor_node(state: Dict[str, Union[str, List[str]]], config: dict) -> Command:
@@ -120,6 +380,7 @@ def supervisor_node(state: Dict[str, Union[str, List[str]]], config: dict) -> Co
         Configuration dictionary containing:
             - 'llm' (BaseChatModel): An instance of a language model used by the supervisor.
             - 'max_retries' (int): Maximum number of retry attempts in case of errors.
+            - 'retry_policy' (RetryPolicy | dict, optional): Delays and deadline of the retries.
             - 'scenario_agents' (list): List of agents/tools and their descriptions for prompt building.
             - 'tools_for_agents' (dict): Mapping of tools available to each agent.
     Returns
@@ -130,7 +391,7 @@ def supervisor_node(state: Dict[str, Union[str, List[str]]], config: dict) -> Co
     Raises
     ------
     Exception
-        Handles API call errors by applying exponential backoff on retries.
+        Handles API call errors by applying the retry policy, client errors are not retried.
 
     Notes
     -----
@@ -138,27 +399,42 @@ def supervisor_node(state: Dict[str, Union[str, List[str]]], config: dict) -> Co
     - If no plan or input is available, prompts the user to rephrase their request.
     - If all retries fail, returns a fallback message suggesting alternative assistance.
     """
-    llm = config["configurable"]["llm"]
-    max_retries = config["configurable"]["max_retries"]
-    scenario_agents = config["configurable"]["scenario_agents"]
-    tools_for_agents = config["configurable"]["tools_for_agents"]
+    retry_policy = RetryPolicy.from_config(config)
+    supervisor_chain = _get_supervisor_chain(config)
 
-    problem_statement = config["configurable"]["prompts"]["supervisor"][
-        "problem_statement"
-    ]
-    problem_statement_continue = config["configurable"]["prompts"]["supervisor"][
-        "problem_statement_continue"
-    ]
-    rules = config["configurable"]["prompts"]["supervisor"]["rules"]
-    examples = config["configurable"]["prompts"]["supervisor"]["examples"]
-    additional_rules = config["configurable"]["prompts"]["supervisor"][
-        "additional_rules"
-    ]
-    enhancemen_significance = config["configurable"]["prompts"]["supervisor"][
-        "enhancemen_significance"
-    ]
+    plan = state.get("plan")
 
-    config["configurable"]["tools_for_agents"]["web_search"] = [web_tools_rendered]
+    if not plan and not state.get("input"):
+        return {
+            "response": "I can't answer your question right now. Maybe I can assist with something else?",
+            "end": True,
+        }
+
+    task, task_formatted = _get_supervisor_task(plan)
+
+    def supervise():
+        response = supervisor_chain.invoke({"input": [("user", task_formatted)]})
+
+        if response.next == []:
+            return state
+
+        subgraph, subgraph_state = _get_parallel_run(state, config, task, response)
+        return subgraph.invoke(subgraph_state, config)
+
+    try:
+        return run_with_retry(
+            supervise, retry_policy, "Supervisor", deadline=get_request_deadline(config)
+        )
+    except RetriesExhaustedError:
+        return _supervisor_fallback(state)
+
+
+async def asupervisor_node(
+    state: Dict[str, Union[str, List[str]]], config: dict
+) -> Command:
+    """Asynchronous version of supervisor_node, the chosen agents are run concurrently."""
+    retry_policy = RetryPolicy.from_config(config)
+    supervisor_chain = _get_supervisor_chain(config)
 
     plan = state.get("plan")
 
@@ -168,98 +444,23 @@ def supervisor_node(state: Dict[str, Union[str, List[str]]], config: dict) -> Co
             "end": True,
         }
 
-    plan_str = "\n".join(f"{i + 1}. {step}" for i, step in enumerate(plan))
-    task = plan[0]
-    task_formatted = f"""For the following plan:
-    {plan_str}\n\nYou are tasked with executing: {task}."""
+    task, task_formatted = _get_supervisor_task(plan)
 
-    supervisor_chain = (
-        build_supervisor_prompt(
-            scenario_agents,
-            tools_for_agents,
-            problem_statement=problem_statement,
-            problem_statement_continue=problem_statement_continue,
-            rules=rules,
-            examples=examples,
-            additional_rules=additional_rules,
-            enhancemen_significance=enhancemen_significance,
-        )
-        | llm
-        | supervisor_parser
-    )
+    async def supervise():
+        response = await supervisor_chain.ainvoke({"input": [("user", task_formatted)]})
 
-    for attempt in range(max_retries):
-        try:
-            from protollm.agents.agent_utils.states import PlanExecute
-
-            response = supervisor_chain.invoke({"input": [("user", task_formatted)]})
-            subgraph = StateGraph(PlanExecute)
-            subgraph.add_node("subgraph_start_node", subgraph_start_node)
-            subgraph.add_node("subgraph_end_node", subgraph_end_node)
-            subgraph.add_edge(START, "subgraph_start_node")
-            added_nodes = []
-
-            if response.next == []:
-                return state
-
-            for i, node_name in enumerate(response.next):
-                # get task for current agent from plan
-                task_for_agent = None
-                if isinstance(task, list) and i < len(task):
-                    task_for_agent = task[i]
-                else:
-                    task_for_agent = task
-
-                if node_name in added_nodes:
-                    import random
-
-                    node_name_new = node_name + str(random.randint(1000, 10000))
-                    node_copy = copy.deepcopy(
-                        config["configurable"]["scenario_agent_funcs"][node_name]
-                    )
-
-                    # Wrap the agent function to add needed task to state
-                    def wrapped_agent_func(s, func=node_copy, task=task_for_agent):
-                        "Wrappe"
-                        s = s.copy()
-                        s["task"] = task
-                        return func(s, config)
-
-                    subgraph.add_node(node_name_new, wrapped_agent_func)
-                    subgraph.add_edge("subgraph_start_node", node_name_new)
-                    subgraph.add_edge(node_name_new, "subgraph_end_node")
-                else:
-                    agent_func = config["configurable"]["scenario_agent_funcs"][
-                        node_name
-                    ]
-
-                    def wrapped_agent_func(s, func=agent_func, task=task_for_agent):
-                        s = s.copy()
-                        s["task"] = task
-                        return func(s, config)
-
-                    subgraph.add_node(node_name, wrapped_agent_func)
-                    subgraph.add_edge("subgraph_start_node", node_name)
-                    subgraph.add_edge(node_name, "subgraph_end_node")
-
-                added_nodes.append(node_name)
-            subgraph.add_edge("subgraph_end_node", END)
-            subgraph = subgraph.compile()
-
-            res = subgraph.invoke(state, config)
-            return res
-
-        except Exception as e:
-            print(
-                f"Supervisor error: {str(e)}. Retrying attempt ({attempt + 1}/{max_retries})"
-            )
-            time.sleep(2**attempt)  # Exponential backoff
+        if response.next == []:
+            return state
 
-    state[
-        "response"
-    ] = "I can't answer your question right now. Maybe I can assist with something else?"
-    state["end"] = True
-    return state
+        subgraph, subgraph_state = _get_parallel_run(state, config, task, response)
+        return await subgraph.ainvoke(subgraph_state, config)
+
+    try:
+        return await arun_with_retry(
+            supervise, retry_policy, "Supervisor", deadline=get_request_deadline(config)
+        )
+    except RetriesExhaustedError:
+        return _supervisor_fallback(state)
 
 
 def format_plan(plan: List[Dict[str, List[str]]]) -> str:
@@ -273,98 +474,96 @@ def format_plan(plan: List[Dict[str, List[str]]]) -> str:
     return result
 
 
-def plan_node(
-    state: Dict[str, Union[str, List[Dict]]], config: dict
-) -> Union[Dict[str, List[Dict]], Command]:
-    """
-    Generates an execution plan using a language model (LLM) based on the provided input.
-    Handles both text and image inputs.
-    """
-    image_path = state.get("attached_img", "")
+def format_past_steps(
+    past_steps: List[Tuple[str, str]], max_result_length: int = MAX_STEP_RESULT_LENGTH
+) -> str:
+    """Make past steps for the prompts, the long results are cut to keep the size of the prompt bounded"""
+    steps = []
+    for task, result in past_steps:
+        result = str(result)
+        if len(result) > max_result_length:
+            result = result[:max_result_length] + "..."
+        steps.append((task, result))
+    return str(steps)
+
+
+def _get_vision_model(config: dict):
+    return config["configurable"].get("visual_model", config["configurable"]["llm"])
+
+
+def _build_image_description_messages(image_path: str) -> list:
+    img_context = convert_to_base64(image_path)
+    return [
+        build_vision_prompt(),
+        prompt_func(
+            {
+                "text": f"USER QUESTION: describe the image",
+                "image": [img_context],
+            }
+        ),
+    ]
 
-    llm = config["configurable"]["llm"]
-    max_retries = config["configurable"]["max_retries"]
-    tools_descp = config["configurable"]["tools_descp"]
 
-    problem_statement = config["configurable"]["prompts"]["planner"][
-        "problem_statement"
-    ]
-    adds_prompt = config["configurable"]["prompts"]["planner"]["additional_hints"]
-    rules = config["configurable"]["prompts"]["planner"]["rules"]
-    examples = config["configurable"]["prompts"]["planner"]["examples"]
-    desc_restrictions = config["configurable"]["prompts"]["planner"][
-        "desc_restrictions"
-    ]
+def _get_planner(config: dict, llm):
+    return _get_chain(
+        _build_planner,
+        llm,
+        config["configurable"]["tools_descp"],
+        config["configurable"]["prompts"]["planner"],
+    )
 
-    last_memory = state.get("last_memory", "")
 
-    # prepare input with optional image
-    if len(image_path) > 1:
-        llm = config["configurable"].get("visual_model", config["configurable"]["llm"])
-        img_context = convert_to_base64(image_path)
-        messages = [
-            build_vision_prompt(),
-            prompt_func(
-                {
-                    "text": f"USER QUESTION: describe the image",
-                    "image": [img_context],
-                }
-            ),
-        ]
-        image_description = llm.invoke(messages).content
-    else:
-        image_description = None
+def _build_planner(llm, tools_descp: str, prompts: dict):
+    problem_statement = prompts["problem_statement"]
+    adds_prompt = prompts["additional_hints"]
+    rules = prompts["rules"]
+    examples = prompts["examples"]
+    desc_restrictions = prompts["desc_restrictions"]
 
-    planner = (
+    return (
         build_planner_prompt(
             tools_descp,
-            last_memory,
             additional_hints=adds_prompt,
             problem_statement=problem_statement,
             rules=rules,
             examples=examples,
             desc_restrictions=desc_restrictions,
-            image_description=image_description,
         )
         | llm
         | planner_parser
     )
 
-    query = state["input"]
 
-    for attempt in range(max_retries):
-        try:
-            plan = planner.invoke({"input": query})
+def _get_planner_inputs(state: dict, image_description: Optional[str]) -> dict:
+    return {
+        "input": state["input"],
+        "last_memory": state.get("last_memory", ""),
+        "image_description": image_description or "No attached.",
+    }
 
-            state["plan"] = plan.steps
-            print('PLAN: \n' + str(plan.steps))
-            return state
 
-        except OutputParserException as e:
-            # try to extract error
-            try:
-                error_str = str(e)
-                start_idx = error_str.find('{"steps"')
-                end_idx = error_str.rfind("}") + 1
-
-                if start_idx != -1 and end_idx != -1:
-                    json_str = error_str[start_idx:end_idx]
-                    partial_output = json.loads(json_str)
-
-                    # make plan from succces part of response
-                    plan = Plan(steps=partial_output["steps"])
-                    state["plan"] = plan.steps
-                    print('PLAN: \n' + str(plan.steps))
-                    return state
-            except:
-                print(
-                    f"Failed to recover from parser error. Retry ({attempt + 1}/{max_retries})"
-                )
-
-        except Exception as e:
-            print(f"Planner failed: {e}. Retry ({attempt + 1}/{max_retries})")
-            time.sleep(2**attempt)
+def _recover_plan(error: OutputParserException) -> Optional[Plan]:
+    """Makes plan from the success part of the response, which failed to be parsed"""
+    error_str = str(error)
+    start_idx = error_str.find('{"steps"')
+    end_idx = error_str.rfind("}") + 1
 
+    if start_idx != -1 and end_idx != -1:
+        json_str = error_str[start_idx:end_idx]
+        partial_output = json.loads(json_str)
+        return Plan(steps=partial_output["steps"])
+    return None
+
+
+def _apply_plan(state: dict, plan: Optional[Plan]) -> Optional[dict]:
+    if plan is None:
+        return None
+    state["plan"] = plan.steps
+    print('PLAN: \n' + str(plan.steps))
+    return state
+
+
+def _plan_fallback() -> Command:
     return Command(
         update={
             "response": "I can't answer your question right now. Maybe I can assist with something else?"
@@ -372,29 +571,98 @@ def plan_node(
     )
 
 
-def replan_node(
+def plan_node(
     state: Dict[str, Union[str, List[Dict]]], config: dict
-) -> Union[Dict[str, Union[List[Dict], str]], Command]:
+) -> Union[Dict[str, List[Dict]], Command]:
     """
-    Refines or adjusts an existing execution plan based on previous steps and current state.
+    Generates an execution plan using a language model (LLM) based on the provided input.
+    Handles both text and image inputs.
     """
+    image_path = state.get("attached_img", "")
+
     llm = config["configurable"]["llm"]
-    max_retries = config["configurable"]["max_retries"]
-    tools_descp = config["configurable"]["tools_descp"]
+    retry_policy = RetryPolicy.from_config(config)
 
-    problem_statement = config["configurable"]["prompts"]["replanner"][
-        "problem_statement"
-    ]
-    adds_prompt = config["configurable"]["prompts"]["replanner"]["additional_hints"]
-    rules = config["configurable"]["prompts"]["replanner"]["rules"]
-    examples = config["configurable"]["prompts"]["replanner"]["examples"]
+    # prepare input with optional image
+    if len(image_path) > 1:
+        llm = _get_vision_model(config)
+        image_description = llm.invoke(
+            _build_image_description_messages(image_path)
+        ).content
+    else:
+        image_description = None
 
-    last_memory = state.get("last_memory", "")
+    planner = _get_planner(config, llm)
+    inputs = _get_planner_inputs(state, image_description)
+
+    try:
+        return run_with_retry(
+            lambda: _apply_plan(state, planner.invoke(inputs)),
+            retry_policy,
+            "Planner",
+            # try to extract the plan from the response, which failed to be parsed
+            repair=lambda error: _apply_plan(state, _recover_plan(error)),
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _plan_fallback()
+
+
+async def aplan_node(
+    state: Dict[str, Union[str, List[Dict]]], config: dict
+) -> Union[Dict[str, List[Dict]], Command]:
+    """Asynchronous version of plan_node."""
+    image_path = state.get("attached_img", "")
+
+    llm = config["configurable"]["llm"]
+    retry_policy = RetryPolicy.from_config(config)
 
-    replanner = (
+    # prepare input with optional image
+    if len(image_path) > 1:
+        llm = _get_vision_model(config)
+        image_description = (
+            await llm.ainvoke(_build_image_description_messages(image_path))
+        ).content
+    else:
+        image_description = None
+
+    planner = _get_planner(config, llm)
+    inputs = _get_planner_inputs(state, image_description)
+
+    async def make_plan():
+        return _apply_plan(state, await planner.ainvoke(inputs))
+
+    try:
+        return await arun_with_retry(
+            make_plan,
+            retry_policy,
+            "Planner",
+            # try to extract the plan from the response, which failed to be parsed
+            repair=lambda error: _apply_plan(state, _recover_plan(error)),
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _plan_fallback()
+
+
+def _get_replanner(config: dict):
+    return _get_chain(
+        _build_replanner,
+        config["configurable"]["llm"],
+        config["configurable"]["tools_descp"],
+        config["configurable"]["prompts"]["replanner"],
+    )
+
+
+def _build_replanner(llm, tools_descp: str, prompts: dict):
+    problem_statement = prompts["problem_statement"]
+    adds_prompt = prompts["additional_hints"]
+    rules = prompts["rules"]
+    examples = prompts["examples"]
+
+    return (
         build_replanner_prompt(
             tools_descp,
-            last_memory,
             additional_hint=adds_prompt,
             problem_statement=problem_statement,
             rules=rules,
@@ -404,56 +672,50 @@ def replan_node(
         | replanner_parser
     )
 
-    query = state["input"]
+
+def _get_replanner_inputs(state: dict) -> dict:
     current_plan = state.get("plan", [])
-    past_steps = set(state.get("past_steps", []))
+    return {
+        "input": state["input"],
+        "last_memory": state.get("last_memory", ""),
+        "plan": format_plan(current_plan),
+        "past_steps": format_past_steps(state.get("past_steps", [])),
+    }
+
+
+def _apply_replan(state: dict, output, formatted_past: str) -> dict:
+    if output.action == "response":
+        state["response"] = output.response
+        return state
+    print('\n\nLast steps (RePlanner see): \n' + formatted_past + '\n')
+    print('\n\nPLAN from RePlanner: \n' + str(output.steps or []) + '\n\n')
+
+    state["plan"] = output.steps or []
+    state["next"] = "supervisor"
+    return state
 
-    for attempt in range(max_retries):
-        try:
-            formatted_plan = format_plan(current_plan)
-            formatted_past = str([i for i in set(past_steps)])
 
-            output = replanner.invoke(
-                {"input": query, "plan": formatted_plan, "past_steps": formatted_past}
-            )
+def _recover_replan(state: dict, error: OutputParserException) -> Optional[dict]:
+    """Applies the success part of the response, which failed to be parsed"""
+    error_str = str(error)
+    start_idx = error_str.find('{"action"')
+    end_idx = error_str.rfind("}") + 1
+
+    if start_idx != -1 and end_idx != -1:
+        json_str = error_str[start_idx:end_idx]
+        partial_output = json.loads(json_str)
+
+        action = ReplanAction(**partial_output)
 
-            if output.action == "response":
-                state["response"] = output.response
-                return state
-            else:
-                print('\n\nLast steps (RePlanner see): \n' + formatted_past + '\n')
-                print('\n\nPLAN from RePlanner: \n' +str(output.steps or []) + '\n\n')
-
-                state["plan"] = output.steps or []
-                state["next"] = "supervisor"
-                return state
-
-        except OutputParserException as e:
-            try:
-                error_str = str(e)
-                start_idx = error_str.find('{"action"')
-                end_idx = error_str.rfind("}") + 1
-
-                if start_idx != -1 and end_idx != -1:
-                    json_str = error_str[start_idx:end_idx]
-                    partial_output = json.loads(json_str)
-
-                    action = ReplanAction(**partial_output)
-
-                    if action.action == "response":
-                        state["response"] = action.response
-                    else:
-                        state["plan"] = action.steps or []
-                    return state
-            except:
-                print(
-                    f"Failed to recover from parser error. Retry ({attempt + 1}/{max_retries})"
-                )
-
-        except Exception as e:
-            print(f"Replanner failed: {e}. Retry ({attempt + 1}/{max_retries})")
-            time.sleep(2**attempt)
+        if action.action == "response":
+            state["response"] = action.response
+        else:
+            state["plan"] = action.steps or []
+        return state
+    return None
 
+
+def _replan_fallback() -> Command:
     return Command(
         goto=END,
         update={
@@ -462,6 +724,89 @@ def replan_node(
     )
 
 
+def replan_node(
+    state: Dict[str, Union[str, List[Dict]]], config: dict
+) -> Union[Dict[str, Union[List[Dict], str]], Command]:
+    """
+    Refines or adjusts an existing execution plan based on previous steps and current state.
+    """
+    retry_policy = RetryPolicy.from_config(config)
+    replanner = _get_replanner(config)
+
+    def replan():
+        inputs = _get_replanner_inputs(state)
+        output = replanner.invoke(inputs)
+        return _apply_replan(state, output, inputs["past_steps"])
+
+    try:
+        return run_with_retry(
+            replan,
+            retry_policy,
+            "Replanner",
+            repair=lambda error: _recover_replan(state, error),
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _replan_fallback()
+
+
+async def areplan_node(
+    state: Dict[str, Union[str, List[Dict]]], config: dict
+) -> Union[Dict[str, Union[List[Dict], str]], Command]:
+    """Asynchronous version of replan_node."""
+    retry_policy = RetryPolicy.from_config(config)
+    replanner = _get_replanner(config)
+
+    async def replan():
+        inputs = _get_replanner_inputs(state)
+        output = await replanner.ainvoke(inputs)
+        return _apply_replan(state, output, inputs["past_steps"])
+
+    try:
+        return await arun_with_retry(
+            replan,
+            retry_policy,
+            "Replanner",
+            repair=lambda error: _recover_replan(state, error),
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _replan_fallback()
+
+
+def _get_summary_agent(config: dict):
+    return _get_chain(
+        _build_summary_agent,
+        config["configurable"]["llm"],
+        config["configurable"]["prompts"]["summary"],
+    )
+
+
+def _build_summary_agent(llm, prompts: dict):
+    problem_statement = prompts["problem_statement"]
+    additional_hints = prompts["additional_hints"]
+    rules = prompts["rules"]
+
+    return build_summary_prompt(additional_hints, problem_statement, rules) | llm
+
+
+def _get_summary_inputs(state: dict) -> dict:
+    return {
+        "query": state["input"],
+        "system_response": state["response"],
+        "intermediate_thoughts": format_past_steps(state["past_steps"]),
+    }
+
+
+def _summary_fallback() -> Command:
+    return Command(
+        goto=END,
+        update={
+            "response": "I can't answer your question right now. Maybe I can assist with something else?"
+        },
+    )
+
+
 def summary_node(
     state: Dict[str, Union[str, List[str]]], config: dict
 ) -> Union[Dict[str, str], Command]:
@@ -476,6 +821,7 @@ def summary_node(
         Configuration dictionary containing:
             - 'llm' (BaseChatModel): An instance of the language model used for generating summaries.
             - 'max_retries' (int): The maximum number of attempts to retry the summary generation in case of errors.
+            - 'retry_policy' (RetryPolicy | dict, optional): Delays and deadline of the retries.
 
     Returns
     -------
@@ -488,53 +834,51 @@ def summary_node(
     -----
     - Uses summary_prompt and the language model to create summaries.
     """
-    llm = config["configurable"]["llm"]
-    max_retries = config["configurable"]["max_retries"]
-
-    problem_statement = config["configurable"]["prompts"]["summary"][
-        "problem_statement"
-    ]
-    additional_hints = config["configurable"]["prompts"]["summary"]["additional_hints"]
-    rules = config["configurable"]["prompts"]["summary"]["rules"]
-
-    system_response = state["response"]
-    query = state["input"]
-    past_steps = state["past_steps"]
-
-    summary_agent = (
-        build_summary_prompt(additional_hints, problem_statement, rules) | llm
-    )
-
-    for attempt in range(max_retries):
-        try:
-            output = summary_agent.invoke(
-                {
-                    "query": query,
-                    "system_response": system_response,
-                    "intermediate_thoughts": past_steps,
-                }
-            )
-            state["response"] = output.content
-            return state
+    retry_policy = RetryPolicy.from_config(config)
+    summary_agent = _get_summary_agent(config)
+    inputs = _get_summary_inputs(state)
+
+    def summarize():
+        state["response"] = summary_agent.invoke(inputs).content
+        return state
+
+    try:
+        return run_with_retry(
+            summarize,
+            retry_policy,
+            "Summary generation",
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _summary_fallback()
 
-        except Exception as e:
-            print(
-                f"Summary generation failed: {e}. Retry ({attempt + 1}/{max_retries})"
-            )
-            time.sleep(2**attempt)
 
-    return Command(
-        goto=END,
-        update={
-            "response": "I can't answer your question right now. Maybe I can assist with something else?"
-        },
-    )
+async def asummary_node(
+    state: Dict[str, Union[str, List[str]]], config: dict
+) -> Union[Dict[str, str], Command]:
+    """Asynchronous version of summary_node."""
+    retry_policy = RetryPolicy.from_config(config)
+    summary_agent = _get_summary_agent(config)
+    inputs = _get_summary_inputs(state)
+
+    async def summarize():
+        state["response"] = (await summary_agent.ainvoke(inputs)).content
+        return state
+
+    try:
+        return await arun_with_retry(
+            summarize,
+            retry_policy,
+            "Summary generation",
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        return _summary_fallback()
 
 
-def chat_node(state, config: dict):
+def _get_chat_llm_and_messages(state: dict, config: dict) -> tuple:
     problem_statement = config["configurable"]["prompts"]["chat"]["problem_statement"]
     additional_hints = config["configurable"]["prompts"]["chat"]["additional_hints"]
-    max_retries = config["configurable"]["max_retries"]
 
     input_text = state.get("input", "")
     image_path = state.get("attached_img")
@@ -563,23 +907,49 @@ def chat_node(state, config: dict):
             ),
             prompt_func({"text": f"USER QUESTION: {input_text}\n"}),
         ]
+    return llm, messages
 
-    for attempt in range(max_retries):
-        try:
-            output = chat_parser.parse(llm.invoke(messages).content)
-
-            if isinstance(output.action, Response):
-                state["response"] = output.action.response
-                return state
-            else:
-                state["next"] = output.action.next
-                state["visualization"] = None
-                return state
-
-        except Exception as e:
-            print(
-                f"Chat failed with error: {str(e)}. Retrying... ({attempt+1}/{max_retries})"
-            )
-            time.sleep(1.2**attempt)
-    state["response"] = None
-    return state
+
+def _apply_chat_output(state: dict, content: str) -> dict:
+    output = chat_parser.parse(content)
+
+    if isinstance(output.action, Response):
+        state["response"] = output.action.response
+        return state
+    else:
+        state["next"] = output.action.next
+        state["visualization"] = None
+        return state
+
+
+def chat_node(state, config: dict):
+    retry_policy = RetryPolicy.from_config(config)
+    llm, messages = _get_chat_llm_and_messages(state, config)
+
+    try:
+        return run_with_retry(
+            lambda: _apply_chat_output(state, llm.invoke(messages).content),
+            retry_policy,
+            "Chat",
+            deadline=get_request_deadline(config),
+        )
+    except RetriesExhaustedError:
+        state["response"] = None
+        return state
+
+
+async def achat_node(state, config: dict):
+    """Asynchronous version of chat_node."""
+    retry_policy = RetryPolicy.from_config(config)
+    llm, messages = _get_chat_llm_and_messages(state, config)
+
+    async def chat():
+        return _apply_chat_output(state, (await llm.ainvoke(messages)).content)
+
+    try:
+        return await arun_with_retry(
+            chat, retry_policy, "Chat", deadline=get_request_deadline(config)
+        )
+    except RetriesExhaustedError:
+        state["response"] = None
+        return state
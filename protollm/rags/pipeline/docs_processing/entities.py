@@ -26,6 +26,13 @@ class LoaderType(str, Enum):
     odt = 'odt'
     rtf = 'rtf'
     pdf = 'pdf'
+    txt = 'txt'
+    md = 'md'
+    markdown = 'markdown'
+    html = 'html'
+    htm = 'htm'
+    xlsx = 'xlsx'
+    pptx = 'pptx'
     directory = 'directory'
     zip = 'zip'
     json = 'json'
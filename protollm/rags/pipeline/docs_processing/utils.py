@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Any
 
 from protollm.raw_data_processing.docs_parsers.loaders import PDFLoader, WordDocumentLoader, ZipLoader, \
-    RecursiveDirectoryLoader
+    RecursiveDirectoryLoader, TextDocumentLoader, ExcelLoader, PresentationLoader
 from langchain_core.document_loaders import BaseLoader
 
 from protollm.rags.pipeline.docs_processing.entities import LoaderType, LangChainDocumentLoader
@@ -24,6 +24,12 @@ def get_loader(**loader_params) -> BaseLoader:
             return LangChainDocumentLoader(**loader_params)
         case LoaderType.docx | LoaderType.doc | LoaderType.rtf | LoaderType.odt:
             return WordDocumentLoader(**loader_params)
+        case LoaderType.txt | LoaderType.md | LoaderType.markdown | LoaderType.html | LoaderType.htm:
+            return TextDocumentLoader(**loader_params)
+        case LoaderType.xlsx:
+            return ExcelLoader(**loader_params)
+        case LoaderType.pptx:
+            return PresentationLoader(**loader_params)
 
     parsing_scheme = loader_params.pop('parsing_scheme', 'lines')
     extract_images = loader_params.pop('extract_images', False)
@@ -41,6 +47,11 @@ def get_loader(**loader_params) -> BaseLoader:
         word_doc_extract_tables=extract_tables,
         word_doc_parse_formulas=parse_formulas,
         word_doc_remove_service_info=remove_service_info,
+        text_parsing_scheme=parsing_scheme,
+        text_extract_tables=extract_tables,
+        excel_parsing_scheme=parsing_scheme,
+        presentation_parsing_scheme=parsing_scheme,
+        presentation_extract_tables=extract_tables,
         **loader_params,
     )
     match doc_extension:
@@ -2,6 +2,7 @@ import warnings
 from typing import Any, Optional, Callable, Dict
 
 from langchain_core.documents import Document
+from langchain_core.stores import BaseStore
 
 from langchain_chroma import Chroma
 
@@ -10,6 +11,8 @@ from dataclasses import dataclass
 from langchain_community.embeddings.sentence_transformer import SentenceTransformerEmbeddings
 from chromadb import ClientAPI
 
+from protollm.raw_data_processing.docs_transformers.metadata_sentence_splitter import expand_parent_documents
+
 
 @dataclass
 class DocsSearcherModels:
@@ -19,14 +22,17 @@ class DocsSearcherModels:
 
 class DocRetriever:
     def __init__(self, top_k: int, docs_searcher_models: DocsSearcherModels,
-                 preprocess_query: Optional[Callable[[str], str]] = None):
+                 preprocess_query: Optional[Callable[[str], str]] = None,
+                 parent_store: Optional[BaseStore[str, Document]] = None):
         """
         :param preprocess_query: for example, get keywords from query
+        :param parent_store: store of the parent documents, if the sentences were split with it
         """
         self.top_k = top_k
         self.embedding_function = docs_searcher_models.embedding_model
         self.client = docs_searcher_models.chroma_client
         self.preprocess_query = preprocess_query
+        self.parent_store = parent_store
 
     def retrieve_top(self, collection_name: str, query: str, filter: Optional[Dict[str, Any]] = None) \
             -> Optional[list[Document]]:
@@ -51,7 +57,10 @@ class DocRetriever:
             collection_name=collection_name,
             embedding_function=self.embedding_function,
         )
-        return store.as_retriever(search_kwargs={'k': self.top_k, 'filter': _filter}).invoke(query)
+        docs = store.as_retriever(search_kwargs={'k': self.top_k, 'filter': _filter}).invoke(query)
+        if self.parent_store is not None:
+            docs = expand_parent_documents(docs, self.parent_store)
+        return docs
 
 
 class RetrievingPipeline:
@@ -1,4 +1,7 @@
-from doc_loader import WordDocumentLoader
-from directory_loader import RecursiveDirectoryLoader
-from pdf_loader import PDFLoader
-from zip_loader import ZipLoader
+from protollm.raw_data_processing.docs_parsers.loaders.doc_loader import WordDocumentLoader
+from protollm.raw_data_processing.docs_parsers.loaders.directory_loader import RecursiveDirectoryLoader
+from protollm.raw_data_processing.docs_parsers.loaders.pdf_loader import PDFLoader
+from protollm.raw_data_processing.docs_parsers.loaders.zip_loader import ZipLoader
+from protollm.raw_data_processing.docs_parsers.loaders.text_loader import TextDocumentLoader
+from protollm.raw_data_processing.docs_parsers.loaders.excel_loader import ExcelLoader
+from protollm.raw_data_processing.docs_parsers.loaders.presentation_loader import PresentationLoader
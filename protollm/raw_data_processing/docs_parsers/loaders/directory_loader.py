@@ -1,7 +1,7 @@
+import os
 from pathlib import Path
 from typing import Iterator, Union, Any, Optional, Sequence
 
-from langchain_community.document_loaders.directory import _is_visible
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
 from tqdm import tqdm
@@ -12,6 +12,56 @@ from protollm.raw_data_processing.docs_parsers.loaders.pdf_loader import PDFLoad
 from protollm.raw_data_processing.docs_parsers.utils.utilities import correct_path_encoding
 from protollm.raw_data_processing.docs_parsers.loaders.doc_loader import WordDocumentLoader
 from protollm.raw_data_processing.docs_parsers.loaders.zip_loader import ZipLoader
+from protollm.raw_data_processing.docs_parsers.loaders.text_loader import TextDocumentLoader
+from protollm.raw_data_processing.docs_parsers.loaders.excel_loader import ExcelLoader
+from protollm.raw_data_processing.docs_parsers.loaders.presentation_loader import PresentationLoader
+from protollm.raw_data_processing.docs_parsers.utils.parallel import parallel_map
+
+
+def _walk_files(directory: Path) -> Iterator[Path]:
+    """
+    Yields visible files of the directory and its subdirectories as soon as they are found.
+
+    Hidden files and directories are skipped, symbolic links to directories are not followed.
+    """
+    directories = [directory]
+    while directories:
+        current_directory = directories.pop()
+        try:
+            with os.scandir(current_directory) as scandir_it:
+                entries = sorted(scandir_it, key=lambda entry: entry.name)
+        except PermissionError:
+            continue
+        subdirectories = []
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(Path(entry.path))
+                elif entry.is_file():
+                    yield Path(entry.path)
+            except OSError:
+                continue
+        directories.extend(reversed(subdirectories))
+
+
+def _load_file(
+    loader_cls: type[BaseLoader],
+    file_path: Path,
+    loader_kwargs: dict[str, Any],
+    silent_errors: bool,
+) -> tuple[list[Document], dict[str, list[str]], Optional[Exception]]:
+    """Loads a file in a worker process, the parsing logs and error are returned to the main process"""
+    logger = ParsingLogger(silent_errors=silent_errors, name=__name__)
+    documents = []
+    try:
+        loader = loader_cls(file_path, parsing_logger=logger, **loader_kwargs)
+        for document in loader.lazy_load():
+            documents.append(document)
+    except Exception as error:
+        return documents, logger.logs, error
+    return documents, logger.logs, None
 
 
 class RecursiveDirectoryLoader(BaseLoader):
@@ -27,14 +77,25 @@ class RecursiveDirectoryLoader(BaseLoader):
         pdf_extract_tables: bool = False,
         pdf_extract_formulas: bool = False,
         pdf_remove_service_info: bool = False,
+        pdf_stream_by_pages: bool = False,
         word_doc_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
         word_doc_extract_images: bool = False,
         word_doc_extract_tables: bool = False,
         word_doc_extract_formulas: bool = False,
+        text_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        text_extract_tables: bool = False,
+        excel_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        presentation_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        presentation_extract_tables: bool = False,
         timeout_for_converting: Optional[int] = None,
+        workers_for_converting: Optional[int] = None,
+        cache_for_converting: Optional[Union[str, Path]] = None,
+        cache_for_parsing: Optional[Union[str, Path]] = None,
         exclude_files: Sequence[Union[Path, str]] = (),
         parsing_logger: Optional[ParsingLogger] = None,
         silent_errors: bool = False,
+        max_workers: Optional[int] = None,
+        preserve_order: bool = True,
         **kwargs: Any,
     ) -> None:
         """Initialize with a directory path."""
@@ -54,6 +115,8 @@ class RecursiveDirectoryLoader(BaseLoader):
             "extract_tables": pdf_extract_tables,
             "extract_formulas": pdf_extract_formulas,
             "remove_headers": pdf_remove_service_info,
+            "stream_by_pages": pdf_stream_by_pages,
+            "cache_for_parsing": cache_for_parsing,
             "parsing_logger": self._logger,
         }
         self._word_doc_kwargs = {
@@ -62,6 +125,26 @@ class RecursiveDirectoryLoader(BaseLoader):
             "extract_tables": word_doc_extract_tables,
             "extract_formulas": word_doc_extract_formulas,
             "timeout_for_converting": timeout_for_converting,
+            "workers_for_converting": workers_for_converting,
+            "cache_for_converting": cache_for_converting,
+            "cache_for_parsing": cache_for_parsing,
+            "parsing_logger": self._logger,
+        }
+        self._text_kwargs = {
+            "parsing_scheme": text_parsing_scheme,
+            "extract_tables": text_extract_tables,
+            "cache_for_parsing": cache_for_parsing,
+            "parsing_logger": self._logger,
+        }
+        self._excel_kwargs = {
+            "parsing_scheme": excel_parsing_scheme,
+            "cache_for_parsing": cache_for_parsing,
+            "parsing_logger": self._logger,
+        }
+        self._presentation_kwargs = {
+            "parsing_scheme": presentation_parsing_scheme,
+            "extract_tables": presentation_extract_tables,
+            "cache_for_parsing": cache_for_parsing,
             "parsing_logger": self._logger,
         }
         self._zip_kwargs = {
@@ -70,15 +153,26 @@ class RecursiveDirectoryLoader(BaseLoader):
             "pdf_extract_tables": pdf_extract_tables,
             "pdf_extract_formulas": pdf_extract_formulas,
             "pdf_remove_service_info": pdf_remove_service_info,
+            "pdf_stream_by_pages": pdf_stream_by_pages,
             "word_doc_parsing_scheme": word_doc_parsing_scheme,
             "word_doc_extract_images": word_doc_extract_images,
             "word_doc_extract_tables": word_doc_extract_tables,
             "word_doc_extract_formulas": word_doc_extract_formulas,
+            "text_parsing_scheme": text_parsing_scheme,
+            "text_extract_tables": text_extract_tables,
+            "excel_parsing_scheme": excel_parsing_scheme,
+            "presentation_parsing_scheme": presentation_parsing_scheme,
+            "presentation_extract_tables": presentation_extract_tables,
             "timeout_for_converting": timeout_for_converting,
+            "workers_for_converting": workers_for_converting,
+            "cache_for_converting": cache_for_converting,
+            "cache_for_parsing": cache_for_parsing,
             "exclude_files": exclude_files,
             "parsing_logger": self._logger,
         }
-        self._exclude_names = [Path(file).name for file in exclude_files]
+        self._exclude_names = {Path(file).name for file in exclude_files}
+        self.max_workers = max_workers
+        self.preserve_order = preserve_order
 
     @property
     def logs(self):
@@ -88,28 +182,64 @@ class RecursiveDirectoryLoader(BaseLoader):
         self,
     ) -> Iterator[Document]:
         """Lazy load given path"""
-        paths = [
-            path
-            for path in self.file_path.rglob("**/[!.]*")
-            if path.is_file()
-            and _is_visible(path)
-            and path.name not in self._exclude_names
-            and correct_path_encoding(path.name) not in self._exclude_names
-        ]
+        loaders = self._get_loaders(_walk_files(self.file_path))
+        if self.max_workers and self.max_workers > 1:
+            yield from self._parallel_load(loaders)
+            return
+        for path, loader_cls, loader_kwargs in loaders:
+            _loader = loader_cls(path, **loader_kwargs)
+            yield from _loader.lazy_load()
+
+    def _get_loaders(
+        self, paths: Iterator[Path]
+    ) -> Iterator[tuple[Path, type[BaseLoader], dict[str, Any]]]:
         for path in tqdm(paths, desc="Directory processing", ncols=80):
+            if path.name in self._exclude_names:
+                continue
             doc_type = BaseParser.get_doc_type(path)
             match doc_type:
                 case DocType.pdf:
-                    _loader = PDFLoader(path, **self._pdf_kwargs)
+                    loader_cls, loader_kwargs = PDFLoader, self._pdf_kwargs
                 case DocType.docx | DocType.doc | DocType.odt | DocType.rtf:
-                    _loader = WordDocumentLoader(path, **self._word_doc_kwargs)
+                    loader_cls, loader_kwargs = WordDocumentLoader, self._word_doc_kwargs
                 case DocType.zip:
-                    _loader = ZipLoader(path, **self._zip_kwargs)
+                    loader_cls, loader_kwargs = ZipLoader, self._zip_kwargs
+                case DocType.txt | DocType.md | DocType.html:
+                    loader_cls, loader_kwargs = TextDocumentLoader, self._text_kwargs
+                case DocType.xlsx:
+                    loader_cls, loader_kwargs = ExcelLoader, self._excel_kwargs
+                case DocType.pptx:
+                    loader_cls, loader_kwargs = PresentationLoader, self._presentation_kwargs
                 case _:
                     self._logger.info(
                         f"Skip file processing, no suitable loader for {path}"
                     )
                     continue
+            if correct_path_encoding(path.name) in self._exclude_names:
+                continue
 
             self._logger.info(f"Processing file: {path}")
-            yield from _loader.lazy_load()
+            yield path, loader_cls, loader_kwargs
+
+    def _parallel_load(
+        self, loaders: Iterator[tuple[Path, type[BaseLoader], dict[str, Any]]]
+    ) -> Iterator[Document]:
+        # The logger stays in the main process, workers create their own ones and send the logs back
+        tasks = (
+            (
+                loader_cls,
+                path,
+                {k: v for k, v in loader_kwargs.items() if k != "parsing_logger"},
+                self._logger.silent_errors,
+            )
+            for path, loader_cls, loader_kwargs in loaders
+        )
+        for _, future in parallel_map(
+            _load_file, tasks, self.max_workers, self.preserve_order
+        ):
+            documents, logs, error = future.result()
+            for file_name, messages in logs.items():
+                self._logger.logs.setdefault(file_name, []).extend(messages)
+            yield from documents
+            if error is not None:
+                raise error
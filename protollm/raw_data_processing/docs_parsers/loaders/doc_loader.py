@@ -5,6 +5,7 @@ from langchain_core.document_loaders import BaseLoader, Blob
 from langchain_core.documents import Document
 
 from protollm.raw_data_processing.docs_parsers.parsers import WordDocumentParser, ParsingScheme, DocType
+from protollm.raw_data_processing.docs_parsers.parsers.parsing_cache import ParsedDocumentsCache
 from protollm.raw_data_processing.docs_parsers.utils.logger import ParsingLogger
 
 
@@ -35,6 +36,9 @@ class WordDocumentLoader(BaseLoader):
         extract_tables: bool = False,
         extract_formulas: bool = False,
         timeout_for_converting: Optional[int] = None,
+        workers_for_converting: Optional[int] = None,
+        cache_for_converting: Optional[Union[str, Path]] = None,
+        cache_for_parsing: Optional[Union[str, Path]] = None,
         parsing_logger: Optional[ParsingLogger] = None,
         **kwargs: Any,
     ) -> None:
@@ -57,6 +61,13 @@ class WordDocumentLoader(BaseLoader):
             extract_tables,
             extract_formulas,
             timeout_for_converting,
+            workers_for_converting,
+            cache_for_converting,
+        )
+        self._parsing_cache = (
+            ParsedDocumentsCache(cache_for_parsing)
+            if cache_for_parsing is not None
+            else None
         )
 
     @property
@@ -75,4 +86,7 @@ class WordDocumentLoader(BaseLoader):
                 self.byte_content, path=self.file_path, mime_type=self._doc_type
             )
         with self._logger.parsing_info_handler(self.file_path):
-            yield from self.parser.lazy_parse(blob)
+            if self._parsing_cache is not None:
+                yield from self._parsing_cache.lazy_parse(self.parser, blob)
+            else:
+                yield from self.parser.lazy_parse(blob)
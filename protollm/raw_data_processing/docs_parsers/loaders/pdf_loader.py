@@ -5,6 +5,7 @@ from langchain_core.document_loaders import BaseLoader, Blob
 from langchain_core.documents import Document
 
 from protollm.raw_data_processing.docs_parsers.parsers import PDFParser, ParsingScheme, DocType
+from protollm.raw_data_processing.docs_parsers.parsers.parsing_cache import ParsedDocumentsCache
 from protollm.raw_data_processing.docs_parsers.utils.logger import ParsingLogger
 
 
@@ -22,6 +23,8 @@ class PDFLoader(BaseLoader):
         extract_tables: bool = False,
         extract_formulas: bool = False,
         remove_headers: bool = False,
+        stream_by_pages: bool = False,
+        cache_for_parsing: Optional[Union[str, Path]] = None,
         parsing_logger: Optional[ParsingLogger] = None,
         **kwargs: Any,
     ) -> None:
@@ -43,6 +46,12 @@ class PDFLoader(BaseLoader):
             extract_tables,
             extract_formulas,
             remove_headers,
+            stream_by_pages,
+        )
+        self._parsing_cache = (
+            ParsedDocumentsCache(cache_for_parsing)
+            if cache_for_parsing is not None
+            else None
         )
 
     @property
@@ -60,4 +69,7 @@ class PDFLoader(BaseLoader):
                 self.byte_content, path=self.file_path, mime_type=DocType.pdf.value
             )
         with self._logger.parsing_info_handler(self.file_path):
-            yield from self.parser.lazy_parse(blob)
+            if self._parsing_cache is not None:
+                yield from self._parsing_cache.lazy_parse(self.parser, blob)
+            else:
+                yield from self.parser.lazy_parse(blob)
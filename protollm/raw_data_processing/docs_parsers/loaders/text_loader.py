@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Iterator, Union, Any, Optional
+
+from langchain_core.document_loaders import BaseLoader, Blob
+from langchain_core.documents import Document
+
+from protollm.raw_data_processing.docs_parsers.parsers import TextParser, ParsingScheme, DocType
+from protollm.raw_data_processing.docs_parsers.parsers.parsing_cache import ParsedDocumentsCache
+from protollm.raw_data_processing.docs_parsers.utils.logger import ParsingLogger
+
+
+class TextDocumentLoader(BaseLoader):
+    """
+    Load plain text, Markdown or HTML file into list of documents.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        byte_content: Optional[bytes] = None,
+        parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        extract_tables: bool = False,
+        cache_for_parsing: Optional[Union[str, Path]] = None,
+        parsing_logger: Optional[ParsingLogger] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize with a file path."""
+        self.file_path = str(file_path)
+        doc_type = TextParser.get_doc_type(self.file_path)
+        if doc_type not in [DocType.txt, DocType.md, DocType.html]:
+            if doc_type is DocType.unsupported:
+                raise ValueError("The file type is unsupported")
+            else:
+                raise ValueError(
+                    f"The {doc_type} file type does not match the Loader! Use a suitable one."
+                )
+        self.byte_content = byte_content
+        self._doc_type = doc_type.value
+        self._logger = parsing_logger or ParsingLogger(name=__name__)
+        self.parser = TextParser(parsing_scheme, extract_tables)
+        self._parsing_cache = (
+            ParsedDocumentsCache(cache_for_parsing)
+            if cache_for_parsing is not None
+            else None
+        )
+
+    @property
+    def logs(self):
+        return self._logger.logs
+
+    def lazy_load(
+        self,
+    ) -> Iterator[Document]:
+        """Lazy load given path"""
+        if self.byte_content is None:
+            blob = Blob.from_path(self.file_path, mime_type=self._doc_type)
+        else:
+            blob = Blob.from_data(
+                self.byte_content, path=self.file_path, mime_type=self._doc_type
+            )
+        with self._logger.parsing_info_handler(self.file_path):
+            if self._parsing_cache is not None:
+                yield from self._parsing_cache.lazy_parse(self.parser, blob)
+            else:
+                yield from self.parser.lazy_parse(blob)
@@ -1,6 +1,13 @@
+import io
+import mmap
+import shutil
+import warnings
 import zipfile
+from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
-from typing import Iterator, Union, Any, Optional, Sequence
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from typing import BinaryIO, Generator, Iterator, Union, Any, Optional, Sequence
 
 from langchain_core.document_loaders import BaseLoader, Blob
 from langchain_core.documents import Document
@@ -12,11 +19,91 @@ from protollm.raw_data_processing.docs_parsers.parsers import (
     BaseParser,
     PDFParser,
     WordDocumentParser,
+    TextParser,
+    ExcelParser,
+    PresentationParser,
 )
+from protollm.raw_data_processing.docs_parsers.parsers.parsing_cache import ParsedDocumentsCache
 from protollm.raw_data_processing.docs_parsers.utils.logger import ParsingLogger
+from protollm.raw_data_processing.docs_parsers.utils.parallel import parallel_map
 from protollm.raw_data_processing.docs_parsers.utils.utilities import correct_path_encoding
 
 
+MAX_MEMBER_SIZE_IN_MEMORY = 16 * 1024**2  # 16 MiB
+
+
+class _MemoryMappedFile(io.RawIOBase):
+    """Read-only file-like view of a memory-mapped file, which can be passed to zipfile.ZipFile"""
+
+    def __init__(self, mm: mmap.mmap):
+        self._mm = mm
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mm.seek(offset, whence)
+        return self._mm.tell()
+
+    def tell(self) -> int:
+        return self._mm.tell()
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._mm.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self._mm.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+@contextmanager
+def _member_blob(
+    z: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    path: str,
+    mime_type: str,
+    max_size_in_memory: int = MAX_MEMBER_SIZE_IN_MEMORY,
+) -> Generator[Blob, None, None]:
+    """Small zip members are read into memory, larger ones are extracted to a temporary file"""
+    if info.file_size <= max_size_in_memory:
+        yield Blob.from_data(z.read(info), path=path, mime_type=mime_type)
+        return
+    with TemporaryDirectory() as tmp_dir:
+        tmp_file_path = Path(tmp_dir, "member")
+        with z.open(info) as src, open(tmp_file_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024**2)
+        yield Blob.from_path(
+            tmp_file_path, mime_type=mime_type, metadata={"source": path}
+        )
+
+
+def _parse_zip_member(
+    parser: BaseParser,
+    path: str,
+    mime_type: str,
+    archive_path: str,
+    member_name: str,
+    max_size_in_memory: int = MAX_MEMBER_SIZE_IN_MEMORY,
+    parsing_cache: Optional[ParsedDocumentsCache] = None,
+) -> tuple[list[Document], list[str]]:
+    """Parses a zip member in a worker process"""
+    with zipfile.ZipFile(archive_path) as z:
+        with _member_blob(
+            z, z.getinfo(member_name), path, mime_type, max_size_in_memory
+        ) as blob:
+            with warnings.catch_warnings(record=True) as record:
+                warnings.simplefilter("default")
+                if parsing_cache is not None:
+                    documents = list(parsing_cache.lazy_parse(parser, blob))
+                else:
+                    documents = list(parser.lazy_parse(blob))
+    return documents, [str(warning.message) for warning in record]
+
+
 class ZipLoader(BaseLoader):
     """
     Load files from zip archive into list of documents.
@@ -31,14 +118,27 @@ class ZipLoader(BaseLoader):
         pdf_extract_tables: bool = False,
         pdf_extract_formulas: bool = False,
         pdf_remove_service_info: bool = False,
+        pdf_stream_by_pages: bool = False,
         word_doc_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
         word_doc_extract_images: bool = False,
         word_doc_extract_tables: bool = False,
         word_doc_extract_formulas: bool = False,
+        text_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        text_extract_tables: bool = False,
+        excel_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        presentation_parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        presentation_extract_tables: bool = False,
         timeout_for_converting: Optional[int] = None,
+        workers_for_converting: Optional[int] = None,
+        cache_for_converting: Optional[Union[str, Path]] = None,
+        cache_for_parsing: Optional[Union[str, Path]] = None,
         exclude_files: Sequence[Union[Path, str]] = (),
         parsing_logger: Optional[ParsingLogger] = None,
         silent_errors: bool = False,
+        max_workers: Optional[int] = None,
+        preserve_order: bool = True,
+        mmap_archive: bool = False,
+        max_member_size_in_memory: int = MAX_MEMBER_SIZE_IN_MEMORY,
         **kwargs: Any,
     ) -> None:
         """Initialize with a file path."""
@@ -61,6 +161,7 @@ class ZipLoader(BaseLoader):
             pdf_extract_tables,
             pdf_extract_formulas,
             pdf_remove_service_info,
+            pdf_stream_by_pages,
         )
         self.word_doc_parser = WordDocumentParser(
             word_doc_parsing_scheme,
@@ -68,40 +169,127 @@ class ZipLoader(BaseLoader):
             word_doc_extract_tables,
             word_doc_extract_formulas,
             timeout_for_converting,
+            workers_for_converting,
+            cache_for_converting,
         )
-        self._exclude_names = [Path(file).name for file in exclude_files]
+        self.text_parser = TextParser(text_parsing_scheme, text_extract_tables)
+        self._excel_parsing_scheme = excel_parsing_scheme
+        self._presentation_parsing_scheme = presentation_parsing_scheme
+        self._presentation_extract_tables = presentation_extract_tables
+        self._parsing_cache = (
+            ParsedDocumentsCache(cache_for_parsing)
+            if cache_for_parsing is not None
+            else None
+        )
+        self._exclude_names = {Path(file).name for file in exclude_files}
+        self.max_workers = max_workers
+        self.preserve_order = preserve_order
+        self.mmap_archive = mmap_archive
+        self.max_member_size_in_memory = max_member_size_in_memory
 
     @property
     def logs(self):
         return self._logger.logs
 
+    # Parsers with optional dependencies are created only if there are such files in the archive
+    @cached_property
+    def excel_parser(self) -> ExcelParser:
+        return ExcelParser(self._excel_parsing_scheme)
+
+    @cached_property
+    def presentation_parser(self) -> PresentationParser:
+        return PresentationParser(
+            self._presentation_parsing_scheme, self._presentation_extract_tables
+        )
+
     def lazy_load(
         self,
     ) -> Iterator[Document]:
         """Lazy load given path"""
-        content = self.byte_content or self.file_path
-        with zipfile.ZipFile(content) as z:
-            for info in tqdm(z.infolist(), desc="Zip processing", ncols=80):
-                file_name = Path(correct_path_encoding(info.filename))
-                if file_name.name in self._exclude_names:
+        if self.max_workers and self.max_workers > 1:
+            yield from self._parallel_load()
+            return
+        with self._open_archive() as archive, zipfile.ZipFile(archive) as z:
+            for info, path, doc_type, parser in self._get_members(z):
+                with self._logger.parsing_info_handler(path):
+                    with _member_blob(
+                        z, info, path, doc_type.value, self.max_member_size_in_memory
+                    ) as blob:
+                        if self._parsing_cache is not None:
+                            yield from self._parsing_cache.lazy_parse(parser, blob)
+                        else:
+                            yield from parser.lazy_parse(blob)
+
+    @contextmanager
+    def _open_archive(self) -> Generator[Union[str, BinaryIO], None, None]:
+        if self.byte_content is not None:
+            yield io.BytesIO(self.byte_content)
+        elif self.mmap_archive:
+            with open(self.file_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield _MemoryMappedFile(mm)
+        else:
+            yield self.file_path
+
+    def _get_members(
+        self, z: zipfile.ZipFile
+    ) -> Iterator[tuple[zipfile.ZipInfo, str, DocType, BaseParser]]:
+        for info in tqdm(z.infolist(), desc="Zip processing", ncols=80):
+            file_name = Path(correct_path_encoding(info.filename))
+            if file_name.name in self._exclude_names:
+                continue
+            path = str(Path(self.file_path, file_name))
+            doc_type = BaseParser.get_doc_type(file_name)
+            match doc_type:
+                case DocType.pdf:
+                    _parser = self.pdf_parser
+                case DocType.docx | DocType.doc | DocType.odt | DocType.rtf:
+                    _parser = self.word_doc_parser
+                case DocType.txt | DocType.md | DocType.html:
+                    _parser = self.text_parser
+                case DocType.xlsx:
+                    _parser = self.excel_parser
+                case DocType.pptx:
+                    _parser = self.presentation_parser
+                case _:
+                    if Path(file_name).suffix:
+                        self._logger.info(
+                            f"Skip file processing in zip, no suitable parser for {path}"
+                        )
                     continue
-                path = str(Path(self.file_path, file_name))
-                doc_type = BaseParser.get_doc_type(file_name)
-                match doc_type:
-                    case DocType.pdf:
-                        _parser = self.pdf_parser
-                    case DocType.docx | DocType.doc | DocType.odt | DocType.rtf:
-                        _parser = self.word_doc_parser
-                    case _:
-                        if Path(file_name).suffix:
-                            self._logger.info(
-                                f"Skip file processing in zip, no suitable parser for {path}"
-                            )
-                        continue
-
-                self._logger.info(f"Processing file in zip: {path}")
-                blob = Blob.from_data(
-                    z.open(info).read(), path=path, mime_type=doc_type.value
+
+            self._logger.info(f"Processing file in zip: {path}")
+            yield info, path, doc_type, _parser
+
+    def _parallel_load(self) -> Iterator[Document]:
+        # Workers read members from the archive on disk themselves,
+        # an in-memory archive is saved to a temporary file for them once
+        with TemporaryDirectory() as tmp_dir:
+            archive_path = self.file_path
+            if self.byte_content is not None:
+                with NamedTemporaryFile(dir=tmp_dir, delete=False) as tmp_file:
+                    tmp_file.write(self.byte_content)
+                archive_path = tmp_file.name
+
+            with zipfile.ZipFile(archive_path) as z:
+                tasks = (
+                    (
+                        parser,
+                        path,
+                        doc_type.value,
+                        archive_path,
+                        info.filename,
+                        self.max_member_size_in_memory,
+                        self._parsing_cache,
+                    )
+                    for info, path, doc_type, parser in self._get_members(z)
                 )
-                with self._logger.parsing_info_handler(path):
-                    yield from _parser.lazy_parse(blob)
+                for task, future in parallel_map(
+                    _parse_zip_member, tasks, self.max_workers, self.preserve_order
+                ):
+                    path = task[1]
+                    with self._logger.parsing_info_handler(path):
+                        documents, warning_messages = future.result()
+                        for warn_msg in warning_messages:
+                            self._logger.warning(f"{warn_msg} (in {path})")
+                        yield from documents
@@ -2,3 +2,6 @@ from protollm.raw_data_processing.docs_parsers.parsers.base import BaseParser
 from protollm.raw_data_processing.docs_parsers.parsers.entities import DocType, ParsingScheme
 from protollm.raw_data_processing.docs_parsers.parsers.pdf import PDFParser
 from protollm.raw_data_processing.docs_parsers.parsers.word_doc import WordDocumentParser
+from protollm.raw_data_processing.docs_parsers.parsers.text import TextParser
+from protollm.raw_data_processing.docs_parsers.parsers.excel import ExcelParser
+from protollm.raw_data_processing.docs_parsers.parsers.presentation import PresentationParser
@@ -1,7 +1,7 @@
 import mimetypes
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Iterator, List, Union
+from typing import Any, Iterator, List, Union
 
 from langchain_core.document_loaders import Blob
 from langchain_core.documents import Document
@@ -46,6 +46,11 @@ class BaseParser(ABC):
         """
         return list(self.lazy_parse(blob))
 
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Parser settings which the parsing result depends on."""
+        return dict(vars(self))
+
     @staticmethod
     def get_doc_type(file: Union[str, Path]) -> DocType:
         mimetype = mimetypes.guess_type(file)[0]
@@ -73,5 +78,21 @@ class BaseParser(ABC):
                 | "zip"
             ):
                 return DocType.zip
-            case _:  # TODO: add txt, xlsx, pptx support
+            case "text/plain" | "txt":
+                return DocType.txt
+            case "text/markdown" | "text/x-markdown" | "md" | "markdown":
+                return DocType.md
+            case "text/html" | "html" | "htm":
+                return DocType.html
+            case (
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                | "xlsx"
+            ):
+                return DocType.xlsx
+            case (
+                "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                | "pptx"
+            ):
+                return DocType.pptx
+            case _:
                 return DocType.unsupported
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+DEFAULT_CACHE_SIZE = 2 * 1024**3  # 2 GiB
+
+
+class ConvertedFilesCache:
+    """
+    On-disk cache of converted documents keyed by the source content hash and the target document type.
+
+    The total size of the cache is limited, the least recently used files are evicted first.
+    Files are written atomically, so the cache directory can be shared by several processes.
+    """
+
+    def __init__(
+        self, cache_dir: Union[str, Path], max_size: int = DEFAULT_CACHE_SIZE
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(content: bytes, target_doc_type: str) -> str:
+        return ".".join((hashlib.sha256(content).hexdigest(), target_doc_type))
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Opens the cached file or returns None if there is no such file in the cache"""
+        path = Path(self.cache_dir, key)
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # mark the file as recently used
+        except OSError:
+            pass
+        return file
+
+    def put(self, key: str, file_path: Union[str, Path]):
+        """Copies the converted file to the cache and evicts the least recently used files if needed"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = tempfile.NamedTemporaryFile(
+            delete=False, dir=self.cache_dir, prefix=".", suffix=".tmp"
+        )
+        try:
+            with tmp_file, open(file_path, "rb") as f:
+                shutil.copyfileobj(f, tmp_file)
+            os.replace(tmp_file.name, Path(self.cache_dir, key))
+        except Exception:
+            Path(tmp_file.name).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # evicted by another process
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total_size = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total_size <= self.max_size:
+                    break
+                Path(path).unlink(missing_ok=True)
+                total_size -= size
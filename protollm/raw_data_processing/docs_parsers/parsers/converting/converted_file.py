@@ -2,6 +2,8 @@ from contextlib import contextmanager
 from tempfile import TemporaryDirectory, NamedTemporaryFile
 from typing import BinaryIO, Generator, Union, Optional
 
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converted_cache import ConvertedFilesCache
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converter_pool import get_converter_pool
 from protollm.raw_data_processing.docs_parsers.parsers.converting.converting import _convert_with_soffice
 from protollm.raw_data_processing.docs_parsers.parsers.entities import ConvertingDocType
 
@@ -11,24 +13,46 @@ def converted_file(
     stream,
     target_doc_type: Union[str, ConvertingDocType] = ConvertingDocType.docx,
     timeout: Optional[int] = None,
+    workers: Optional[int] = None,
+    cache: Optional[ConvertedFilesCache] = None,
 ) -> Generator[BinaryIO, None, None]:
     if target_doc_type not in ConvertingDocType.__members__:
         raise ValueError("Invalid target document type")
-    target_doc_type = f"{target_doc_type}"
+    target_doc_type = ConvertingDocType(target_doc_type).value
+
+    content = stream.read()
+    if cache is not None:
+        cache_key = cache.get_key(content, target_doc_type)
+        cached_file = cache.open(cache_key)
+        if cached_file is not None:
+            with cached_file as f:
+                yield f
+            return
 
     with TemporaryDirectory() as tmp_dir:
         tmp_file = NamedTemporaryFile(delete=False, dir=tmp_dir)
-        tmp_file.write(stream.read())
+        tmp_file.write(content)
         tmp_file.close()
         tmp_file_path = tmp_file.name
 
-        _convert_with_soffice(
-            filename=tmp_file_path,
-            output_directory=tmp_dir,
-            target_doc_type=target_doc_type,
-            timeout=timeout,
-        )
+        if workers:
+            # Long-lived LibreOffice instances are used instead of starting soffice per file
+            get_converter_pool(workers).convert(
+                filename=tmp_file_path,
+                output_directory=tmp_dir,
+                target_doc_type=target_doc_type,
+                timeout=timeout,
+            )
+        else:
+            _convert_with_soffice(
+                filename=tmp_file_path,
+                output_directory=tmp_dir,
+                target_doc_type=target_doc_type,
+                timeout=timeout,
+            )
         converted_file_path = ".".join((tmp_file_path, target_doc_type))
+        if cache is not None:
+            cache.put(cache_key, converted_file_path)
 
         with open(converted_file_path, "rb") as f:
             yield f
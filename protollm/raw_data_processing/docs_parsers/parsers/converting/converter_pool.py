@@ -0,0 +1,291 @@
+import atexit
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from protollm.raw_data_processing.docs_parsers.utils.exceptions import ConvertingError
+
+# LibreOffice export filters for the supported target document types
+FILTER_NAMES = {
+    "docx": "MS Word 2007 XML",
+}
+
+# Interval in seconds to check whether the pool is closed or grown while waiting for an idle worker
+_ACQUIRE_POLL_INTERVAL = 1.0
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _property(name: str, value):
+    import uno
+
+    prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class SofficeWorker:
+    """
+    Long-lived headless LibreOffice instance with its own user profile, driven through UNO.
+
+    The isolated profile lets several instances run in parallel without profile locking.
+    """
+
+    def __init__(self, start_timeout: int = 60):
+        try:
+            import uno
+        except ImportError as error:
+            raise ImportError(
+                f"{error.name} package not found, please install LibreOffice python bindings (python3-uno)"
+            )
+        self._start_timeout = start_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._profile_dir: Optional[str] = None
+        self._desktop = None
+        self.start()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        self._profile_dir = tempfile.mkdtemp(prefix="soffice_profile_")
+        port = _get_free_port()
+        command = [
+            "soffice",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nodefault",
+            "--nolockcheck",
+            f"-env:UserInstallation={Path(self._profile_dir).as_uri()}",
+            f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+        ]
+        try:
+            self._process = subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            raise ConvertingError(
+                "soffice command was not found. Please install libreoffice on your system and try again."
+            ) from None
+        self._desktop = self._connect(port)
+
+    def _connect(self, port: int):
+        import uno
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + self._start_timeout
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+                )
+                return context.ServiceManager.createInstanceWithContext(
+                    "com.sun.star.frame.Desktop", context
+                )
+            except Exception:
+                if not self.is_alive or time.monotonic() > deadline:
+                    self.stop()
+                    raise ConvertingError(
+                        f"LibreOffice instance hadn't started after {self._start_timeout} seconds"
+                    ) from None
+                time.sleep(0.5)
+
+    def stop(self):
+        self._desktop = None
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._process = None
+        if self._profile_dir is not None:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+    def restart(self):
+        self.stop()
+        self.start()
+
+    def convert(
+        self,
+        filename: Union[Path, str],
+        output_path: Union[Path, str],
+        target_doc_type: str = "docx",
+    ):
+        document = self._desktop.loadComponentFromURL(
+            Path(filename).absolute().as_uri(), "_blank", 0, (_property("Hidden", True),)
+        )
+        if document is None:
+            raise ConvertingError(f"Could not open file to convert it to {target_doc_type}")
+        try:
+            document.storeToURL(
+                Path(output_path).absolute().as_uri(),
+                (
+                    _property("FilterName", FILTER_NAMES[target_doc_type]),
+                    _property("Overwrite", True),
+                ),
+            )
+        finally:
+            document.close(True)
+
+
+class SofficeConverterPool:
+    """
+    Pool of long-lived headless LibreOffice instances for documents converting.
+
+    Instances are started lazily, up to the given number of workers. A conversion which
+    hasn't terminated in time or has failed together with its instance leads to the instance restart.
+    """
+
+    def __init__(self, workers: int = 2, start_timeout: int = 60):
+        self._max_workers = max(1, workers)
+        self._start_timeout = start_timeout
+        self._idle_workers: queue.LifoQueue[SofficeWorker] = queue.LifoQueue()
+        self._started_workers = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def workers(self) -> int:
+        return self._max_workers
+
+    def __enter__(self) -> "SofficeConverterPool":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def grow(self, workers: int):
+        """Increases the maximum number of workers, the pool never shrinks, so running conversions are not affected"""
+        with self._lock:
+            self._max_workers = max(self._max_workers, workers)
+
+    def _acquire(self) -> SofficeWorker:
+        while True:
+            try:
+                return self._idle_workers.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._closed:
+                    raise ConvertingError("Converter pool is closed")
+                start_new_worker = self._started_workers < self._max_workers
+                if start_new_worker:
+                    self._started_workers += 1
+
+            if start_new_worker:
+                break
+            try:
+                return self._idle_workers.get(timeout=_ACQUIRE_POLL_INTERVAL)
+            except queue.Empty:
+                # The pool could be closed or grown meanwhile
+                continue
+        try:
+            return SofficeWorker(self._start_timeout)
+        except Exception:
+            with self._lock:
+                self._started_workers -= 1
+            raise
+
+    def _release(self, worker: SofficeWorker):
+        with self._lock:
+            if not self._closed:
+                self._idle_workers.put(worker)
+                return
+        worker.stop()
+
+    def convert(
+        self,
+        filename: Union[Path, str],
+        output_directory: Union[Path, str],
+        target_doc_type: str = "docx",
+        timeout: Optional[int] = None,
+    ):
+        """
+        Converts a file to a target format, the result is saved as <output_directory>/<filename stem>.<target_doc_type>
+        """
+        if target_doc_type not in FILTER_NAMES:
+            raise ConvertingError(f"Converting to {target_doc_type} is not supported")
+        output_path = Path(
+            output_directory, ".".join((Path(filename).stem, target_doc_type))
+        )
+        worker = self._acquire()
+        try:
+            if not worker.is_alive:
+                worker.restart()
+
+            errors = []
+
+            def run_converting():
+                try:
+                    worker.convert(filename, output_path, target_doc_type)
+                except Exception as error:
+                    errors.append(error)
+
+            converting_thread = threading.Thread(target=run_converting, daemon=True)
+            converting_thread.start()
+            converting_thread.join(timeout)
+
+            if converting_thread.is_alive():
+                # The instance hangs, killing it also releases the converting thread
+                worker.restart()
+                raise ConvertingError(
+                    f"Converting file to {target_doc_type} hadn't terminated after {timeout} seconds"
+                )
+            if errors:
+                if not worker.is_alive:
+                    worker.restart()
+                raise ConvertingError(
+                    f"Could not convert file to {target_doc_type}\n{errors[0]}"
+                )
+        finally:
+            self._release(worker)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle_workers.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+_converter_pool: Optional[SofficeConverterPool] = None
+_converter_pool_lock = threading.Lock()
+
+
+def get_converter_pool(workers: int) -> SofficeConverterPool:
+    """
+    Returns the process-wide converter pool, it grows if more workers are requested and is shared by all parsers.
+    """
+    global _converter_pool
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            _converter_pool = SofficeConverterPool(workers)
+        else:
+            _converter_pool.grow(workers)
+        return _converter_pool
+
+
+@atexit.register
+def _close_converter_pool():
+    if _converter_pool is not None:
+        _converter_pool.close()
@@ -8,7 +8,12 @@ class DocType(str, Enum):
     rtf = "rtf"
     pdf = "pdf"
     zip = "zip"
-    unsupported = "unsupported"  # TODO: add txt, xlsx, pptx support
+    txt = "txt"
+    md = "md"
+    html = "html"
+    xlsx = "xlsx"
+    pptx = "pptx"
+    unsupported = "unsupported"
 
 
 class ConvertingDocType(str, Enum):
@@ -0,0 +1 @@
+from protollm.raw_data_processing.docs_parsers.parsers.excel.excel_parser import ExcelParser
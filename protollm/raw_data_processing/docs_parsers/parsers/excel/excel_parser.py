@@ -0,0 +1,53 @@
+from typing import Iterator, Union
+
+from langchain_core.document_loaders import Blob
+
+from protollm.raw_data_processing.docs_parsers.parsers.entities import ParsingScheme
+from protollm.raw_data_processing.docs_parsers.parsers.lines_parser import (
+    LinesParser,
+    get_line_metadata,
+    normalize_line,
+)
+
+
+class ExcelParser(LinesParser):
+    """
+    The parser provides a way to parse raw data from Excel workbooks into one or more documents.
+
+    Sheets are read row by row without loading the whole workbook. A sheet name is treated
+    as a top-level heading, each non-empty row becomes a line with cell values separated by " | ".
+    """
+
+    def __init__(self, parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines):
+        try:
+            import openpyxl
+        except ImportError as error:
+            raise ImportError(
+                f"{error.name} package not found, please try to install it with `pip install {error.name}`"
+            )
+        super().__init__(parsing_scheme)
+
+    def iter_lines(self, blob: Blob) -> Iterator[tuple[str, dict]]:
+        import openpyxl
+
+        with blob.as_bytes_io() as stream:
+            workbook = openpyxl.load_workbook(stream, read_only=True, data_only=True)
+            try:
+                for sheet in workbook.worksheets:
+                    title = normalize_line(sheet.title)
+                    yield title, get_line_metadata(
+                        title, bold=True, list_level=0, is_bullet_list=False
+                    )
+                    for row in sheet.iter_rows(values_only=True):
+                        cells = (
+                            normalize_line(str(value))
+                            for value in row
+                            if value is not None
+                        )
+                        line = " | ".join(cell for cell in cells if cell)
+                        if line:
+                            yield line, get_line_metadata(
+                                line, list_level=-1, is_bullet_list=False
+                            )
+            finally:
+                workbook.close()
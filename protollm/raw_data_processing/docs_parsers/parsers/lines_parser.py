@@ -0,0 +1,113 @@
+import re
+from abc import abstractmethod
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from ftfy import fix_text
+from langchain_core.document_loaders import Blob
+from langchain_core.documents import Document
+from tabulate import tabulate
+
+from protollm.raw_data_processing.docs_parsers.parsers.base import BaseParser
+from protollm.raw_data_processing.docs_parsers.parsers.entities import ParsingScheme
+from protollm.raw_data_processing.docs_parsers.parsers.utilities import is_bulleted_text, _get_list_level
+from protollm.raw_data_processing.docs_parsers.parsers.word_doc.utilities import (
+    iter_chapters,
+    iter_headings_hierarchy,
+    iter_paragraphs,
+)
+from protollm.raw_data_processing.docs_parsers.utils.utilities import correct_path_encoding
+
+
+def normalize_line(text: str) -> str:
+    text = fix_text(text).replace("\xa0", " ")
+    return " ".join(text.split())
+
+
+def get_line_metadata(
+    text: str,
+    bold: bool = False,
+    list_level: Optional[int] = None,
+    is_bullet_list: Optional[bool] = None,
+    urls: Optional[dict[str, str]] = None,
+    tables: Optional[dict[str, str]] = None,
+) -> dict:
+    """Returns the line metadata with the same fields as the lines of WordDocumentParser have"""
+    if list_level is None:
+        list_level = _get_list_level(re.split("[ .\xa0]", text))
+    if is_bullet_list is None:
+        is_bullet_list = is_bulleted_text(text)
+    return {
+        "bold": bold,
+        "list_level": list_level,
+        "is_bullet_list": is_bullet_list,
+        "urls": urls or {},
+        "is_centered": False,
+        "first_line_indent": 0,
+        "font_size": -1,
+        "images": {},
+        "formulas": {},
+        "tables": tables or {},
+    }
+
+
+def get_html_table(rows: list[list[str]]) -> str:
+    # The only row of a table is its content, not a header
+    headers = "firstrow" if len(rows) > 1 else ()
+    return tabulate(rows, headers=headers, tablefmt="unsafehtml")
+
+
+class LinesParser(BaseParser):
+    """
+    Base class for parsers which read documents line by line.
+
+    Lines are combined into documents according to the parsing scheme as soon as they are read,
+    the headings hierarchy is built in the same way as by WordDocumentParser.
+    """
+
+    def __init__(self, parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines):
+        if parsing_scheme not in ParsingScheme.__members__:
+            raise ValueError("Invalid parsing scheme")
+        self.parsing_scheme = parsing_scheme
+
+    @abstractmethod
+    def iter_lines(self, blob: Blob) -> Iterator[tuple[str, dict]]:
+        """Yields non-empty lines of the document together with their metadata."""
+
+    def lazy_parse(self, blob: Blob) -> Iterator[Document]:
+        source = blob.source
+        source = correct_path_encoding(source) if source is not None else ""
+        file_name = Path(source).name
+
+        lines = self.iter_lines(blob)
+
+        if self.parsing_scheme == ParsingScheme.full:
+            text = " ".join(line for line, _ in lines)
+            meta = {
+                "page": "all",
+                "headings": [],
+                "source": source,
+                "file_name": file_name,
+            }
+            yield Document(page_content=text, metadata=meta)
+            return
+
+        lines = iter_headings_hierarchy(lines)
+
+        match self.parsing_scheme:
+            case ParsingScheme.lines:
+                texts = lines
+            case ParsingScheme.paragraphs:
+                texts = iter_paragraphs(lines)
+            case ParsingScheme.chapters:
+                texts = iter_chapters(lines)
+            case _:
+                raise NotImplementedError(
+                    f"{self.parsing_scheme} type of parsing scheme is not implemented"
+                )
+
+        for text, meta in texts:
+            yield Document(
+                page_content=text,
+                metadata={**meta, "source": source, "file_name": file_name},
+            )
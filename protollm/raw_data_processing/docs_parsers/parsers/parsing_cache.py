@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from langchain_core.document_loaders import Blob
+from langchain_core.documents import Document
+
+from protollm.raw_data_processing.docs_parsers.parsers.base import BaseParser
+from protollm.raw_data_processing.docs_parsers.utils.utilities import correct_path_encoding
+
+# Changing the version invalidates all the cached results
+CACHE_VERSION = 2
+
+
+class ParsedDocumentsCache:
+    """
+    On-disk cache of parsed documents keyed by the file content hash and the parser settings.
+
+    The parsing result depends only on the file content and the parser settings, so the same file
+    is parsed once whatever the path it is loaded from. Files are written atomically,
+    so the cache directory can be shared by several processes.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def get_key(blob: Blob, parser: BaseParser) -> str:
+        content_hash = hashlib.sha256()
+        with blob.as_bytes_io() as f:
+            for chunk in iter(lambda: f.read(1024**2), b""):
+                content_hash.update(chunk)
+        settings = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "parser": f"{type(parser).__module__}.{type(parser).__qualname__}",
+                "settings": parser.settings,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        settings_hash = hashlib.sha256(settings.encode()).hexdigest()[:16]
+        return ".".join((content_hash.hexdigest(), settings_hash))
+
+    def get(self, key: str) -> Optional[list[Document]]:
+        try:
+            with open(Path(self.cache_dir, key), "rb") as f:
+                return pickle.load(f)
+        except Exception:  # missing or corrupted file
+            return None
+
+    def put(self, key: str, documents: list[Document]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = tempfile.NamedTemporaryFile(
+            delete=False, dir=self.cache_dir, prefix=".", suffix=".tmp"
+        )
+        try:
+            with tmp_file:
+                pickle.dump(documents, tmp_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file.name, Path(self.cache_dir, key))
+        except Exception:
+            Path(tmp_file.name).unlink(missing_ok=True)
+            raise
+
+    def lazy_parse(self, parser: BaseParser, blob: Blob) -> Iterator[Document]:
+        """
+        Yields the cached documents of the blob or parses it, the result is cached only if the blob is parsed entirely.
+        """
+        key = self.get_key(blob, parser)
+        documents = self.get(key)
+        if documents is not None:
+            source = blob.source
+            source = correct_path_encoding(source) if source is not None else ""
+            for document in documents:
+                if "source" in document.metadata:
+                    document.metadata["source"] = source
+                    document.metadata["file_name"] = Path(source).name
+                yield document
+            return
+
+        documents = []
+        for document in parser.lazy_parse(blob):
+            documents.append(document)
+            yield document
+        self.put(key, documents)
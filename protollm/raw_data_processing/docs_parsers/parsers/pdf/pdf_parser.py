@@ -1,7 +1,7 @@
 import re
 import warnings
 from pathlib import Path
-from typing import Iterator, Union
+from typing import Iterator, Union, Iterable
 
 from langchain_core.document_loaders import Blob
 from langchain_core.documents import Document
@@ -16,9 +16,19 @@ from protollm.raw_data_processing.docs_parsers.parsers.utilities import CONTENTS
 from protollm.raw_data_processing.docs_parsers.utils.utilities import correct_path_encoding, is_bad_encoding
 
 
+# Number of pages without headings after which the document parsed by pages is considered to have no headings
+MAX_PAGES_BEFORE_HEADING = 5
+
+
 class PDFParser(BaseParser):
     """
     The parser provides a way to parse raw data from PDF into one or more documents.
+
+    If stream_by_pages is True, the lines and paragraphs schemes parse the document page by page
+    and yield documents without waiting for the whole document to be parsed. In this mode
+    'is_heading_extracting_correct' of a paragraph reflects the pages parsed so far, not the whole document,
+    and the document without headings on its first MAX_PAGES_BEFORE_HEADING pages is treated as a document
+    without headings.
     """
 
     def __init__(
@@ -28,6 +38,7 @@ class PDFParser(BaseParser):
         extract_tables: bool = False,
         parse_formulas: bool = False,
         remove_service_info: bool = False,
+        stream_by_pages: bool = False,
     ):
         try:
             import protollm.raw_data_processing.docs_parsers.parsers.pdf.utilities
@@ -42,6 +53,7 @@ class PDFParser(BaseParser):
         self.extract_tables = extract_tables
         self.parse_formulas = parse_formulas
         self.remove_service_info = remove_service_info
+        self.stream_by_pages = stream_by_pages
 
     def lazy_parse(self, blob: Blob) -> Iterator[Document]:
         from protollm.raw_data_processing.docs_parsers.parsers.pdf.utilities import extract_by_lines
@@ -50,6 +62,13 @@ class PDFParser(BaseParser):
         source = correct_path_encoding(source) if source is not None else ""
         file_name = Path(source).name
 
+        if self.stream_by_pages and self.parsing_scheme in [
+            ParsingScheme.lines,
+            ParsingScheme.paragraphs,
+        ]:
+            yield from self._lazy_parse_by_pages(blob, source, file_name)
+            return
+
         with blob.as_bytes_io() as pdf_file_obj:
             lines, metadata = extract_by_lines(
                 pdf_file_obj,
@@ -92,7 +111,8 @@ class PDFParser(BaseParser):
             metadata = upd_metadata
         else:
             for i in range(len(metadata)):
-                metadata[i]["headings"].append("Документ")
+                # The lines can share the same headings list
+                metadata[i]["headings"] = [*metadata[i]["headings"], "Документ"]
 
         match self.parsing_scheme:
             case ParsingScheme.lines:
@@ -160,48 +180,140 @@ class PDFParser(BaseParser):
 
                     yield Document(page_content=document_text, metadata=document_meta)
             case ParsingScheme.paragraphs:
-                text_lst = []
-                paragraph = -1
                 document_meta = {
                     "source": source,
                     "file_name": file_name,
                     "is_heading_extracting_correct": is_heading_extracting_correct,
                 }
-                for text, meta in zip(lines, metadata):
-                    if len(meta["headings"]) != 0:  # text is a part of some chapter
-                        if (
-                            meta["paragraph"] != -1
-                        ):  # text is a part of some paragraph (not header)
-                            if (
-                                meta["paragraph"] == paragraph
-                            ):  # it has the same paragraph's number
-                                text_lst.append(
-                                    text
-                                )  # add element's text to the document's content
-                                document_meta = {
-                                    **meta,
-                                    "source": source,
-                                    "file_name": file_name,
-                                    "is_heading_extracting_correct": is_heading_extracting_correct,
-                                }
-                            elif paragraph != -1:  # other paragraph
-                                document_text = " ".join(text_lst)
-                                text_lst = [text]
-                                paragraph = meta["paragraph"]
-                                pattern = r"(?<=[А-Яа-яёЁ])-\s"
-                                document_text = re.sub(pattern, "", document_text)
-                                yield Document(
-                                    page_content=document_text, metadata=document_meta
-                                )
-                            else:
-                                text_lst = [text]
-                                paragraph = meta["paragraph"]
-                if len(text_lst) != 0:
-                    document_text = " ".join(text_lst)
-                    pattern = r"(?<=[А-Яа-яёЁ])-\s"
-                    document_text = re.sub(pattern, "", document_text)
-                    yield Document(page_content=document_text, metadata=document_meta)
+                yield from self._get_paragraphs(zip(lines, metadata), document_meta)
             case _:
                 raise NotImplementedError(
                     f"{self.parsing_scheme} type of parsing scheme is not implemented"
                 )
+
+    def _lazy_parse_by_pages(
+        self, blob: Blob, source: str, file_name: str
+    ) -> Iterator[Document]:
+        """
+        Parses the document page by page, so only the layout of the current page is kept in memory.
+
+        Lines preceding the first heading are held back until a heading is found or MAX_PAGES_BEFORE_HEADING
+        pages are parsed, then the document is considered to have no headings. The encoding is checked
+        by the first page with text, and 'is_heading_extracting_correct' reflects the pages parsed so far.
+        """
+        from protollm.raw_data_processing.docs_parsers.parsers.pdf.utilities import iter_by_lines
+
+        document_meta = {
+            "source": source,
+            "file_name": file_name,
+            "is_heading_extracting_correct": True,
+        }
+
+        def without_headings(text: str, meta: dict) -> tuple[str, dict]:
+            return text, {**meta, "headings": [*meta["headings"], "Документ"]}
+
+        def iter_lines() -> Iterator[tuple[str, dict]]:
+            is_encoding_checked = False
+            is_heading_found = False
+            has_no_headings = False
+            pending_lines = []
+            with blob.as_bytes_io() as pdf_file_obj:
+                for page_number, (page_lines, page_metadata) in enumerate(iter_by_lines(
+                    pdf_file_obj,
+                    parse_images=self.extract_images,
+                    parse_tables=self.extract_tables,
+                    parse_formulas=self.parse_formulas,
+                    remove_service_info=self.remove_service_info,
+                )):
+                    if not is_encoding_checked and page_lines:
+                        if is_bad_encoding(page_lines):
+                            raise EncodingError(
+                                "It is impossible to parse the file due to uncertainty in the text encoding"
+                            )
+                        is_encoding_checked = True
+
+                    for text, meta in zip(page_lines, page_metadata):
+                        if not meta["is_heading_extracting_correct"]:
+                            document_meta["is_heading_extracting_correct"] = False
+                        if not is_heading_found:
+                            if len(meta["headings"]) == 0:
+                                if has_no_headings:
+                                    yield without_headings(text, meta)
+                                else:
+                                    pending_lines.append((text, meta))
+                                continue
+                            is_heading_found = True
+                            yield from pending_lines
+                            pending_lines = []
+                        if self.remove_service_info:
+                            if (
+                                len(meta["headings"]) > 0
+                                and meta["headings"][0].lower() in CONTENTS_KEYWORDS
+                            ):
+                                continue
+                        yield text, meta
+
+                    if (
+                        not is_heading_found
+                        and not has_no_headings
+                        and page_number + 1 >= MAX_PAGES_BEFORE_HEADING
+                    ):
+                        has_no_headings = True
+                        for text, meta in pending_lines:
+                            yield without_headings(text, meta)
+                        pending_lines = []
+
+            # The document has no headings at all
+            for text, meta in pending_lines:
+                yield without_headings(text, meta)
+
+        match self.parsing_scheme:
+            case ParsingScheme.lines:
+                for text, meta in iter_lines():
+                    yield Document(
+                        page_content=text,
+                        metadata={**meta, "source": source, "file_name": file_name},
+                    )
+            case ParsingScheme.paragraphs:
+                yield from self._get_paragraphs(iter_lines(), document_meta)
+            case _:
+                raise NotImplementedError(
+                    f"{self.parsing_scheme} type of parsing scheme can not be parsed by pages"
+                )
+
+    @staticmethod
+    def _get_paragraphs(
+        lines: Iterable[tuple[str, dict]], base_meta: dict
+    ) -> Iterator[Document]:
+        text_lst = []
+        paragraph = -1
+        document_meta = {**base_meta}
+        for text, meta in lines:
+            if len(meta["headings"]) != 0:  # text is a part of some chapter
+                if (
+                    meta["paragraph"] != -1
+                ):  # text is a part of some paragraph (not header)
+                    if (
+                        meta["paragraph"] == paragraph
+                    ):  # it has the same paragraph's number
+                        text_lst.append(
+                            text
+                        )  # add element's text to the document's content
+                        document_meta = {**meta, **base_meta}
+                    elif paragraph != -1:  # other paragraph
+                        document_text = " ".join(text_lst)
+                        text_lst = [text]
+                        paragraph = meta["paragraph"]
+                        pattern = r"(?<=[А-Яа-яёЁ])-\s"
+                        document_text = re.sub(pattern, "", document_text)
+                        yield Document(
+                            page_content=document_text, metadata=document_meta
+                        )
+                    else:
+                        text_lst = [text]
+                        paragraph = meta["paragraph"]
+        if len(text_lst) != 0:
+            document_text = " ".join(text_lst)
+            pattern = r"(?<=[А-Яа-яёЁ])-\s"
+            document_text = re.sub(pattern, "", document_text)
+            yield Document(page_content=document_text, metadata=document_meta)
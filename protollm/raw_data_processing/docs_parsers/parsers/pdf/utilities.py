@@ -2,6 +2,7 @@ import re
 import warnings
 from collections import Counter
 from functools import reduce
+from typing import Iterable, Iterator
 
 import PyPDF2
 import numpy as np
@@ -264,62 +265,93 @@ def check_layout(pages_layout):
         return 0
 
 
-def get_document_layout(stream, layout_parsing_params, tables_by_pages):
-    # Get all line elements from the document, grouped by pages
-    pages_layout = extract_pages(stream, laparams=layout_parsing_params)
-    check_layout_res = check_layout(pages_layout)
+def get_layout_parsing_params() -> LAParams:
+    # Set up hyperparameters for the document's layout parsing by lines
+    return LAParams(
+        line_overlap=0.5,
+        char_margin=15.0,
+        line_margin=0.1,
+        word_margin=2.0,
+        boxes_flow=1.0,
+        detect_vertical=False,
+        all_texts=True,
+    )
+
+
+def adjust_layout_parsing_params(stream, layout_parsing_params):
+    # Analyze only the first pages of the document to choose the words margin
+    check_layout_res = check_layout(extract_pages(stream, laparams=layout_parsing_params))
 
     if check_layout_res == 1:
         layout_parsing_params.word_margin = layout_parsing_params.word_margin + 2
     elif check_layout_res == -1:
         layout_parsing_params.word_margin = 0.1
-    pages_layout = extract_pages(stream, laparams=layout_parsing_params)
-
-    pages_structure = []  # variable for the updated document's structure by pages
+    return layout_parsing_params
 
-    for page_number, page in enumerate(pages_layout):
-        page_structure = []
 
-        # Get all tables from the page
-        page_tables = tables_by_pages[page_number]
+def get_page_structure(page, page_tables):
+    page_structure = []
 
-        # Analyze all elements on the page
-        for element in page:
-            if isinstance(element, LTTextContainer):
-                text_lines_lst = []
-                if not isinstance(
-                    element, LTTextLine
-                ):  # text element is a Box and should be unpacked to Lines
-                    for line in element:
-                        text_lines_lst.append(line)
-                else:
-                    text_lines_lst.append(element)
+    # Analyze all elements on the page
+    for element in page:
+        if isinstance(element, LTTextContainer):
+            text_lines_lst = []
+            if not isinstance(
+                element, LTTextLine
+            ):  # text element is a Box and should be unpacked to Lines
+                for line in element:
+                    text_lines_lst.append(line)
+            else:
+                text_lines_lst.append(element)
 
-                for line in text_lines_lst:
-                    if page_tables is not None:  # if there are any tables on the page
-                        if is_element_inside_any_table(line, page, page_tables):
-                            table_id_found = find_table_for_element(
-                                line, page, page_tables
+            for line in text_lines_lst:
+                if page_tables is not None:  # if there are any tables on the page
+                    if is_element_inside_any_table(line, page, page_tables):
+                        table_id_found = find_table_for_element(
+                            line, page, page_tables
+                        )
+                        if (
+                            table_id_found is not None
+                        ):  # text element is a part of the table
+                            page_structure.append(
+                                {
+                                    "element": line,
+                                    "meta": {"type": "table", "id": table_id_found},
+                                }
                             )
-                            if (
-                                table_id_found is not None
-                            ):  # text element is a part of the table
-                                page_structure.append(
-                                    {
-                                        "element": line,
-                                        "meta": {"type": "table", "id": table_id_found},
-                                    }
-                                )
-                                continue
-                    # text line is not a part of the table
-                    page_structure.append(
-                        {"element": line, "meta": {"type": "text", "id": -1}}
-                    )
-            elif isinstance(element, LTFigure):  # element is an image
+                            continue
+                # text line is not a part of the table
                 page_structure.append(
-                    {"element": element, "meta": {"type": "image", "id": -1}}
+                    {"element": line, "meta": {"type": "text", "id": -1}}
                 )
-        pages_structure.append(page_structure)
+        elif isinstance(element, LTFigure):  # element is an image
+            page_structure.append(
+                {"element": element, "meta": {"type": "image", "id": -1}}
+            )
+    return page_structure
+
+
+def is_text_in_page(page_structure) -> bool:
+    for element_info in page_structure:
+        if (
+            element_info["meta"]["type"] == "text"
+            or element_info["meta"]["type"] == "table"
+        ):
+            return True
+    return False
+
+
+def get_document_layout(stream, layout_parsing_params, tables_by_pages):
+    # Get all line elements from the document, grouped by pages
+    layout_parsing_params = adjust_layout_parsing_params(stream, layout_parsing_params)
+    pages_layout = extract_pages(stream, laparams=layout_parsing_params)
+
+    pages_structure = []  # variable for the updated document's structure by pages
+
+    for page_number, page in enumerate(pages_layout):
+        # Get all tables from the page
+        page_tables = tables_by_pages[page_number]
+        pages_structure.append(get_page_structure(page, page_tables))
 
     # check if the first page is a title page
     # for element_info in pages_structure[0]:
@@ -331,126 +363,133 @@ def get_document_layout(stream, layout_parsing_params, tables_by_pages):
     return pages_structure
 
 
-def get_document_formatting(pages_structure):
-    # margin_inf = 1000  # maximum value of the left margin attribute
-
-    # Initialize main variables for the document formatting and layout structure
-    doc_info = {}
-    doc_structure = []
-
+def get_formatting_counters() -> dict[str, Counter]:
     # Variables for the whole document's formatting analysis
-    doc_font_size_counter = Counter()
-    doc_line_spacing_counter = Counter()
-    doc_left_margin_counter = Counter()
-    # for the cases, when information about the particular font is unavailable and there are only CID Fonts
-    doc_main_font_counter = Counter()
+    return {
+        "font_size": Counter(),
+        "line_spacing": Counter(),
+        "left_margin": Counter(),
+        # for the cases, when information about the particular font is unavailable and there are only CID Fonts
+        "font_name": Counter(),
+    }
 
-    doc_headings_sizes = []  # list of headings' font sizes in hierarchical order
 
-    for page in pages_structure:
-        page_structure = []
-        prev_line_bottom_border = (
-            None  # y coordinate of the previous line's bottom border
-        )
-
-        for element_info in page:
-            element_format_info = {}  # dict with info about text formatting
-            elem_font_size_counter = Counter()
-            elem_font_name_counter = Counter()
-
-            elem_start_symbol = ""
-            elem_font_style = "plain"
-
-            # process only text elements (including ones which are parts of tables)
-            if (
-                element_info["meta"]["type"] != "image"
-                and element_info["element"].get_text() != ""
-            ):
-                element = element_info["element"]
-                if prev_line_bottom_border is not None:
-                    elem_line_spacing = (
-                        prev_line_bottom_border - element.y0
-                    )  # space between the lines
-                else:
-                    elem_line_spacing = -1  # first line on the page
-
-                prev_line_bottom_border = (
-                    element.y1
-                )  # update previous line bottom border attribute
-
-                elem_left_margin = element.x0  # left margin of the line
-
-                is_bold = True
-                no_letters = True
-
-                # Analyze element characters' formatting
-                for character in element:
-                    if character.get_text()[0].isalpha():
-                        no_letters = False
-                        if "Bold" not in character.fontname:
-                            is_bold = False
-                    if elem_start_symbol == "":
-                        elem_start_symbol = (
-                            "letter"
-                            if character.get_text()[0].isalpha()
-                            else (
-                                "digit"
-                                if character.get_text()[0].isdigit()
-                                else "symbol"
-                            )
+def get_page_formatting(page, formatting_counters=None):
+    """
+    Sets format info for each page's element and updates the document's formatting statistics
+    :param page: page structure with elements and their meta
+    :param formatting_counters: document's formatting statistics from get_formatting_counters
+    :return: page structure with updated elements' meta
+    """
+    page_structure = []
+    prev_line_bottom_border = None  # y coordinate of the previous line's bottom border
+
+    for element_info in page:
+        element_format_info = {}  # dict with info about text formatting
+        elem_font_size_counter = Counter()
+        elem_font_name_counter = Counter()
+
+        elem_start_symbol = ""
+        elem_font_style = "plain"
+
+        # process only text elements (including ones which are parts of tables)
+        if (
+            element_info["meta"]["type"] != "image"
+            and element_info["element"].get_text() != ""
+        ):
+            element = element_info["element"]
+            if prev_line_bottom_border is not None:
+                elem_line_spacing = (
+                    prev_line_bottom_border - element.y0
+                )  # space between the lines
+            else:
+                elem_line_spacing = -1  # first line on the page
+
+            prev_line_bottom_border = (
+                element.y1
+            )  # update previous line bottom border attribute
+
+            elem_left_margin = element.x0  # left margin of the line
+
+            is_bold = True
+            no_letters = True
+
+            # Analyze element characters' formatting
+            for character in element:
+                if character.get_text()[0].isalpha():
+                    no_letters = False
+                    if "Bold" not in character.fontname:
+                        is_bold = False
+                if elem_start_symbol == "":
+                    elem_start_symbol = (
+                        "letter"
+                        if character.get_text()[0].isalpha()
+                        else (
+                            "digit"
+                            if character.get_text()[0].isdigit()
+                            else "symbol"
                         )
-                    if isinstance(character, LTChar):
-                        elem_font_size_counter[round(character.size)] += 1  # font size
-                        elem_font_name_counter[character.fontname] += 1  # font name
-
-                # Get info about element's main font style (plain/bold)
-                # if 'Bold' in elem_font_name_counter.most_common(1)[0][0] and len(elem_font_name_counter) == 1:
-                #     elem_font_style = 'bold'
-                if is_bold and not no_letters:
-                    elem_font_style = "bold"
-
-                # Get info about element's main font size
-                elem_font_size = elem_font_size_counter.most_common(1)[0][0]
-                elem_font_name = elem_font_name_counter.most_common(1)[0][0]
-
-                # Update info about the element's formatting
-                element_format_info["fontsize"] = elem_font_size
-                element_format_info["font_style"] = elem_font_style
-                element_format_info["font_name"] = elem_font_name
-                element_format_info["left_margin"] = elem_left_margin
-                element_format_info["line_spacing"] = elem_line_spacing
-                element_format_info["start_symbol"] = elem_start_symbol
-
-                # Update document's statistics
-                doc_line_spacing_counter[
+                    )
+                if isinstance(character, LTChar):
+                    elem_font_size_counter[round(character.size)] += 1  # font size
+                    elem_font_name_counter[character.fontname] += 1  # font name
+
+            # Get info about element's main font style (plain/bold)
+            # if 'Bold' in elem_font_name_counter.most_common(1)[0][0] and len(elem_font_name_counter) == 1:
+            #     elem_font_style = 'bold'
+            if is_bold and not no_letters:
+                elem_font_style = "bold"
+
+            # Get info about element's main font size
+            elem_font_size = elem_font_size_counter.most_common(1)[0][0]
+            elem_font_name = elem_font_name_counter.most_common(1)[0][0]
+
+            # Update info about the element's formatting
+            element_format_info["fontsize"] = elem_font_size
+            element_format_info["font_style"] = elem_font_style
+            element_format_info["font_name"] = elem_font_name
+            element_format_info["left_margin"] = elem_left_margin
+            element_format_info["line_spacing"] = elem_line_spacing
+            element_format_info["start_symbol"] = elem_start_symbol
+
+            # Update document's statistics
+            if formatting_counters is not None:
+                formatting_counters["line_spacing"][
                     elem_line_spacing
                 ] += 1  # add line spacing attribute
-                doc_left_margin_counter[
+                formatting_counters["left_margin"][
                     elem_left_margin
                 ] += 1  # add left margin attribute
-                doc_font_size_counter[elem_font_size] += 1  # add font size attribute
-                doc_main_font_counter[
+                formatting_counters["font_size"][
+                    elem_font_size
+                ] += 1  # add font size attribute
+                formatting_counters["font_name"][
                     elem_font_name
                 ] += 1  # add font name info attribute
 
-            element_info["meta"][
-                "format"
-            ] = element_format_info  # set format info for the element
-            page_structure.append(element_info)
-        doc_structure.append(page_structure)
+        element_info["meta"][
+            "format"
+        ] = element_format_info  # set format info for the element
+        page_structure.append(element_info)
+    return page_structure
+
+
+def get_document_info(formatting_counters):
+    doc_info = {}
+    doc_headings_sizes = []  # list of headings' font sizes in hierarchical order
 
-    doc_font_size = doc_font_size_counter.most_common(1)[0][
+    doc_font_size = formatting_counters["font_size"].most_common(1)[0][
         0
     ]  # main document's font size
-    doc_line_spacing = doc_line_spacing_counter.most_common(1)[0][
+    doc_line_spacing = formatting_counters["line_spacing"].most_common(1)[0][
         0
     ]  # main document's line spacing
     doc_left_margins = [
-        x[0] for x in doc_left_margin_counter.most_common(2)
+        x[0] for x in formatting_counters["left_margin"].most_common(2)
     ]  # two most common left margins
-    doc_main_font = doc_main_font_counter.most_common(1)[0][0]
+    doc_main_font = formatting_counters["font_name"].most_common(1)[0][0]
 
-    for font_size in [x[0] for x in doc_font_size_counter.items()]:
+    for font_size in [x[0] for x in formatting_counters["font_size"].items()]:
         if font_size > doc_font_size:
             doc_headings_sizes.append(font_size)
     doc_headings_sizes.sort(reverse=True)  # sort font sizes in the descending order
@@ -467,6 +506,19 @@ def get_document_formatting(pages_structure):
     doc_info["left_margin"] = doc_left_margins
     doc_info["headings_sizes"] = doc_headings_sizes_dict
 
+    return doc_info
+
+
+def get_document_formatting(pages_structure):
+    # margin_inf = 1000  # maximum value of the left margin attribute
+
+    # Initialize main variables for the document formatting and layout structure
+    formatting_counters = get_formatting_counters()
+    doc_structure = [
+        get_page_formatting(page, formatting_counters) for page in pages_structure
+    ]
+    doc_info = get_document_info(formatting_counters)
+
     return doc_info, doc_structure
 
 
@@ -483,81 +535,40 @@ def is_heading_correct(heading_str):
     return True
 
 
-def extract_by_lines(
+def extract_pages_lines(
     stream,
+    doc_structure,
+    doc_info,
     parse_images=False,
     parse_tables=True,
-    parse_formulas=False,
     remove_service_info=False,
-) -> tuple[list[str], list[dict]]:
+) -> Iterator[tuple[list[str], list[dict]]]:
     """
-    Parses given pdf document to lines content and meta
+    Parses formatted pages to lines content and meta page by page
+    :param stream: binary input
+    :param doc_structure: iterable of pages with formatted elements
+    :param doc_info: info about the general document's formatting
     :param parse_images:
     :param parse_tables:
-    :param parse_formulas:
-    :param stream:
-    :return:
+    :param remove_service_info:
+    :return: generator of the page's lines content and meta
     """
-    document_content = []
-    document_meta = []
-
-    # Set up hyperparameters for the document's layout parsing by lines
-    params = LAParams(
-        line_overlap=0.5,
-        char_margin=15.0,
-        line_margin=0.1,
-        word_margin=2.0,
-        boxes_flow=1.0,
-        detect_vertical=False,
-        all_texts=True,
-    )
-
-    # Tables processing
-    tables_by_pages = []
-    tables_reader = pdfplumber.open(stream)
-
-    # Extract all tables from the document using pdfplumber
-    for page in tables_reader.pages:
-        tables_by_pages.append(page.find_tables())
-
-    # Get all line elements, grouped by pages, with the meta about the types: text, table or image
-    pages_layout = get_document_layout(stream, params, tables_by_pages)
-
-    is_text_in_doc = False
-
-    for page_layout in pages_layout:
-        for element_info in page_layout:
-            if (
-                element_info["meta"]["type"] == "text"
-                or element_info["meta"]["type"] == "table"
-            ):
-                is_text_in_doc = True
-                break
-        if is_text_in_doc:
-            break
-
-    if not is_text_in_doc:
-        raise NoTextLayerError("Document contains no text layer, only images")
-
     # Set up pdf reader for working with images
     img_pdf_reader = PyPDF2.PdfReader(stream)
 
-    # Get info about the general document's formatting and each element's formatting
-    doc_info, doc_structure = get_document_formatting(pages_layout)
-
     # Set up environmental variables
     heading_env = (
         -1
     )  # level of the current heading's environment (-1 if not the heading's environment)
     heading_lst = []
     current_heading_lvl = -1  # means that the element is not the heading (basic)
-    tables_analysed = [set() for _ in range(len(doc_structure))]
     paragraph_id = 0
     headings_hierarchy = []
 
     for page_number, page in enumerate(doc_structure):
-        document_content.append([])
-        document_meta.append([])
+        page_content = []
+        page_meta = []
+        tables_analysed = set()
         if parse_images:
             try:
                 page_object = img_pdf_reader.pages[page_number]
@@ -645,8 +656,8 @@ def extract_by_lines(
 
                 if element_meta["type"] == "table":
                     table_id = element_meta["id"]
-                    if table_id not in tables_analysed[page_number] and parse_tables:
-                        tables_analysed[page_number].add(table_id)
+                    if table_id not in tables_analysed and parse_tables:
+                        tables_analysed.add(table_id)
                         table = extract_table(stream, page_number, table_id)
 
                         # add string with table content to the document content
@@ -688,8 +699,8 @@ def extract_by_lines(
                 except (UnicodeDecodeError, UnicodeEncodeError):
                     pass
 
-                document_content[-1].append(element_text)
-                document_meta[-1].append(
+                page_content.append(element_text)
+                page_meta.append(
                     {
                         "type": element_meta["type"],
                         "is_heading": is_heading,
@@ -699,80 +710,184 @@ def extract_by_lines(
                     }
                 )
 
-    if remove_service_info:
-        # Check if the first document's page is a title
-        try:
-            potential_title_page = document_content[0]
-            title_num = 0
-            is_title = False
-
-            for i in range(len(document_content)):
-                page = document_content[i]
-                if len(page) > 0:
-                    potential_title_page = page
-                    title_num = i
-                    break
-            for text_line in potential_title_page:
-                for title_key in HEADING_STOP_LIST:
-                    if title_key in text_line.lower():
-                        is_title = True
-                        break
-                if is_title:
-                    break
-            if not is_title:
-                for char in potential_title_page[-1].lower():
-                    if char.isalpha() and char != "г":
-                        break
-            if is_title:
-                document_content = document_content[title_num + 1 :]
-                document_meta = document_meta[title_num + 1 :]
-        except IndexError:
-            warnings.warn(
-                "Can not skip title-related service information due to unknown title formatting",
-                category=TitleExtractingWarning,
-            )
+        yield page_content, page_meta
 
-        # Remove page numbers
-        try:
-            for page_number in range(len(document_content)):
-                page = document_content[page_number]
-                if len(page) > 0:
-                    only_digits = True
-                    for char in page[0]:  # number is at the beginning of the page
-                        if not char.isdigit():
-                            only_digits = False
-                    if only_digits:
-                        document_content[page_number] = document_content[page_number][
-                            1:
-                        ]
-                        document_meta[page_number] = document_meta[page_number][1:]
-                        continue
-                    for char in page[-1]:  # number is at the end of the page
-                        if not char.isdigit():
-                            only_digits = False
-                    if only_digits:
-                        document_content[page_number] = document_content[page_number][
-                            :-1
-                        ]
-                        document_meta[page_number] = document_meta[page_number][:-1]
-                        continue
-        except IndexError:
-            warnings.warn(
-                "Can not delete page numbers due to unknown formatting",
-                category=PageNumbersExtractingWarning,
-            )
 
-        # # Remove footers
-        # try:
-        #     for page_number in range(len(document_content)):
-        #         page = document_content[page_number]
-        #         if len(page) > 0:
-        #
-        # except IndexError:
-        #     warnings.warn('Can not delete page numbers due to unknown formatting',
-        #                   category=FooterExtractingWarning)
+def is_title_page(page_content: list[str]) -> bool:
+    for text_line in page_content:
+        for title_key in HEADING_STOP_LIST:
+            if title_key in text_line.lower():
+                return True
+    return False
+
+
+def remove_page_number(
+    page_content: list[str], page_meta: list[dict]
+) -> tuple[list[str], list[dict]]:
+    try:
+        if len(page_content) > 0:
+            only_digits = True
+            for char in page_content[0]:  # number is at the beginning of the page
+                if not char.isdigit():
+                    only_digits = False
+            if only_digits:
+                return page_content[1:], page_meta[1:]
+            for char in page_content[-1]:  # number is at the end of the page
+                if not char.isdigit():
+                    only_digits = False
+            if only_digits:
+                return page_content[:-1], page_meta[:-1]
+    except IndexError:
+        warnings.warn(
+            "Can not delete page numbers due to unknown formatting",
+            category=PageNumbersExtractingWarning,
+        )
+    return page_content, page_meta
+
+
+def remove_pages_service_info(
+    pages: Iterable[tuple[list[str], list[dict]]]
+) -> Iterator[tuple[list[str], list[dict]]]:
+    """
+    Skips the title page and removes page numbers from the pages' lines content and meta
+    :param pages: iterable of the page's lines content and meta
+    :return: generator of the page's lines content and meta
+    """
+    # The first page with any content is checked for being a title
+    is_title_checked = False
+    for page_content, page_meta in pages:
+        if not is_title_checked and len(page_content) > 0:
+            is_title_checked = True
+            if is_title_page(page_content):
+                continue
+        yield remove_page_number(page_content, page_meta)
+
+    if not is_title_checked:
+        warnings.warn(
+            "Can not skip title-related service information due to unknown title formatting",
+            category=TitleExtractingWarning,
+        )
+
+    # # Remove footers
+    # try:
+    #     for page_number in range(len(document_content)):
+    #         page = document_content[page_number]
+    #         if len(page) > 0:
+    #
+    # except IndexError:
+    #     warnings.warn('Can not delete page numbers due to unknown formatting',
+    #                   category=FooterExtractingWarning)
+
+
+def extract_by_lines(
+    stream,
+    parse_images=False,
+    parse_tables=True,
+    parse_formulas=False,
+    remove_service_info=False,
+) -> tuple[list[str], list[dict]]:
+    """
+    Parses given pdf document to lines content and meta
+    :param parse_images:
+    :param parse_tables:
+    :param parse_formulas:
+    :param stream:
+    :return:
+    """
+    document_content = []
+    document_meta = []
+
+    params = get_layout_parsing_params()
+
+    # Tables processing
+    tables_by_pages = []
+    tables_reader = pdfplumber.open(stream)
+
+    # Extract all tables from the document using pdfplumber
+    for page in tables_reader.pages:
+        tables_by_pages.append(page.find_tables())
+
+    # Get all line elements, grouped by pages, with the meta about the types: text, table or image
+    pages_layout = get_document_layout(stream, params, tables_by_pages)
+
+    if not any(is_text_in_page(page_layout) for page_layout in pages_layout):
+        raise NoTextLayerError("Document contains no text layer, only images")
+
+    # Get info about the general document's formatting and each element's formatting
+    doc_info, doc_structure = get_document_formatting(pages_layout)
+
+    pages = extract_pages_lines(
+        stream,
+        doc_structure,
+        doc_info,
+        parse_images=parse_images,
+        parse_tables=parse_tables,
+        remove_service_info=remove_service_info,
+    )
+    if remove_service_info:
+        pages = remove_pages_service_info(pages)
+
+    for page_content, page_meta in pages:
+        document_content.append(page_content)
+        document_meta.append(page_meta)
 
     final_content = listmerge(document_content)
     final_meta = listmerge(document_meta)
 
     return final_content, final_meta
+
+
+def iter_by_lines(
+    stream,
+    parse_images=False,
+    parse_tables=True,
+    parse_formulas=False,
+    remove_service_info=False,
+) -> Iterator[tuple[list[str], list[dict]]]:
+    """
+    Parses given pdf document to lines content and meta page by page.
+    The first pass collects only the document's formatting statistics, the second one parses the pages,
+    so only the layout of the current page is kept in memory
+    :param parse_images:
+    :param parse_tables:
+    :param parse_formulas:
+    :param stream:
+    :return: generator of the page's lines content and meta
+    """
+    params = adjust_layout_parsing_params(stream, get_layout_parsing_params())
+
+    # Get info about the general document's formatting without keeping the pages layout
+    formatting_counters = get_formatting_counters()
+    is_text_in_doc = False
+    for page in extract_pages(stream, laparams=params):
+        page_structure = get_page_structure(page, None)
+        is_text_in_doc = is_text_in_doc or is_text_in_page(page_structure)
+        get_page_formatting(page_structure, formatting_counters)
+
+    if not is_text_in_doc:
+        raise NoTextLayerError("Document contains no text layer, only images")
+
+    doc_info = get_document_info(formatting_counters)
+
+    def iter_doc_structure():
+        with pdfplumber.open(stream) as tables_reader:
+            for page_number, page in enumerate(extract_pages(stream, laparams=params)):
+                # Extract tables only from the current page using pdfplumber
+                tables_page = tables_reader.pages[page_number]
+                page_tables = tables_page.find_tables()
+                page_structure = get_page_structure(page, page_tables)
+                tables_page.close()
+                yield get_page_formatting(page_structure)
+
+    pages = extract_pages_lines(
+        stream,
+        iter_doc_structure(),
+        doc_info,
+        parse_images=parse_images,
+        parse_tables=parse_tables,
+        remove_service_info=remove_service_info,
+    )
+    if remove_service_info:
+        pages = remove_pages_service_info(pages)
+
+    yield from pages
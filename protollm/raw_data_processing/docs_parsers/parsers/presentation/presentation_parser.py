@@ -0,0 +1,96 @@
+from typing import Iterator, Union
+from uuid import uuid4
+
+from langchain_core.document_loaders import Blob
+
+from protollm.raw_data_processing.docs_parsers.parsers.entities import ParsingScheme
+from protollm.raw_data_processing.docs_parsers.parsers.lines_parser import (
+    LinesParser,
+    get_html_table,
+    get_line_metadata,
+    normalize_line,
+)
+
+
+def _iter_shapes(shapes) -> Iterator:
+    for shape in shapes:
+        if hasattr(shape, "shapes"):  # group of shapes
+            yield from _iter_shapes(shape.shapes)
+        else:
+            yield shape
+
+
+def _process_paragraph(paragraph) -> tuple[str, dict]:
+    runs = [run for run in paragraph.runs if run.text.strip()]
+    text = normalize_line(paragraph.text)
+    urls = {
+        normalize_line(run.text): run.hyperlink.address
+        for run in runs
+        if run.hyperlink.address
+    }
+    bold = bool(runs) and all(run.font.bold for run in runs)
+    return text, get_line_metadata(
+        text,
+        bold=bold,
+        is_bullet_list=True if paragraph.level > 0 else None,
+        urls=urls,
+    )
+
+
+def _process_table(table) -> tuple[str, dict]:
+    rows = [[normalize_line(cell.text) for cell in row.cells] for row in table.rows]
+    html_table = get_html_table(rows)
+    table_name = "table-" + str(uuid4())
+    return html_table, get_line_metadata(
+        html_table, list_level=-1, is_bullet_list=False, tables={table_name: html_table}
+    )
+
+
+class PresentationParser(LinesParser):
+    """
+    The parser provides a way to parse raw data from PowerPoint presentations into one or more documents.
+
+    A slide title is treated as a top-level heading, paragraphs of the other shapes become lines.
+    """
+
+    def __init__(
+        self,
+        parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        extract_tables: bool = False,
+    ):
+        try:
+            import pptx
+        except ImportError as error:
+            raise ImportError(
+                f"{error.name} package not found, please try to install it with `pip install python-pptx`"
+            )
+        super().__init__(parsing_scheme)
+        self.extract_tables = extract_tables
+
+    def iter_lines(self, blob: Blob) -> Iterator[tuple[str, dict]]:
+        from pptx import Presentation
+
+        with blob.as_bytes_io() as stream:
+            presentation = Presentation(stream)
+
+        for slide in presentation.slides:
+            title_shape = slide.shapes.title
+            title_shape_id = None
+            if title_shape is not None:
+                title_shape_id = title_shape.shape_id
+                title = normalize_line(title_shape.text_frame.text)
+                if title:
+                    yield title, get_line_metadata(
+                        title, bold=True, list_level=0, is_bullet_list=False
+                    )
+
+            for shape in _iter_shapes(slide.shapes):
+                if shape.shape_id == title_shape_id:
+                    continue
+                if shape.has_text_frame:
+                    for paragraph in shape.text_frame.paragraphs:
+                        line, meta = _process_paragraph(paragraph)
+                        if line:
+                            yield line, meta
+                elif getattr(shape, "has_table", False) and self.extract_tables:
+                    yield _process_table(shape.table)
@@ -0,0 +1 @@
+from protollm.raw_data_processing.docs_parsers.parsers.text.text_parser import TextParser
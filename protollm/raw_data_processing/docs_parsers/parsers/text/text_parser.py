@@ -0,0 +1,44 @@
+from typing import Iterator, Union
+
+from langchain_core.document_loaders import Blob
+
+from protollm.raw_data_processing.docs_parsers.parsers.entities import ParsingScheme
+from protollm.raw_data_processing.docs_parsers.parsers.lines_parser import LinesParser
+from protollm.raw_data_processing.docs_parsers.parsers.text.utilities import (
+    iter_html_lines,
+    iter_markdown_lines,
+    iter_plain_text_lines,
+    open_text,
+)
+
+
+class TextParser(LinesParser):
+    """
+    The parser provides a way to parse raw data from plain text, Markdown and HTML files into one or more documents.
+
+    Files are read line by line, the Markdown and HTML headings are treated as headings of a Word Document.
+    """
+
+    def __init__(
+        self,
+        parsing_scheme: Union[ParsingScheme, str] = ParsingScheme.lines,
+        extract_tables: bool = False,
+    ):
+        super().__init__(parsing_scheme)
+        self.extract_tables = extract_tables
+
+    def iter_lines(self, blob: Blob) -> Iterator[tuple[str, dict]]:
+        with blob.as_bytes_io() as stream:
+            if blob.mimetype == "html":
+                yield from iter_html_lines(stream, extract_tables=self.extract_tables)
+                return
+            with open_text(stream) as text_stream:
+                match blob.mimetype:
+                    case "txt":
+                        yield from iter_plain_text_lines(text_stream)
+                    case "md":
+                        yield from iter_markdown_lines(
+                            text_stream, extract_tables=self.extract_tables
+                        )
+                    case _:
+                        raise ValueError("Invalid document type")
@@ -0,0 +1,280 @@
+import codecs
+import io
+import re
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO
+from uuid import uuid4
+
+import chardet
+from lxml import etree
+
+from protollm.raw_data_processing.docs_parsers.parsers.lines_parser import (
+    get_html_table,
+    get_line_metadata,
+    normalize_line,
+)
+
+# Size of the beginning of a file which its encoding is detected on
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+def _detect_encoding(sample: bytes) -> str:
+    try:
+        # An incremental decoder allows a multibyte character to be cut at the end of the sample
+        codecs.getincrementaldecoder("utf-8")().decode(sample)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        pass
+    encoding = chardet.detect(sample)["encoding"]
+    try:
+        return codecs.lookup(encoding).name
+    except (LookupError, TypeError):
+        return "utf-8"
+
+
+def open_text(stream: BinaryIO) -> TextIO:
+    sample = stream.read(ENCODING_SAMPLE_SIZE)
+    stream.seek(0)
+    return io.TextIOWrapper(stream, encoding=_detect_encoding(sample), errors="replace")
+
+
+def iter_plain_text_lines(lines: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    for line in lines:
+        line = normalize_line(line)
+        if line:
+            yield line, get_line_metadata(line)
+
+
+# MARKDOWN
+
+_MD_HEADING_RE = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_MD_SETEXT_UNDERLINE_RE = re.compile(r"^ {0,3}(=+|-+)\s*$")
+_MD_LIST_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+_MD_BLOCKQUOTE_RE = re.compile(r"^\s*(?:>\s?)+")
+_MD_FENCE_RE = re.compile(r"^ {0,3}(?:```|~~~)")
+_MD_TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$")
+_MD_TABLE_DELIMITER_RE = re.compile(r"^\s*\|?(?:\s*:?-+:?\s*\|)+\s*(?::?-+:?\s*)?$")
+_MD_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)(?:\s+\"[^\"]*\")?\)")
+
+
+def _process_markdown_inline(text: str) -> tuple[str, dict[str, str], bool]:
+    urls = {}
+
+    def replace_link(match: re.Match) -> str:
+        urls[normalize_line(match.group(1))] = match.group(2)
+        return match.group(1)
+
+    text = _MD_LINK_RE.sub(replace_link, _MD_IMAGE_RE.sub("", text)).strip()
+    bold = len(text) > 4 and text[:2] in ("**", "__") and text.endswith(text[:2])
+    text = normalize_line(text.replace("**", "").replace("__", "").replace("`", ""))
+    return text, urls, bold
+
+
+def _get_markdown_line(
+    text: str, is_bullet_list: bool = False, list_level: Optional[int] = None
+) -> Iterator[tuple[str, dict]]:
+    text, urls, bold = _process_markdown_inline(text)
+    if not text:
+        return
+    if list_level is not None:
+        bold = True
+    yield text, get_line_metadata(
+        text,
+        bold=bold,
+        list_level=list_level,
+        is_bullet_list=True if is_bullet_list else None,
+        urls=urls,
+    )
+
+
+def _get_markdown_table(
+    rows: list[list[str]], extract_tables: bool
+) -> Iterator[tuple[str, dict]]:
+    if not extract_tables or not rows:
+        return
+    html_table = get_html_table(
+        [[_process_markdown_inline(cell)[0] for cell in row] for row in rows]
+    )
+    table_name = "table-" + str(uuid4())
+    yield html_table, get_line_metadata(
+        html_table, list_level=-1, is_bullet_list=False, tables={table_name: html_table}
+    )
+
+
+def iter_markdown_lines(
+    lines: Iterable[str], extract_tables: bool = False
+) -> Iterator[tuple[str, dict]]:
+    """
+    Yields headings, paragraphs, list items, code lines and tables of a Markdown document.
+
+    Soft-wrapped lines of a paragraph are joined, tables are skipped unless extract_tables is True.
+    """
+    paragraph, is_bullet_paragraph = [], False
+    table_rows = []
+    in_fence = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if in_fence:
+            if _MD_FENCE_RE.match(line):
+                in_fence = False
+            else:
+                yield from iter_plain_text_lines([line])
+            continue
+
+        is_table_row = _MD_TABLE_ROW_RE.match(line) is not None
+        if table_rows and not is_table_row:
+            yield from _get_markdown_table(table_rows, extract_tables)
+            table_rows = []
+
+        setext_underline = _MD_SETEXT_UNDERLINE_RE.match(line)
+        if setext_underline and paragraph and not is_bullet_paragraph:
+            level = 0 if setext_underline.group(1).startswith("=") else 1
+            yield from _get_markdown_line(" ".join(paragraph), list_level=level)
+            paragraph = []
+            continue
+
+        heading = _MD_HEADING_RE.match(line)
+        list_item = _MD_LIST_ITEM_RE.match(line)
+        if (
+            is_table_row
+            or heading
+            or list_item
+            or setext_underline
+            or _MD_FENCE_RE.match(line)
+            or not line.strip()
+        ):
+            yield from _get_markdown_line(" ".join(paragraph), is_bullet_paragraph)
+            paragraph, is_bullet_paragraph = [], False
+
+        if is_table_row:
+            if not _MD_TABLE_DELIMITER_RE.match(line):
+                table_rows.append(line.strip().strip("|").split("|"))
+        elif heading:
+            yield from _get_markdown_line(
+                heading.group(2), list_level=len(heading.group(1)) - 1
+            )
+        elif list_item:
+            paragraph, is_bullet_paragraph = [line[list_item.end():]], True
+        elif _MD_FENCE_RE.match(line):
+            in_fence = True
+        elif line.strip() and not setext_underline:
+            paragraph.append(_MD_BLOCKQUOTE_RE.sub("", line))
+
+    yield from _get_markdown_line(" ".join(paragraph), is_bullet_paragraph)
+    yield from _get_markdown_table(table_rows, extract_tables)
+
+
+# HTML
+
+_HTML_HEADINGS = {"h1": 0, "h2": 1, "h3": 2, "h4": 3, "h5": 4, "h6": 5}
+_HTML_SKIPPED = {"head", "script", "style", "noscript", "template", "svg"}
+_HTML_INLINE = {
+    "a",
+    "abbr",
+    "b",
+    "bdi",
+    "bdo",
+    "br",
+    "cite",
+    "code",
+    "data",
+    "del",
+    "dfn",
+    "em",
+    "font",
+    "i",
+    "img",
+    "ins",
+    "kbd",
+    "label",
+    "mark",
+    "q",
+    "s",
+    "samp",
+    "small",
+    "span",
+    "strong",
+    "sub",
+    "sup",
+    "time",
+    "u",
+    "var",
+    "wbr",
+}
+
+
+def _get_text(element: etree._Element) -> str:
+    return normalize_line("".join(element.itertext()))
+
+
+def _clear_block(element: etree._Element):
+    # The tail text is separated from the text of the block, which is cut out of its parent
+    element.clear(keep_tail=True)
+    element.tail = " " + (element.tail or "")
+
+
+def _get_html_table(element: etree._Element) -> str:
+    rows = [
+        [_get_text(cell) for cell in row if cell.tag in ("td", "th")]
+        for row in element.iter("tr")
+    ]
+    return get_html_table(rows)
+
+
+def iter_html_lines(
+    stream: BinaryIO, extract_tables: bool = False
+) -> Iterator[tuple[str, dict]]:
+    """
+    Yields texts of the block elements of an HTML document, the document is parsed incrementally.
+
+    Each element is cleared once processed, so its text is not repeated in the text of its parent.
+    Tables are skipped unless extract_tables is True.
+    """
+    for _, element in etree.iterparse(stream, events=("end",), html=True, recover=True):
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == "br":
+            element.tail = " " + (element.tail or "")
+        if tag in _HTML_INLINE:
+            continue
+        ancestors = {ancestor.tag for ancestor in element.iterancestors()}
+        if ancestors & _HTML_SKIPPED:
+            continue
+        if tag in _HTML_SKIPPED:
+            _clear_block(element)
+            continue
+        if "table" in ancestors:
+            continue
+
+        if tag == "table":
+            if extract_tables:
+                html_table = _get_html_table(element)
+                table_name = "table-" + str(uuid4())
+                yield html_table, get_line_metadata(
+                    html_table,
+                    list_level=-1,
+                    is_bullet_list=False,
+                    tables={table_name: html_table},
+                )
+            _clear_block(element)
+            continue
+
+        text = _get_text(element)
+        if text:
+            urls = {
+                _get_text(link): link.get("href")
+                for link in element.iter("a")
+                if link.get("href") and _get_text(link)
+            }
+            bold_text = " ".join(
+                _get_text(bold) for bold in element.iter("b", "strong")
+            )
+            yield text, get_line_metadata(
+                text,
+                bold=tag in _HTML_HEADINGS or normalize_line(bold_text) == text,
+                list_level=_HTML_HEADINGS.get(tag),
+                is_bullet_list=True if tag == "li" else None,
+                urls=urls,
+            )
+        _clear_block(element)
@@ -49,3 +49,15 @@ UNICODE_BULLETS_RE = re.compile(f"(?:{BULLETS_PATTERN})(?!{BULLETS_PATTERN})")
 def is_bulleted_text(text: str) -> bool:
     """Checks to see if the section of text is part of a bulleted list."""
     return UNICODE_BULLETS_RE.match(text.strip()) is not None
+
+
+def _get_list_level(split_text: list[str], level: int = -1) -> int:
+    if not re.search(r"[а-яА-ЯёЁ]", "".join(split_text[1:])):
+        return level
+    if not split_text:
+        return level
+    if not split_text[0].isdigit():
+        return level
+    else:
+        level += 1
+        return _get_list_level(split_text[1:], level)
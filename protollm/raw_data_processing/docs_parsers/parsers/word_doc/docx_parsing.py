@@ -11,23 +11,12 @@ from docx.text.paragraph import Paragraph
 from ftfy import fix_text
 from tabulate import tabulate
 
-from protollm.raw_data_processing.docs_parsers.parsers.utilities import is_bulleted_text
+from protollm.raw_data_processing.docs_parsers.parsers.utilities import is_bulleted_text, _get_list_level
 from protollm.raw_data_processing.docs_parsers.parsers.word_doc.docx_parsing_config import (
     DocxParsingConfig,
 )
 from protollm.raw_data_processing.docs_parsers.parsers.word_doc.xml import process_paragraph_body
-
-
-def _get_list_level(split_text: list[str], level: int = -1) -> int:
-    if not re.search(r"[а-яА-ЯёЁ]", "".join(split_text[1:])):
-        return level
-    if not split_text:
-        return level
-    if not split_text[0].isdigit():
-        return level
-    else:
-        level += 1
-        return _get_list_level(split_text[1:], level)
+from protollm.raw_data_processing.docs_parsers.parsers.word_doc.xml.xml_tag import XMLTag
 
 
 def _get_urls(paragraph: Paragraph) -> dict[str, str]:
@@ -42,7 +31,15 @@ def _get_urls(paragraph: Paragraph) -> dict[str, str]:
     return urls
 
 
-def _get_metadata(paragraph: Optional[Paragraph] = None) -> dict:
+def _is_numbered(paragraph: Paragraph) -> bool:
+    numbering_path = f"./{XMLTag.paragraph_properties.value}/{XMLTag.numbering_properties.value}"
+    return paragraph._element.find(numbering_path) is not None
+
+
+def _get_metadata(
+    paragraph: Optional[Paragraph] = None,
+    parsing_config: Optional[DocxParsingConfig] = None,
+) -> dict:
     bold = False
     font_size = -1
     urls = {}
@@ -53,26 +50,32 @@ def _get_metadata(paragraph: Optional[Paragraph] = None) -> dict:
 
     if paragraph is not None:
         bold = paragraph.runs[0].bold or bold if paragraph.runs else bold
-        bold = paragraph.style.font.bold or bold
+        style_bold = (
+            parsing_config.is_style_bold(paragraph)
+            if parsing_config is not None
+            else paragraph.style.font.bold
+        )
+        bold = style_bold or bold
 
-        font_size = (
+        # python-docx lengths are int subclasses, which are scaled again on unpickling,
+        # so plain ints are kept for the documents sent from worker processes and the parsing cache
+        font_size = int(
             paragraph.runs[0].font.size or font_size if paragraph.runs else font_size
         )
 
         urls.update(_get_urls(paragraph))
 
-        split_text = re.split("[ .\xa0]", paragraph.text)
+        paragraph_text = paragraph.text
+        split_text = re.split("[ .\xa0]", paragraph_text)
         list_level = _get_list_level(split_text)
 
-        is_bullet_list = is_bulleted_text(paragraph.text) | (
-            "<w:numPr>" in paragraph._element.xml
-        )
+        is_bullet_list = is_bulleted_text(paragraph_text) | _is_numbered(paragraph)
 
         is_centered = paragraph.paragraph_format.alignment is WD_ALIGN_PARAGRAPH.CENTER
 
         paragraph_first_line_indent = paragraph.paragraph_format.first_line_indent
         first_line_indent = (
-            paragraph_first_line_indent.emu
+            int(paragraph_first_line_indent.emu)
             if paragraph_first_line_indent is not None
             else first_line_indent
         )
@@ -100,7 +103,7 @@ def _process_paragraph(
     paragraph_text = fix_text(paragraph_text).replace("\xa0", " ")
     paragraph_text = " ".join(paragraph_text.split())
 
-    metadata = _get_metadata(paragraph)
+    metadata = _get_metadata(paragraph, parsing_config)
     metadata.update(paragraph_metadata)
 
     return paragraph_text, metadata
@@ -1,9 +1,7 @@
-from docx.document import Document
+from typing import Optional
 
-from protollm.raw_data_processing.docs_parsers.parsers.word_doc.xml.utilities import (
-    _get_omml2mml_transformation,
-    _get_mml2tex_transformation,
-)
+from docx.document import Document
+from docx.text.paragraph import Paragraph
 
 
 class DocxParsingConfig:
@@ -16,8 +14,7 @@ class DocxParsingConfig:
         self.__rels = document.part.rels
         self.__extract_images = extract_images
         self.__parse_formulas = parse_formulas
-        self.__omml2mml = None
-        self.__mml2tex = None
+        self.__styles_bold = {}
 
     @property
     def extract_images(self):
@@ -31,16 +28,10 @@ class DocxParsingConfig:
     def document_relationships(self):
         return self.__rels
 
-    @property
-    def omml2mml_transformation(self):
-        if self.__omml2mml is None and self.__parse_formulas:
-            self.__omml2mml = _get_omml2mml_transformation()
-
-        return self.__omml2mml
-
-    @property
-    def mml2tex_transformation(self):
-        if self.__mml2tex is None and self.__parse_formulas:
-            self.__mml2tex = _get_mml2tex_transformation()
+    def is_style_bold(self, paragraph: Paragraph) -> Optional[bool]:
+        # Resolving a paragraph style walks all document styles, so it is done once per style
+        style_id = paragraph._p.style
+        if style_id not in self.__styles_bold:
+            self.__styles_bold[style_id] = paragraph.style.font.bold
 
-        return self.__mml2tex
+        return self.__styles_bold[style_id]
@@ -1,4 +1,5 @@
 import re
+from typing import Iterable, Iterator
 
 from protollm.raw_data_processing.docs_parsers.parsers.utilities import (
     HEADING_KEYWORDS,
@@ -24,62 +25,83 @@ def _get_heading_hierarchy_level(text: str, metadata: dict) -> int:
     return -1
 
 
-def add_headings_hierarchy(
-    lines: list[str], metadata: list[dict]
-) -> tuple[list[str], list[dict]]:
-    new_lines, new_metadata = [], []
+def iter_headings_hierarchy(
+    lines: Iterable[tuple[str, dict]]
+) -> Iterator[tuple[str, dict]]:
     hierarchy = [""]
-    for line, line_meta in zip(lines, metadata):
+    for line, line_meta in lines:
         hierarchy_level = _get_heading_hierarchy_level(line, line_meta)
         if hierarchy_level == -1:
-            new_meta = {**line_meta, "headings": list(hierarchy)}
-            new_lines.append(line)
-            new_metadata.append(new_meta)
+            yield line, {**line_meta, "headings": list(hierarchy)}
         else:
             if hierarchy_level < len(hierarchy):
                 hierarchy = hierarchy[:hierarchy_level]
             elif hierarchy_level > len(hierarchy):
                 hierarchy.extend([""] * (hierarchy_level - len(hierarchy)))
             hierarchy.append(line)
-    return new_lines, new_metadata
 
 
-def get_chapters(
-    lines: list[str], metadata: list[dict]
-) -> tuple[list[str], list[dict]]:
-    chapters, meta = [], []
-    cur_chapter = ""
-    for line, line_meta in zip(lines, metadata):
-        if chapters and (cur_chapter == line_meta["headings"][0]):
-            chapters[-1] = join_texts(chapters[-1], line, joiner="\n")
-            update_metadata(meta[-1], line_meta)
+def iter_chapters(lines: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+    chapter_lines, meta = [], {}
+    for line, line_meta in lines:
+        if chapter_lines and (meta["chapter"] == line_meta["headings"][0]):
+            chapter_lines.append(line)
+            update_metadata(meta, line_meta)
             continue
+        if chapter_lines:
+            yield join_texts(*chapter_lines, joiner="\n"), meta
         cur_chapter = line_meta["headings"][0]
-        chapters.append(line)
-        meta.append({"chapter": cur_chapter, "headings": [cur_chapter]})
-        update_metadata(meta[-1], line_meta)
-    return chapters, meta
+        chapter_lines = [line]
+        meta = {"chapter": cur_chapter, "headings": [cur_chapter]}
+        update_metadata(meta, line_meta)
+    if chapter_lines:
+        yield join_texts(*chapter_lines, joiner="\n"), meta
 
 
-def get_paragraphs(
-    lines: list[str], metadata: list[dict]
-) -> tuple[list[str], list[dict]]:
-    paragraphs, meta = [], []
-    cur_paragraph = ""
-    for line, line_meta in zip(lines, metadata):
+def iter_paragraphs(lines: Iterable[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+    paragraph_lines, meta = [], {}
+    for line, line_meta in lines:
         if (
-            paragraphs
+            paragraph_lines
             and line_meta["is_bullet_list"]
-            and (cur_paragraph == line_meta["headings"][-1])
+            and (meta["headings"][-1] == line_meta["headings"][-1])
         ):
-            paragraphs[-1] = join_texts(paragraphs[-1], line, joiner=" ")
-            update_metadata(meta[-1], line_meta)
+            paragraph_lines.append(line)
+            update_metadata(meta, line_meta)
             continue
-        cur_paragraph = line_meta["headings"][-1]
-        paragraphs.append(line)
-        meta.append({"headings": line_meta["headings"]})
-        update_metadata(meta[-1], line_meta)
-    return paragraphs, meta
+        if paragraph_lines:
+            yield join_texts(*paragraph_lines, joiner=" "), meta
+        paragraph_lines = [line]
+        meta = {"headings": line_meta["headings"]}
+        update_metadata(meta, line_meta)
+    if paragraph_lines:
+        yield join_texts(*paragraph_lines, joiner=" "), meta
+
+
+def _unzip(items: Iterable[tuple[str, dict]]) -> tuple[list[str], list[dict]]:
+    texts, metadata = [], []
+    for text, meta in items:
+        texts.append(text)
+        metadata.append(meta)
+    return texts, metadata
+
+
+def add_headings_hierarchy(
+    lines: list[str], metadata: list[dict]
+) -> tuple[list[str], list[dict]]:
+    return _unzip(iter_headings_hierarchy(zip(lines, metadata)))
+
+
+def get_chapters(
+    lines: list[str], metadata: list[dict]
+) -> tuple[list[str], list[dict]]:
+    return _unzip(iter_chapters(zip(lines, metadata)))
+
+
+def get_paragraphs(
+    lines: list[str], metadata: list[dict]
+) -> tuple[list[str], list[dict]]:
+    return _unzip(iter_paragraphs(zip(lines, metadata)))
 
 
 def update_metadata(meta: dict, line_meta: dict):
@@ -87,5 +109,5 @@ def update_metadata(meta: dict, line_meta: dict):
         meta[key] = {**meta.get(key, {}), **line_meta.get(key, {})}
 
 
-def join_texts(original: str, new: str, joiner: str = "\n") -> str:
-    return joiner.join((original, new))
+def join_texts(*texts: str, joiner: str = "\n") -> str:
+    return joiner.join(texts)
@@ -1,12 +1,13 @@
 from functools import partial
 from pathlib import Path
-from typing import Iterator, Union, Optional
+from typing import Any, Iterator, Union, Optional
 
 from langchain_core.document_loaders import Blob
 from langchain_core.documents import Document
 
 from protollm.raw_data_processing.docs_parsers.utils.exceptions import EncodingError
 from protollm.raw_data_processing.docs_parsers.parsers.base import BaseParser
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converted_cache import ConvertedFilesCache
 from protollm.raw_data_processing.docs_parsers.parsers.entities import ParsingScheme
 from protollm.raw_data_processing.docs_parsers.parsers.word_doc.utilities import (
     get_paragraphs,
@@ -28,6 +29,8 @@ class WordDocumentParser(BaseParser):
         extract_tables: bool = False,
         extract_formulas: bool = False,
         timeout_for_converting: Optional[int] = None,
+        workers_for_converting: Optional[int] = None,
+        cache_for_converting: Optional[Union[str, Path, ConvertedFilesCache]] = None,
     ):
         try:
             import protollm.raw_data_processing.docs_parsers.parsers.word_doc.docx_parsing
@@ -44,6 +47,22 @@ class WordDocumentParser(BaseParser):
         self.extract_tables = extract_tables
         self.extract_formulas = extract_formulas
         self.timeout = timeout_for_converting
+        self.workers_for_converting = workers_for_converting
+        if cache_for_converting is not None and not isinstance(
+            cache_for_converting, ConvertedFilesCache
+        ):
+            cache_for_converting = ConvertedFilesCache(cache_for_converting)
+        self.cache_for_converting = cache_for_converting
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        # Converting options do not change the parsing result
+        return {
+            "parsing_scheme": self.parsing_scheme,
+            "extract_images": self.extract_images,
+            "extract_tables": self.extract_tables,
+            "extract_formulas": self.extract_formulas,
+        }
 
     def lazy_parse(self, blob: Blob) -> Iterator[Document]:
         from protollm.raw_data_processing.docs_parsers.parsers.word_doc.docx_parsing import (
@@ -65,7 +84,10 @@ class WordDocumentParser(BaseParser):
 
                 with blob.as_bytes_io() as file_obj:
                     with converted_file_to_docx(
-                        file_obj, timeout=self.timeout
+                        file_obj,
+                        timeout=self.timeout,
+                        workers=self.workers_for_converting,
+                        cache=self.cache_for_converting,
                     ) as docx_file_obj:
                         lines, metadata = parse_docx_to_lines(docx_file_obj)
             case "docx":
@@ -1,16 +1,36 @@
+import threading
+from functools import lru_cache
 from pathlib import Path
 
 from lxml import etree
 
+_XSL_DIR = Path(Path(__file__).parent, "xsl")
+
+# Compiled stylesheets are shared by all documents and threads of the process
+_transformations: dict[Path, etree.XSLT] = {}
+_transformations_lock = threading.Lock()
+
+
+def _get_transformation(xsl_file: Path) -> etree.XSLT:
+    with _transformations_lock:
+        if xsl_file not in _transformations:
+            _transformations[xsl_file] = etree.XSLT(etree.parse(xsl_file))
+        return _transformations[xsl_file]
+
 
 def _get_omml2mml_transformation() -> etree.XSLT:
-    omml2mml_file = Path(Path(__file__).parent, "xsl", "omml2mml", "OMML2MML.XSL")
-    omml2mml = etree.XSLT(etree.parse(omml2mml_file))
-    return omml2mml
+    omml2mml_file = Path(_XSL_DIR, "omml2mml", "OMML2MML.XSL")
+    return _get_transformation(omml2mml_file)
 
 
 def _get_mml2tex_transformation() -> etree.XSLT:
-    mml2tex_file = Path(Path(__file__).parent, "xsl", "mml2tex", "mmltex.xsl")
-    mml2tex = etree.XSLT(etree.parse(mml2tex_file))
+    mml2tex_file = Path(_XSL_DIR, "mml2tex", "mmltex.xsl")
+    return _get_transformation(mml2tex_file)
+
 
-    return mml2tex
+@lru_cache(maxsize=4096)
+def _convert_omml_to_latex(omml: bytes) -> str:
+    """Converts serialized OMML formula to LaTeX. Results are memoised by the formula content."""
+    math_ml = _get_omml2mml_transformation()(etree.fromstring(omml)).getroot()
+    tex = _get_mml2tex_transformation()(math_ml)
+    return str(tex)
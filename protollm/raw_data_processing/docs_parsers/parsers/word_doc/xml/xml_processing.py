@@ -5,15 +5,12 @@ from PIL import Image
 from docx.text.paragraph import Paragraph
 from lxml import etree
 
+from protollm.raw_data_processing.docs_parsers.parsers.word_doc.xml.utilities import _convert_omml_to_latex
 from protollm.raw_data_processing.docs_parsers.parsers.word_doc.xml.xml_tag import XMLTag
 
 
-def _convert_to_latex(
-    xml_element: etree.Element, parsing_config: 'DocxParsingConfig'
-) -> str:
-    math_ml = parsing_config.omml2mml_transformation(xml_element).getroot()
-    tex = parsing_config.mml2tex_transformation(math_ml)
-    return str(tex)
+def _convert_to_latex(xml_element: etree.Element) -> str:
+    return _convert_omml_to_latex(etree.tostring(xml_element))
 
 
 def _extract_image_data(
@@ -57,7 +54,8 @@ def _parse_raw_xml_element(
 def process_paragraph_body(
     paragraph: Paragraph, parsing_config: 'DocxParsingConfig'
 ) -> tuple[str, dict[str, dict]]:
-    xml_paragraph = etree.fromstring(paragraph._element.xml)
+    # python-docx already holds the paragraph as lxml element, so it is walked as is
+    xml_paragraph = paragraph._element
     texts = []
     extracted_data = {"images": {}, "formulas": {}}
     for element in xml_paragraph:
@@ -72,8 +70,6 @@ def process_paragraph_body(
                 if parsing_config.parse_formulas:
                     formula_name = "formula-" + str(uuid4())
                     texts.append(f"{{{formula_name}}}")
-                    extracted_data["formulas"][formula_name] = _convert_to_latex(
-                        element, parsing_config
-                    )
+                    extracted_data["formulas"][formula_name] = _convert_to_latex(element)
 
     return "".join(texts), extracted_data
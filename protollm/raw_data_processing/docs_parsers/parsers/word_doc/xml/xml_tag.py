@@ -17,6 +17,8 @@ def _get_xml_tag_name(tag: str, namespace: str) -> str:
 class XMLTag(str, Enum):
     raw = _get_xml_tag_name("r", "w")
     text = _get_xml_tag_name("t", "w")
+    paragraph_properties = _get_xml_tag_name("pPr", "w")
+    numbering_properties = _get_xml_tag_name("numPr", "w")
     image = _get_xml_tag_name("drawing", "w")
     blip = _get_xml_tag_name("blip", "a")
     embed = _get_xml_tag_name("embed", "r")
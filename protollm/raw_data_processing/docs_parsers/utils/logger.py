@@ -19,6 +19,10 @@ class ParsingLogger:
     def logs(self):
         return self._logs
 
+    @property
+    def silent_errors(self):
+        return self._silent_errors
+
     def info(self, msg: str, *args, **kwargs):
         self._logger.info(msg, *args, **kwargs)
 
@@ -0,0 +1,44 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
+
+
+def parallel_map(
+    func: Callable,
+    tasks: Iterable[tuple],
+    max_workers: int,
+    preserve_order: bool = True,
+) -> Iterator[tuple[tuple, Future]]:
+    """
+    Runs func(*task) for every task in a pool of processes and yields pairs (task, future) of finished tasks.
+
+    Tasks are submitted lazily, no more than twice the number of workers are in flight at once.
+    Finished tasks are yielded in the order of submission if preserve_order is True, otherwise in order of completion.
+    """
+    max_pending = 2 * max_workers
+    tasks = iter(tasks)
+    pending: deque[tuple[Any, Future]] = deque()
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit_next() -> bool:
+        for task in tasks:
+            pending.append((task, executor.submit(func, *task)))
+            return True
+        return False
+
+    try:
+        while len(pending) < max_pending and submit_next():
+            pass
+        while pending:
+            if preserve_order:
+                task, future = pending.popleft()
+                wait([future])
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                index = next(i for i, (_, future) in enumerate(pending) if future in done)
+                task, future = pending[index]
+                del pending[index]
+            submit_next()
+            yield task, future
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,3 +1,5 @@
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
@@ -5,13 +7,33 @@ import chardet
 from ftfy import is_bad
 
 
+# Lines of ASCII characters, russian letters and common punctuation can't contain mojibake sequences known to ftfy
+_RUSSIAN_TEXT_RE = re.compile(
+    r"[\x00-\x7f\xa0–—…’]*[А-яЁё][\x00-\x7f\xa0–—…’А-яЁё]*"
+)
+
+
 def is_bad_encoding(lines: list[str]) -> bool:
-    count_bad = sum([_is_bad(line) for line in lines], start=0)
-    proportion_bad = count_bad / max(1, len(lines))
-    return proportion_bad >= 0.5
+    # Stops as soon as the proportion of bad lines is known to be below or above the threshold
+    threshold = 0.5 * max(1, len(lines))
+    count_bad = count_good = 0
+    for line in lines:
+        if _is_bad(line):
+            count_bad += 1
+            if count_bad >= threshold:
+                return True
+        else:
+            count_good += 1
+            if len(lines) - count_good < threshold:
+                return False
+    return count_bad >= threshold
 
 
 def _is_bad(text: str) -> bool:
+    if text.isascii():
+        return True
+    if _RUSSIAN_TEXT_RE.fullmatch(text):
+        return False
     if is_bad(text):
         return True
     # This verification works for russian docs !!!
@@ -28,6 +50,7 @@ def correct_path_encoding(path: Union[str, Path]) -> str:
     return str(path)
 
 
+@lru_cache(maxsize=65536)
 def fix_zip_path(path: str) -> str:
     try:
         string_bytes = path.encode("437")
@@ -1,2 +1,2 @@
-from chunk_merger import ChunkMerger
-from recursive_splitter import RecursiveSplitter
+from protollm.raw_data_processing.docs_transformers.chunk_merger import ChunkMerger
+from protollm.raw_data_processing.docs_transformers.recursive_splitter import RecursiveSplitter
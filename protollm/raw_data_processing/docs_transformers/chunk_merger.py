@@ -1,11 +1,16 @@
 import logging
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Optional
 
 from langchain_core.documents import Document
 from langchain_text_splitters import TextSplitter
 
+from protollm.raw_data_processing.docs_transformers.utilities import BatchLengthMixin
+
 logger = logging.getLogger(__name__)
 
+# Metadata fields, which values of the merged documents are collected
+_SET_FIELDS = ("keywords", "object", "action")
+
 
 def _get_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
     chapter = metadata["headings"][0] if metadata.get("headings", []) else ""
@@ -21,62 +26,72 @@ def _get_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
     return meta
 
 
-class ChunkMerger(TextSplitter):
+class ChunkMerger(BatchLengthMixin, TextSplitter):
     def __init__(self, joiner: str = " ", **kwargs: Any):
         super().__init__(**kwargs)
         self.joiner = joiner
 
     def _merge_documents(self, documents: Iterable[Document]) -> List[Document]:
         documents = list(documents)
-        if not documents:
-            return []
-        first_doc = documents[0]
-        merged_chunk_content = first_doc.page_content
-        merged_chunk_meta = _get_metadata(first_doc.metadata)
-        chapter, source = merged_chunk_meta["chapter"], merged_chunk_meta["source"]
+        lengths = self._get_lengths([doc.page_content for doc in documents])
+        joiner_length = self._length_function(self.joiner) if self.joiner else 0
         transformed_docs = []
-        for doc in documents[1:]:
-            doc_text = doc.page_content
+        # The chunk text is joined only when the chunk is completed, its length is accumulated
+        chunk_texts, chunk_meta, chunk_length = [], {}, 0
+        for doc, doc_length in zip(documents, lengths):
             doc_meta = _get_metadata(doc.metadata)
-            doc_chapter, doc_source = doc_meta["chapter"], doc_meta["source"]
-
             if (
-                doc_chapter == chapter and doc_source == source
+                chunk_texts
+                and doc_meta["chapter"] == chunk_meta["chapter"]
+                and doc_meta["source"] == chunk_meta["source"]
             ):
-                merged_text = self.joiner.join((merged_chunk_content, doc_text))
-                if self._length_function(merged_text) <= self._chunk_size:
-                    merged_chunk_content = merged_text
-                    merged_chunk_meta["keywords"] += doc_meta["keywords"]
-                    merged_chunk_meta["object"] += doc_meta["object"]
-                    merged_chunk_meta["action"] += doc_meta["action"]
+                # The merged text is measured only if the sum of the lengths exceeds the chunk size
+                merged_length = chunk_length + joiner_length + doc_length
+                if merged_length > self._chunk_size:
+                    merged_length = self._length_function(
+                        self.joiner.join((*chunk_texts, doc.page_content))
+                    )
+                if merged_length <= self._chunk_size:
+                    chunk_texts.append(doc.page_content)
+                    chunk_length = merged_length
+                    for key in _SET_FIELDS:
+                        chunk_meta[key].update(dict.fromkeys(doc_meta[key]))
                     continue
 
-            if merged_chunk_content:
-                merged_chunk_meta["keywords"] = ", ".join(
-                    set(merged_chunk_meta["keywords"])
-                )
-                merged_chunk_meta["object"] = ", ".join(
-                    set(merged_chunk_meta["object"])
-                )
-                merged_chunk_meta["action"] = ", ".join(
-                    set(merged_chunk_meta["action"])
-                )
-                transformed_docs.append(
-                    self._create_document(merged_chunk_content, merged_chunk_meta)
-                )
-
-            merged_chunk_content, merged_chunk_meta = doc_text, doc_meta
-            chapter, source = doc_chapter, doc_source
-
-        if merged_chunk_content:
-            transformed_docs.append(
-                self._create_document(merged_chunk_content, merged_chunk_meta)
-            )
-
+            if chunk_texts:
+                self._add_chunk(transformed_docs, chunk_texts, chunk_meta, chunk_length)
+            chunk_texts, chunk_length = [doc.page_content], doc_length
+            # Dicts are used as ordered sets of the values
+            chunk_meta = {
+                **doc_meta,
+                **{key: dict.fromkeys(doc_meta[key]) for key in _SET_FIELDS},
+            }
+
+        if chunk_texts:
+            self._add_chunk(transformed_docs, chunk_texts, chunk_meta, chunk_length)
         return transformed_docs
 
-    def _create_document(self, text: str, metadata: dict[str, Any]) -> Document:
-        text_len = self._length_function(text)
+    def _add_chunk(
+        self,
+        transformed_docs: List[Document],
+        chunk_texts: List[str],
+        chunk_meta: dict[str, Any],
+        chunk_length: int,
+    ):
+        chunk_content = self.joiner.join(chunk_texts)
+        if not chunk_content:
+            return
+        for key in _SET_FIELDS:
+            chunk_meta[key] = ", ".join(chunk_meta[key])
+        transformed_docs.append(
+            self._create_document(chunk_content, chunk_meta, chunk_length)
+        )
+
+    def _create_document(
+        self, text: str, metadata: dict[str, Any], text_len: Optional[int] = None
+    ) -> Document:
+        if text_len is None:
+            text_len = self._length_function(text)
         if text_len > self._chunk_size:
             logger.warning(
                 f"A chunk of size {text_len} was encountered, "
@@ -1,19 +1,53 @@
 import logging
-import os
-from typing import Any, Iterable, Optional, List, Tuple
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, List, Tuple
 
 import spacy
 from langchain_core.documents import Document
+from spacy.language import Language
+from spacy.tokens import Doc
 from langchain_text_splitters import TextSplitter
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SPACY_MODEL = "ru_core_news_sm"
+
+_spacy_models: dict[str, Language] = {}
+_spacy_models_lock = threading.Lock()
+
+
+def get_spacy_model(name: str = DEFAULT_SPACY_MODEL) -> Language:
+    """
+    Returns the process-wide spaCy model, it is loaded once and shared by all the extractors.
+
+    The model is expected to be installed as a package or to be a path to a model directory,
+    nothing is downloaded.
+    """
+    with _spacy_models_lock:
+        if name not in _spacy_models:
+            if not spacy.util.is_package(name) and not Path(name).exists():
+                raise OSError(
+                    f"spaCy model {name} not found, please install it with `python -m spacy download {name}`"
+                )
+            _spacy_models[name] = spacy.load(name)
+        return _spacy_models[name]
+
 
 class MultiMetadataAppender(TextSplitter):
-    def __init__(self, separators: Optional[Iterable[str]] = None, **kwargs: Any):
+    def __init__(
+        self,
+        separators: Optional[Iterable[str]] = None,
+        batch_size: int = 64,
+        n_process: int = 1,
+        spacy_model: str = DEFAULT_SPACY_MODEL,
+        **kwargs: Any,
+    ):
         super().__init__(**kwargs)
         self._separators = separators or [r"\. (?<![0-9]\. | ^[0-9].)"]
-        self.keyword_extractor = KeywordExtractor()
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.keyword_extractor = KeywordExtractor(spacy_model)
 
     def _create_document(self, text: str, metadata: dict[str, Any]) -> Document:
         text_len = self._length_function(text)
@@ -27,15 +61,18 @@ class MultiMetadataAppender(TextSplitter):
     def _split_with_additional_metadata(
         self, documents: Iterable[Document]
     ) -> List[Document]:
+        documents = list(documents)
         texts, metadatas = [], []
-        for doc in documents:
+        # Both features are computed from a single parse of each text
+        features = self.keyword_extractor.pipe(
+            (doc.page_content for doc in documents),
+            batch_size=self.batch_size,
+            n_process=self.n_process,
+        )
+        for doc, (obj, action, keywords) in zip(documents, features):
             doc_metadata = doc.metadata
-            doc_metadata["object"], doc_metadata["action"] = (
-                self.keyword_extractor.get_object_action_pair(doc.page_content)
-            )
-            doc_metadata["keywords"] = self.keyword_extractor.get_keywords(
-                doc.page_content
-            )
+            doc_metadata["object"], doc_metadata["action"] = obj, action
+            doc_metadata["keywords"] = keywords
             texts.append(doc.page_content)
             metadatas.append(doc_metadata)
         return self.create_documents(texts, metadatas=metadatas)
@@ -48,12 +85,30 @@ class MultiMetadataAppender(TextSplitter):
 
 
 class KeywordExtractor:
-    def __init__(self):
-        os.system("python -m spacy download ru_core_news_sm")
-        self.nlp = spacy.load("ru_core_news_sm")
+    # Only the dependency parse and lemmas are used, so the other components are not run
+    unused_components = ("ner", "senter")
+
+    def __init__(self, spacy_model: str = DEFAULT_SPACY_MODEL):
+        self.nlp = get_spacy_model(spacy_model)
+
+    def pipe(
+        self, texts: Iterable[str], batch_size: int = 64, n_process: int = 1
+    ) -> Iterator[Tuple[str, str, List[str]]]:
+        """Yields the object, the action and the keywords of each text, texts are parsed in batches."""
+        disable = [name for name in self.unused_components if name in self.nlp.pipe_names]
+        for tokens in self.nlp.pipe(
+            texts, batch_size=batch_size, n_process=n_process, disable=disable
+        ):
+            yield *self._get_object_action_pair(tokens), self._get_keywords(tokens)
 
     def get_keywords(self, text: str) -> List[str]:
-        tokens = self.nlp(text)
+        return self._get_keywords(self.nlp(text))
+
+    def get_object_action_pair(self, text: str) -> Tuple[str, str]:
+        return self._get_object_action_pair(self.nlp(text))
+
+    @staticmethod
+    def _get_keywords(tokens: Doc) -> List[str]:
         subjects = []
         for token in tokens:
             if "nsubj" in token.dep_ or "obj" in token.dep_:
@@ -73,8 +128,8 @@ class KeywordExtractor:
 
         return list(set([token.lemma_ for token in result_tokens]))
 
-    def get_object_action_pair(self, text: str) -> Tuple[str, str]:
-        tokens = self.nlp(text)
+    @staticmethod
+    def _get_object_action_pair(tokens: Doc) -> Tuple[str, str]:
         for token in tokens:
             if "nsubj" in token.dep_ or "obj" in token.dep_:
                 return token.lemma_, token.head.lemma_
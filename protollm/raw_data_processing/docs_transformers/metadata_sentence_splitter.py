@@ -1,16 +1,48 @@
+import hashlib
 import logging
-import re
-from typing import Any, Iterable, Optional, List
+from typing import Any, Iterable, Optional, List, Sequence
 
 from langchain_core.documents import Document
-from langchain_text_splitters import TextSplitter
-
-from protollm.raw_data_processing.docs_transformers.utilities import fix_list_dots_separators
+from langchain_core.stores import BaseStore
+from protollm.raw_data_processing.docs_transformers.sentences_splitter import SentencesSplitter
+from protollm.raw_data_processing.docs_transformers.utilities import BatchLengthMixin
 
 logger = logging.getLogger(__name__)
 
+PARENT_ID_KEY = "div_id"
+
+
+def expand_parent_documents(
+    documents: Sequence[Document],
+    parent_store: BaseStore[str, Document],
+    parent_id_key: str = PARENT_ID_KEY,
+) -> List[Document]:
+    """
+    Adds the text of the parent documents to metadata["div"] of the sentences split in the parent store mode.
 
-class DivMetadataSentencesSplitter(TextSplitter):
+    All the parents are fetched from the store at once.
+    """
+    parent_ids = list(
+        dict.fromkeys(
+            doc.metadata[parent_id_key]
+            for doc in documents
+            if parent_id_key in doc.metadata
+        )
+    )
+    parents = dict(zip(parent_ids, parent_store.mget(parent_ids)))
+    expanded_docs = []
+    for doc in documents:
+        parent = parents.get(doc.metadata.get(parent_id_key))
+        if parent is not None:
+            doc = Document(
+                page_content=doc.page_content,
+                metadata={**doc.metadata, "div": parent.page_content},
+            )
+        expanded_docs.append(doc)
+    return expanded_docs
+
+
+class DivMetadataSentencesSplitter(BatchLengthMixin, SentencesSplitter):
     """
     Splitter that divide document into sentences and add the source of this sentence to metadata.
 
@@ -39,14 +71,27 @@ class DivMetadataSentencesSplitter(TextSplitter):
                     The main idea of most of them is to combine identical sequences into one class or cluster based on similarity.
                     As a rule, the choice of algorithm is determined by the task at hand.'}
         ]
+
+    If parent_store is given, the Document is saved to it once and the sentences get only its id
+    in metadata['div_id'] instead of 'div', the text is restored by expand_parent_documents.
     """
 
-    def __init__(self, separators: Optional[Iterable[str]] = None, **kwargs: Any):
-        super().__init__(**kwargs)
-        self._separators = separators or [r"\. (?<![0-9]\. | ^[0-9].)"]
+    def __init__(
+        self,
+        separators: Optional[Iterable[str]] = None,
+        parent_store: Optional[BaseStore[str, Document]] = None,
+        parent_id_key: str = PARENT_ID_KEY,
+        **kwargs: Any,
+    ):
+        super().__init__(separators, **kwargs)
+        self.parent_store = parent_store
+        self.parent_id_key = parent_id_key
 
-    def _create_document(self, text: str, metadata: dict[str, Any]) -> Document:
-        text_len = self._length_function(text)
+    def _create_document(
+        self, text: str, metadata: dict[str, Any], text_len: Optional[int] = None
+    ) -> Document:
+        if text_len is None:
+            text_len = self._length_function(text)
         if text_len > self._chunk_size:
             logger.warning(
                 f"A chunk of size {text_len} was encountered, "
@@ -57,24 +102,28 @@ class DivMetadataSentencesSplitter(TextSplitter):
     def _split_on_sentences_with_additional_metadata(
         self, documents: Iterable[Document]
     ) -> List[Document]:
+        documents = list(documents)
         splitted_docs = []
-        for doc in documents:
-            doc_metadata = doc.metadata
-            doc_metadata["div"] = doc.page_content
+        parents = {}
+        sentences = self.split_texts([doc.page_content for doc in documents])
+        for doc, texts in zip(documents, sentences):
+            if self.parent_store is None:
+                doc_metadata = {**doc.metadata, "div": doc.page_content}
+            else:
+                # Identical paragraphs are stored once
+                parent_id = hashlib.sha256(doc.page_content.encode()).hexdigest()
+                parents[parent_id] = doc
+                doc_metadata = {**doc.metadata, self.parent_id_key: parent_id}
             splitted_docs.extend(
                 [
-                    self._create_document(text, doc_metadata)
-                    for text in self.split_text(doc.page_content)
+                    self._create_document(text, dict(doc_metadata), text_len)
+                    for text, text_len in zip(texts, self._get_lengths(texts))
                 ]
             )
 
+        if parents:
+            self.parent_store.mset(list(parents.items()))
         return splitted_docs
 
     def split_documents(self, documents: Iterable[Document]) -> List[Document]:
         return self._split_on_sentences_with_additional_metadata(documents)
-
-    def split_text(self, text: str) -> List[str]:
-        sentences_lst = [
-            x.strip() for x in re.split(" | ".join(self._separators), text)
-        ]
-        return fix_list_dots_separators(sentences_lst)
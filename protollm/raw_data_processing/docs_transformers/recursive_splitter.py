@@ -1,12 +1,15 @@
 import logging
+import re
 from typing import Any, Iterable, List, Optional
 
-from langchain_text_splitters.character import RecursiveCharacterTextSplitter
+from langchain_text_splitters.character import RecursiveCharacterTextSplitter, _split_text_with_regex
+
+from protollm.raw_data_processing.docs_transformers.utilities import BatchLengthMixin
 
 logger = logging.getLogger(__name__)
 
 
-class RecursiveSplitter(RecursiveCharacterTextSplitter):
+class RecursiveSplitter(BatchLengthMixin, RecursiveCharacterTextSplitter):
     """Splitting text by the given sequence of splitters.
     """
 
@@ -38,27 +41,96 @@ class RecursiveSplitter(RecursiveCharacterTextSplitter):
             return [text]
         return self._split_text(text, self._separators)
 
-    def _merge_splits(self, splits: Iterable[str], separator: str) -> List[str]:
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        # The same as in RecursiveCharacterTextSplitter, but the splits are measured once and in a batch
+        separator = separators[-1]
+        new_separators = []
+        for i, _s in enumerate(separators):
+            _separator = _s if self._is_separator_regex else re.escape(_s)
+            if _s == "":
+                separator = _s
+                break
+            if re.search(_separator, text):
+                separator = _s
+                new_separators = separators[i + 1:]
+                break
+
+        _separator = separator if self._is_separator_regex else re.escape(separator)
+        splits = _split_text_with_regex(
+            text, _separator, keep_separator=self._keep_separator
+        )
+        lengths = self._get_lengths(splits)
+
+        final_chunks = []
+        good_splits, good_lengths = [], []
+        _separator = "" if self._keep_separator else separator
+        for split, length in zip(splits, lengths):
+            if length < self._chunk_size:
+                good_splits.append(split)
+                good_lengths.append(length)
+                continue
+            if good_splits:
+                final_chunks.extend(
+                    self._merge_splits(good_splits, _separator, good_lengths)
+                )
+                good_splits, good_lengths = [], []
+            if not new_separators:
+                final_chunks.append(split)
+            else:
+                final_chunks.extend(self._split_text(split, new_separators))
+        if good_splits:
+            final_chunks.extend(
+                self._merge_splits(good_splits, _separator, good_lengths)
+            )
+        return final_chunks
+
+    def _merge_splits(
+        self,
+        splits: Iterable[str],
+        separator: str,
+        lengths: Optional[List[int]] = None,
+    ) -> List[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
+        splits = list(splits)
+        if lengths is None:
+            lengths = self._get_lengths(splits)
+        separator_length = self._length_function(separator) if separator else 0
+
         docs = []
         current_doc = []
-        for text in splits:
+        # The running total of the split lengths is an upper bound of the merged text length,
+        # the merged text itself is measured only if the total exceeds the chunk size
+        total = 0
+        for text, length in zip(splits, lengths):
+            estimate = total + length + (separator_length if current_doc else 0)
+            if estimate <= self._chunk_size:
+                current_doc.append(text)
+                total = estimate
+                continue
             merged_text = self._join_docs([*current_doc, text], separator)
-            if (
-                merged_text is None
-                or self._length_function(merged_text) <= self._chunk_size
-            ):
+            if merged_text is None:
+                current_doc.append(text)
+                total = estimate
+                continue
+            merged_length = self._length_function(merged_text)
+            if merged_length <= self._chunk_size:
                 current_doc.append(text)
+                # The total is reset by the measured length, so the next splits aren't measured every time.
+                # The length of the unstripped text is used, the stripped whitespace returns when the next split is joined
+                if self._strip_whitespace:
+                    merged_length = self._length_function(separator.join(current_doc))
+                total = min(estimate, merged_length)
                 continue
             doc = self._join_docs(current_doc, separator)
-            if doc is None and self._length_function(text) > self._chunk_size:
+            if doc is None and length > self._chunk_size:
                 logger.warning(
                     f"Created a chunk, which is longer than the specified {self._chunk_size}"
                 )
             else:
                 docs.append(doc)
             current_doc = [text]
+            total = length
         doc = self._join_docs(current_doc, separator)
         if doc is not None:
             docs.append(doc)
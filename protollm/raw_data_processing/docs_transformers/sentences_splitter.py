@@ -1,18 +1,58 @@
 import re
+from functools import lru_cache
 from typing import Any, Iterable, Optional
 
 from langchain_text_splitters import TextSplitter
 
 from protollm.raw_data_processing.docs_transformers.utilities import fix_list_dots_separators
 
+SENTENCES_SPLITTING_BACKENDS = ("regex", "spacy")
+
+
+@lru_cache(maxsize=None)
+def _get_sentencizer(language: str):
+    # The rule-based sentencizer needs no trained model, so spaCy is imported only if it is used
+    import spacy
+
+    nlp = spacy.blank(language)
+    nlp.add_pipe("sentencizer")
+    return nlp
+
 
 class SentencesSplitter(TextSplitter):
-    def __init__(self, separators: Optional[Iterable[str]] = None, **kwargs: Any):
+    """
+    Splitter that divides text into sentences.
+
+    By default, the text is split by the separators regular expressions. The 'spacy' backend
+    uses the rule-based spaCy sentencizer of the given language instead, the separators are ignored then.
+    """
+
+    def __init__(
+        self,
+        separators: Optional[Iterable[str]] = None,
+        backend: str = "regex",
+        language: str = "ru",
+        **kwargs: Any,
+    ):
         super().__init__(**kwargs)
+        if backend not in SENTENCES_SPLITTING_BACKENDS:
+            raise ValueError(f"Invalid sentences splitting backend: {backend}")
         self._separators = separators or [r"\. (?<![0-9]\. | ^[0-9].)"]
+        self._separators_pattern = re.compile(" | ".join(self._separators))
+        self.backend = backend
+        self.language = language
 
     def split_text(self, text: str) -> list[str]:
-        sentences_lst = [
-            x.strip() for x in re.split(" | ".join(self._separators), text)
+        return self.split_texts([text])[0]
+
+    def split_texts(self, texts: list[str]) -> list[list[str]]:
+        """Splits each of the texts into sentences, the texts are processed in a batch by the spaCy backend."""
+        if self.backend == "spacy":
+            nlp = _get_sentencizer(self.language)
+            splits = ([sent.text for sent in doc.sents] for doc in nlp.pipe(texts))
+        else:
+            splits = (self._separators_pattern.split(text) for text in texts)
+        return [
+            fix_list_dots_separators([x.strip() for x in sentences])
+            for sentences in splits
         ]
-        return fix_list_dots_separators(sentences_lst)
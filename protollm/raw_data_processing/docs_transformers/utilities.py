@@ -1,4 +1,47 @@
 import re
+from typing import Any, Callable, Optional, Sequence
+
+
+class BatchLengthMixin:
+    """
+    Mixin for text splitters, which measures lists of texts at once.
+
+    The texts are measured by batch_length_function if it is given, otherwise by length_function one by one.
+    The length of identical texts of a list is computed once.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        batch_length_function: Optional[Callable[[list[str]], list[int]]] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._batch_length_function = batch_length_function
+
+    def _get_lengths(self, texts: Sequence[str]) -> list[int]:
+        unique_texts = list(dict.fromkeys(texts))
+        if not unique_texts:
+            return []
+        if self._batch_length_function is not None:
+            unique_lengths = self._batch_length_function(unique_texts)
+        else:
+            unique_lengths = [self._length_function(text) for text in unique_texts]
+        lengths = dict(zip(unique_texts, unique_lengths))
+        return [lengths[text] for text in texts]
+
+    @classmethod
+    def from_huggingface_tokenizer(cls, tokenizer: Any, **kwargs: Any):
+        """The same as TextSplitter.from_huggingface_tokenizer, but a fast tokenizer also encodes texts in batches"""
+        if getattr(tokenizer, "is_fast", False):
+            backend_tokenizer = tokenizer.backend_tokenizer
+
+            def _huggingface_tokenizer_batch_length(texts: list[str]) -> list[int]:
+                encodings = backend_tokenizer.encode_batch(texts, add_special_tokens=False)
+                return [len(encoding.ids) for encoding in encodings]
+
+            kwargs.setdefault("batch_length_function", _huggingface_tokenizer_batch_length)
+        return super().from_huggingface_tokenizer(tokenizer, **kwargs)
 
 
 def fix_list_dots_separators(sentences: list[str]) -> list[str]:
@@ -9,19 +52,19 @@ def fix_list_dots_separators(sentences: list[str]) -> list[str]:
     """
     fixed_sentences_lst = []
     sentence_parts_lst = []
-    i = 0
-    while i < len(sentences):
-        chunk = sentences[i].strip()
-        if len(chunk) > 0:
-            # it means that the dot was used to separate list elements, and we should join such sentences
-            if not chunk[0].isupper() and not chunk[0].isdigit():
-                sentence_parts_lst.append(chunk)
-            else:
-                if len(sentence_parts_lst) != 0:
-                    fixed_sentences_lst.append("; ".join(sentence_parts_lst))
-                sentence_parts_lst = [chunk]
-        i += 1
-
-    if len(sentence_parts_lst) != 0:
+    for chunk in sentences:
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        first_char = chunk[0]
+        # it means that the dot was used to separate list elements, and we should join such sentences
+        if not first_char.isupper() and not first_char.isdigit():
+            sentence_parts_lst.append(chunk)
+        else:
+            if sentence_parts_lst:
+                fixed_sentences_lst.append("; ".join(sentence_parts_lst))
+            sentence_parts_lst = [chunk]
+
+    if sentence_parts_lst:
         fixed_sentences_lst.append("; ".join(sentence_parts_lst))
     return fixed_sentences_lst
@@ -1,15 +1,124 @@
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain.tools.render import render_text_description
+from langchain_core.callbacks import AsyncCallbackManagerForToolRun, CallbackManagerForToolRun
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import BaseTool
+from collections import OrderedDict
+from inspect import signature
+from typing import Any, Callable, Hashable, Optional
+import json
 import os
+import threading
+import time
+
+# Time in seconds, during which the results of the web tools are reused for the same query
+WEB_TOOLS_CACHE_TTL = 3600
+
+
+class TTLCache:
+    """Thread-safe cache, which entries expire after ttl seconds, the least recently used ones are evicted above max_size"""
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class CachedTool(BaseTool):
+    """Wrapper of a tool, which reuses its results for the same arguments during ttl seconds"""
+
+    tool: BaseTool
+    cache: TTLCache
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def __init__(self, tool: BaseTool, ttl: float = WEB_TOOLS_CACHE_TTL, max_size: int = 1024):
+        super().__init__(
+            tool=tool,
+            cache=TTLCache(ttl, max_size),
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            response_format=tool.response_format,
+        )
+
+    def _get_key(self, args: tuple, kwargs: dict) -> str:
+        # The same arguments passed positionally or by name give the same key
+        arguments = {**dict(zip(self.tool.args, args)), **kwargs}
+        return json.dumps(arguments, sort_keys=True, default=str)
+
+    @staticmethod
+    def _get_tool_kwargs(func: Callable, kwargs: dict, config: RunnableConfig, run_manager) -> dict:
+        # The config and the run manager are passed to the tool in the same way as BaseTool.run passes them
+        parameters = signature(func).parameters
+        if "config" in parameters:
+            kwargs["config"] = config
+        if "run_manager" in parameters:
+            kwargs["run_manager"] = run_manager
+        return kwargs
+
+    def _run(
+        self,
+        *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        key = self._get_key(args, kwargs)
+        missing = object()
+        result = self.cache.get(key, missing)
+        if result is missing:
+            kwargs = self._get_tool_kwargs(self.tool._run, kwargs, config, run_manager)
+            result = self.tool._run(*args, **kwargs)
+            self.cache.set(key, result)
+        return result
+
+    async def _arun(
+        self,
+        *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Any:
+        key = self._get_key(args, kwargs)
+        missing = object()
+        result = self.cache.get(key, missing)
+        if result is missing:
+            # BaseTool._arun runs _run of the tool in an executor, if the tool has no asynchronous implementation
+            func = self.tool._run if type(self.tool)._arun is BaseTool._arun else self.tool._arun
+            kwargs = self._get_tool_kwargs(func, kwargs, config, run_manager)
+            result = await self.tool._arun(*args, **kwargs)
+            self.cache.set(key, result)
+        return result
 
 
 tavily_tool = None
 
 if os.getenv('TAVILY_API_KEY') is not None:
     tavily_tool = TavilySearchResults(max_results=5)
-    web_tools = [tavily_tool]
+    web_tools = [CachedTool(tavily_tool)]
 else:
-    web_tools = [DuckDuckGoSearchResults()]
+    web_tools = [CachedTool(DuckDuckGoSearchResults())]
     
 web_tools_rendered = render_text_description(web_tools).replace('duckduckgo_results_json', 'DuckDuckGoSearchResults')
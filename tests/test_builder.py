@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.types import Command
+
+from protollm.agents.builder import GraphBuilder
+
+AGENT_DURATION = 1.0
+
+PROMPT_FIELDS = {
+    "chat": ["problem_statement", "additional_hints"],
+    "planner": ["problem_statement", "additional_hints", "rules", "examples", "desc_restrictions"],
+    "replanner": ["problem_statement", "additional_hints", "rules", "examples"],
+    "summary": ["problem_statement", "additional_hints", "rules"],
+    "supervisor": [
+        "problem_statement",
+        "problem_statement_continue",
+        "rules",
+        "examples",
+        "additional_rules",
+        "enhancemen_significance",
+    ],
+}
+
+
+def _answer(messages) -> str:
+    text = " ".join(str(message.content) for message in messages)
+    if "replanning expert" in text:
+        return json.dumps({"action": "response", "response": "done"})
+    if "formulate final answer" in text:
+        return "final"
+    if "You are tasked with executing" in text:
+        return json.dumps({"next": ["agent_a", "agent_b"]})
+    if "call next worker: planner" in text:
+        return json.dumps({"action": {"next": "planner"}})
+    return json.dumps({"steps": [["task A", "task B"]]})
+
+
+class FakeChatModel(BaseChatModel):
+    """Answers each of the graph nodes by the text of its prompt"""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=_answer(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(0.01)
+        return self._generate(messages, stop, **kwargs)
+
+
+async def agent_a(state, config):
+    await asyncio.sleep(AGENT_DURATION)
+    return Command(update={"past_steps": {(state["task"], "A")}})
+
+
+async def agent_b(state, config):
+    await asyncio.sleep(AGENT_DURATION)
+    return Command(update={"past_steps": {(state["task"], "B")}})
+
+
+def _make_graph() -> GraphBuilder:
+    return GraphBuilder(
+        {
+            "recursion_limit": 50,
+            "configurable": {
+                "llm": FakeChatModel(),
+                "max_retries": 1,
+                "scenario_agents": ["agent_a", "agent_b"],
+                "scenario_agent_funcs": {"agent_a": agent_a, "agent_b": agent_b},
+                "tools_for_agents": {},
+                "tools_descp": "",
+                "prompts": {
+                    name: {field: "" if field == "additional_hints" else None for field in fields}
+                    for name, fields in PROMPT_FIELDS.items()
+                },
+            },
+        }
+    )
+
+
+def test_graph_ainvoke_runs_scenario_agents_concurrently():
+    graph = _make_graph()
+
+    start = time.monotonic()
+    result = asyncio.run(graph.ainvoke({"input": "question"}))
+    duration = time.monotonic() - start
+
+    assert result["response"] == "final"
+    assert set(result["past_steps"]) == {("task A", "A"), ("task B", "B")}
+    # Both agents sleep at the same time
+    assert duration < AGENT_DURATION * 1.5
+
+
+def test_graph_astream_yields_steps_and_concurrent_requests_do_not_block():
+    graph = _make_graph()
+
+    async def run():
+        events = [event async for event in graph.astream({"input": "question"})]
+        start = time.monotonic()
+        results = await asyncio.gather(*(graph.ainvoke({"input": "question"}) for _ in range(5)))
+        return events, results, time.monotonic() - start
+
+    events, results, duration = asyncio.run(run())
+
+    assert len(events) > 1
+    assert events[-1]["response"] == "final"
+    assert [result["response"] for result in results] == ["final"] * 5
+    assert duration < AGENT_DURATION * 1.5
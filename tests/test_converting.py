@@ -0,0 +1,167 @@
+import io
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from protollm.raw_data_processing.docs_parsers.parsers.converting import (
+    converted_file as converted_file_module,
+    converter_pool,
+)
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converted_cache import (
+    ConvertedFilesCache,
+)
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converted_file import (
+    converted_file,
+)
+from protollm.raw_data_processing.docs_parsers.parsers.converting.converter_pool import (
+    SofficeConverterPool,
+)
+from protollm.raw_data_processing.docs_parsers.utils.exceptions import ConvertingError
+
+
+class FakeWorker:
+    """Converts a file by copying it, the file content defines whether the conversion fails or hangs"""
+
+    instances = []
+
+    def __init__(self, start_timeout: int = 60):
+        self.is_alive = True
+        self.restarts = 0
+        self.stopped = False
+        self.instances.append(self)
+
+    def restart(self):
+        self.restarts += 1
+        self.is_alive = True
+
+    def stop(self):
+        self.stopped = True
+
+    def convert(self, filename, output_path, target_doc_type="docx"):
+        content = Path(filename).read_text()
+        if content == "hang":
+            time.sleep(1)
+        if content == "crash":
+            self.is_alive = False
+            raise RuntimeError("soffice has crashed")
+        Path(output_path).write_text(content.upper())
+
+
+@pytest.fixture
+def fake_worker(monkeypatch):
+    monkeypatch.setattr(FakeWorker, "instances", [])
+    monkeypatch.setattr(converter_pool, "SofficeWorker", FakeWorker)
+    return FakeWorker
+
+
+def _convert_files(pool: SofficeConverterPool, tmp_path: Path, contents: list) -> list:
+    paths = []
+    for i, content in enumerate(contents):
+        path = tmp_path / f"file_{i}.doc"
+        path.write_text(content)
+        paths.append(path)
+    threads = [
+        threading.Thread(target=pool.convert, args=(path, tmp_path)) for path in paths
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [(tmp_path / f"{path.stem}.docx").read_text() for path in paths]
+
+
+def test_converter_pool_reuses_workers(fake_worker, tmp_path):
+    with SofficeConverterPool(workers=2) as pool:
+        results = _convert_files(pool, tmp_path, [f"text {i}" for i in range(6)])
+
+    assert results == [f"TEXT {i}" for i in range(6)]
+    assert 1 <= len(fake_worker.instances) <= 2
+    assert all(worker.stopped for worker in fake_worker.instances)
+
+
+def test_converter_pool_restarts_failed_and_hung_workers(fake_worker, tmp_path):
+    with SofficeConverterPool(workers=1) as pool:
+        for content in ("crash", "hang"):
+            path = tmp_path / f"{content}.doc"
+            path.write_text(content)
+            with pytest.raises(ConvertingError):
+                pool.convert(path, tmp_path, timeout=0.1)
+
+        assert _convert_files(pool, tmp_path, ["text"]) == ["TEXT"]
+
+    (worker,) = fake_worker.instances
+    assert worker.restarts == 2
+
+
+def test_closed_converter_pool_releases_waiting_callers(fake_worker, monkeypatch, tmp_path):
+    monkeypatch.setattr(converter_pool, "_ACQUIRE_POLL_INTERVAL", 0.05)
+    pool = SofficeConverterPool(workers=1)
+    busy_worker = pool._acquire()
+    errors = []
+
+    def acquire():
+        try:
+            pool._acquire()
+        except ConvertingError as error:
+            errors.append(error)
+
+    waiting_thread = threading.Thread(target=acquire)
+    waiting_thread.start()
+    pool.close()
+    waiting_thread.join(timeout=5)
+    pool._release(busy_worker)
+
+    assert not waiting_thread.is_alive()
+    assert len(errors) == 1
+    assert busy_worker.stopped
+
+
+def test_shared_converter_pool_grows(fake_worker, monkeypatch):
+    monkeypatch.setattr(converter_pool, "_converter_pool", None)
+
+    pool = converter_pool.get_converter_pool(1)
+
+    assert converter_pool.get_converter_pool(3) is pool
+    assert converter_pool.get_converter_pool(2) is pool
+    assert pool.workers == 3
+    pool.close()
+
+
+def test_converted_file_is_taken_from_cache(monkeypatch, tmp_path):
+    conversions = []
+
+    def fake_convert(filename, output_directory, target_doc_type, timeout):
+        conversions.append(filename)
+        Path(f"{filename}.{target_doc_type}").write_bytes(Path(filename).read_bytes().upper())
+
+    monkeypatch.setattr(converted_file_module, "_convert_with_soffice", fake_convert)
+    cache = ConvertedFilesCache(tmp_path / "cache")
+
+    results = []
+    for content in (b"first", b"first", b"second"):
+        with converted_file(io.BytesIO(content), "docx", cache=cache) as f:
+            results.append(f.read())
+
+    assert results == [b"FIRST", b"FIRST", b"SECOND"]
+    assert len(conversions) == 2
+    with cache.open(cache.get_key(b"first", "docx")) as f:
+        assert f.read() == b"FIRST"
+
+
+def test_converted_files_cache_evicts_least_recently_used_files(tmp_path):
+    cache = ConvertedFilesCache(tmp_path / "cache", max_size=25)
+    source = tmp_path / "converted.docx"
+    source.write_bytes(b"0123456789")
+
+    for i, key in enumerate(["a.docx", "b.docx"]):
+        cache.put(key, source)
+        os.utime(cache.cache_dir / key, (i, i))
+    # Opening the file marks it as recently used
+    cache.open("a.docx").close()
+    cache.put("c.docx", source)
+
+    assert sorted(path.name for path in cache.cache_dir.iterdir()) == ["a.docx", "c.docx"]
+    assert cache.open("b.docx") is None
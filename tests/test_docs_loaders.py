@@ -0,0 +1,142 @@
+import zipfile
+from pathlib import Path
+
+import docx
+from docx.shared import Pt, Twips
+
+from protollm.raw_data_processing.docs_parsers.loaders import (
+    RecursiveDirectoryLoader,
+    TextDocumentLoader,
+    WordDocumentLoader,
+    ZipLoader,
+)
+from protollm.raw_data_processing.docs_parsers.loaders.directory_loader import _walk_files
+from protollm.raw_data_processing.docs_parsers.loaders.zip_loader import _member_blob
+
+
+def _make_docx(path, title):
+    document = docx.Document()
+    heading = document.add_paragraph()
+    heading.add_run(title).bold = True  # the parser expects russian texts
+    for i in range(3):
+        paragraph = document.add_paragraph()
+        paragraph.add_run(f"{title}, абзац номер {i} с текстом.").font.size = Pt(9)
+        paragraph.paragraph_format.first_line_indent = Twips(709)
+    document.save(path)
+
+
+def test_parallel_and_sequential_loads_are_equal(tmp_path):
+    for i in range(3):
+        _make_docx(tmp_path / f"document_{i}.docx", f"Документ {i}")
+
+    sequential_docs = RecursiveDirectoryLoader(tmp_path).load()
+    parallel_docs = RecursiveDirectoryLoader(tmp_path, max_workers=2).load()
+
+    assert sequential_docs
+    assert parallel_docs == sequential_docs
+    for document in parallel_docs:
+        assert type(document.metadata["font_size"]) is int
+        assert type(document.metadata["first_line_indent"]) is int
+
+
+def test_parsing_cache_hit_is_equal_to_parsing(tmp_path):
+    file_path = tmp_path / "document.docx"
+    _make_docx(file_path, "Документ")
+    cache_dir = tmp_path / "cache"
+
+    parsed_docs = WordDocumentLoader(file_path, cache_for_parsing=cache_dir).load()
+    cached_docs = WordDocumentLoader(file_path, cache_for_parsing=cache_dir).load()
+
+    assert any(cache_dir.iterdir())
+    assert parsed_docs
+    assert cached_docs == parsed_docs
+
+
+def test_english_markdown_is_parsed(tmp_path):
+    file_path = tmp_path / "document.md"
+    file_path.write_text("# Title\n\nThe first paragraph.\n\nThe second paragraph.\n")
+
+    docs = TextDocumentLoader(file_path).load()
+
+    assert [doc.page_content for doc in docs] == [
+        "The first paragraph.",
+        "The second paragraph.",
+    ]
+    assert all(doc.metadata["headings"] == ["Title"] for doc in docs)
+
+
+def test_one_row_html_table_keeps_its_row(tmp_path):
+    file_path = tmp_path / "document.html"
+    file_path.write_text(
+        "<html><body><p>Text</p><table><tr><td>a</td><td>b</td></tr></table></body></html>"
+    )
+
+    docs = TextDocumentLoader(file_path, extract_tables=True).load()
+    tables = [
+        table for doc in docs for table in doc.metadata["tables"].values()
+    ]
+
+    assert len(tables) == 1
+    assert "<td>a</td><td>b</td>" in tables[0]
+
+
+def _make_zip(path):
+    with zipfile.ZipFile(path, "w") as z:
+        for i in range(3):
+            z.writestr(f"folder/document_{i}.md", f"# Title {i}\n\n" + "Some text. " * 100 * (i + 1))
+    return path
+
+
+def test_zip_members_are_spooled_above_threshold(tmp_path):
+    archive_path = _make_zip(tmp_path / "archive.zip")
+    with zipfile.ZipFile(archive_path) as z:
+        info = z.getinfo("folder/document_1.md")
+        with _member_blob(z, info, "document_1.md", "md", max_size_in_memory=info.file_size) as blob:
+            assert blob.data is not None
+            small_data = blob.as_bytes()
+        with _member_blob(z, info, "document_1.md", "md", max_size_in_memory=info.file_size - 1) as blob:
+            assert blob.data is None and Path(blob.path).exists()
+            assert blob.source == "document_1.md"
+            assert blob.as_bytes() == small_data
+        assert not Path(blob.path).exists()
+
+
+def test_zip_loading_modes_are_equal(tmp_path):
+    archive_path = _make_zip(tmp_path / "archive.zip")
+
+    docs = ZipLoader(archive_path).load()
+
+    assert len({doc.metadata["file_name"] for doc in docs}) == 3
+    assert ZipLoader(archive_path, max_member_size_in_memory=1).load() == docs
+    assert ZipLoader(archive_path, mmap_archive=True).load() == docs
+    assert ZipLoader(archive_path, byte_content=archive_path.read_bytes()).load() == docs
+    assert ZipLoader(
+        archive_path, byte_content=archive_path.read_bytes(), max_workers=2
+    ).load() == docs
+
+
+def test_walk_files_skips_hidden_entries_and_directory_links(tmp_path):
+    for path in [
+        "b.md",
+        "a/d.md",
+        "a/c/e.md",
+        "a/.hidden.md",
+        ".hidden_dir/f.md",
+        "g/h.txt",
+    ]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("Text")
+    (tmp_path / "link").symlink_to(tmp_path / "a", target_is_directory=True)
+
+    files = [path.relative_to(tmp_path).as_posix() for path in _walk_files(tmp_path)]
+
+    assert files == ["b.md", "a/d.md", "a/c/e.md", "g/h.txt"]
+
+
+def test_directory_loader_excludes_files(tmp_path):
+    for name in ["first.md", "second.md", "image.png"]:
+        (tmp_path / name).write_text(f"# {name}\n\nSome text of {name}.")
+
+    docs = RecursiveDirectoryLoader(tmp_path, exclude_files=["second.md"]).load()
+
+    assert {doc.metadata["file_name"] for doc in docs} == {"first.md"}
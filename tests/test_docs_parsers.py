@@ -0,0 +1,115 @@
+import itertools
+from pathlib import Path
+
+import pytest
+from ftfy import is_bad
+from langchain_core.document_loaders import Blob
+
+from protollm.raw_data_processing.docs_parsers.parsers import PDFParser
+from protollm.raw_data_processing.docs_parsers.utils import utilities
+from protollm.raw_data_processing.docs_parsers.utils.utilities import is_bad_encoding
+
+FONTS_DIR = Path("/usr/share/fonts/truetype/dejavu")
+
+
+def _make_pdf(path: Path, with_headings: bool, pages: int = 7):
+    pytest.importorskip("reportlab")
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.pdfgen import canvas
+
+    if not (FONTS_DIR / "DejaVuSans-Bold.ttf").exists():
+        pytest.skip("DejaVu fonts are required to draw russian text")
+    pdfmetrics.registerFont(TTFont("DejaVuSans", FONTS_DIR / "DejaVuSans.ttf"))
+    pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", FONTS_DIR / "DejaVuSans-Bold.ttf"))
+
+    pdf = canvas.Canvas(str(path))
+    for page in range(pages):
+        y = 800
+        if with_headings and page in (1, 4):
+            pdf.setFont("DejaVuSans-Bold", 16)
+            pdf.drawString(72, y, f"Глава {page} Введение в предмет")
+            y -= 30
+        pdf.setFont("DejaVuSans", 11)
+        for i in range(12):
+            # The indented lines start new paragraphs
+            pdf.drawString(90 if i % 4 == 0 else 72, y, f"Строка {i} на странице {page} содержит обычный текст абзаца.")
+            y -= 14
+        pdf.drawString(300, 40, str(page + 1))
+        pdf.showPage()
+    pdf.save()
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["headings", "no_headings"])
+def pdf_path(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("pdf") / "document.pdf"
+    _make_pdf(path, with_headings=request.param)
+    return path
+
+
+@pytest.mark.parametrize("parsing_scheme", ["lines", "paragraphs"])
+@pytest.mark.parametrize("remove_service_info", [False, True])
+def test_pdf_parsed_by_pages_is_equal_to_parsed_at_once(
+    pdf_path, parsing_scheme, remove_service_info
+):
+    kwargs = dict(parsing_scheme=parsing_scheme, remove_service_info=remove_service_info)
+
+    docs = list(PDFParser(**kwargs).lazy_parse(Blob.from_path(pdf_path)))
+    streamed_docs = list(
+        PDFParser(stream_by_pages=True, **kwargs).lazy_parse(Blob.from_path(pdf_path))
+    )
+
+    assert docs
+    assert streamed_docs == docs
+    # The document without headings has one common heading
+    assert all(
+        doc.metadata["headings"] == ["Документ"]
+        for doc in docs
+        if "Документ" in doc.metadata["headings"]
+    )
+
+
+ENCODING_SAMPLE_LINES = [
+    "Обычный русский текст — с тире, «кавычками» и числами 123.",
+    "Plain ASCII text",
+    "Ð\x9eÐ±Ñ\x8bÑ\x87Ð½Ñ\x8bÐ¹ Ñ\x82ÐµÐºÑ\x81Ñ\x82",
+    "Îáû÷íûé òåêñò",
+    "Texte français avec des accents",
+    "Ελληνικό κείμενο",
+    "",
+]
+
+
+def _is_bad_line(text: str) -> bool:
+    """The line check before the early exit and the fast paths were added"""
+    if is_bad(text):
+        return True
+    try:
+        text.encode("sloppy-windows-1252")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def test_bad_line_fast_paths_give_the_same_result():
+    for line in ENCODING_SAMPLE_LINES:
+        assert utilities._is_bad(line) == _is_bad_line(line), line
+
+
+def test_bad_encoding_early_exit_keeps_threshold(monkeypatch):
+    checked_lines = []
+
+    def is_bad_line(text: str) -> bool:
+        checked_lines.append(text)
+        return _is_bad_line(text)
+
+    monkeypatch.setattr(utilities, "_is_bad", is_bad_line)
+    for size in range(6):
+        for lines in itertools.product(ENCODING_SAMPLE_LINES[:4], repeat=size):
+            lines = list(lines)
+            expected = sum(map(_is_bad_line, lines)) / max(1, len(lines)) >= 0.5
+            assert is_bad_encoding(lines) == expected, lines
+
+    checked_lines.clear()
+    assert not is_bad_encoding([ENCODING_SAMPLE_LINES[0]] * 100)
+    assert len(checked_lines) == 51
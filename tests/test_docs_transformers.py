@@ -0,0 +1,294 @@
+import random
+import re
+
+import pytest
+import spacy
+from langchain_core.documents import Document
+from langchain_core.stores import InMemoryStore
+from spacy.language import Language
+from spacy.tokens import Doc
+
+from protollm.raw_data_processing.docs_transformers import ChunkMerger, RecursiveSplitter
+from protollm.raw_data_processing.docs_transformers import key_words_splitter
+from protollm.raw_data_processing.docs_transformers.key_words_splitter import (
+    KeywordExtractor,
+    MultiMetadataAppender,
+)
+from protollm.raw_data_processing.docs_transformers.metadata_sentence_splitter import (
+    DivMetadataSentencesSplitter,
+    expand_parent_documents,
+)
+from protollm.raw_data_processing.docs_transformers.sentences_splitter import SentencesSplitter
+from protollm.raw_data_processing.docs_transformers.utilities import fix_list_dots_separators
+
+WHITESPACE_HEAVY_TEXT = "альфа \n \n \n\n    \n\n \n\n тета бета"
+
+
+class BaselineRecursiveSplitter(RecursiveSplitter):
+    """Measures every merged text as RecursiveCharacterTextSplitter does"""
+
+    def _merge_splits(self, splits, separator, lengths=None):
+        docs, current_doc = [], []
+        for text in splits:
+            merged_text = self._join_docs([*current_doc, text], separator)
+            if merged_text is None or self._length_function(merged_text) <= self._chunk_size:
+                current_doc.append(text)
+                continue
+            doc = self._join_docs(current_doc, separator)
+            if doc is not None or self._length_function(text) <= self._chunk_size:
+                docs.append(doc)
+            current_doc = [text]
+        doc = self._join_docs(current_doc, separator)
+        if doc is not None:
+            docs.append(doc)
+        return docs
+
+
+def _random_texts(count: int) -> list:
+    words = ["a", "bb", "слово", "  ", " \n ", "\n", "\n\n", ". ", ";", ", ", " ", "    ", "x" * 15]
+    rng = random.Random(0)
+    return [
+        "".join(rng.choice(words) for _ in range(rng.randint(0, 200)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [20, 50])
+def test_recursive_splitter_chunks_of_whitespace_heavy_text_fit_chunk_size(chunk_size):
+    texts = [WHITESPACE_HEAVY_TEXT * 3, *_random_texts(300)]
+    for text in texts:
+        for keep_separator in (True, False):
+            kwargs = dict(chunk_size=chunk_size, keep_separator=keep_separator, length_function=len)
+            chunks = RecursiveSplitter(**kwargs).split_text(text)
+
+            # The single splits longer than the chunk size are the only exceeding chunks
+            assert all(len(chunk) <= max(chunk_size, 15) for chunk in chunks if chunk)
+            assert chunks == BaselineRecursiveSplitter(**kwargs).split_text(text)
+
+
+def test_recursive_splitter_measures_merged_texts_rarely():
+    calls = []
+
+    def count_words(text: str) -> int:
+        calls.append(text)
+        return len(text.split())
+
+    text = " ".join(["word"] * 5000)
+    chunks = RecursiveSplitter(chunk_size=500, length_function=count_words).split_text(text)
+
+    assert [len(chunk.split()) for chunk in chunks] == [500] * 10
+    assert len(calls) < 100
+
+
+def test_lengths_of_identical_texts_are_computed_once():
+    texts = ["мама мыла раму", "папа", "мама мыла раму", "", "папа", "книга"]
+    measured_texts, batches = [], []
+
+    def length(text: str) -> int:
+        measured_texts.append(text)
+        return len(text.split())
+
+    def batch_length(batch: list) -> list:
+        batches.append(batch)
+        return [len(text.split()) for text in batch]
+
+    lengths = RecursiveSplitter(length_function=length)._get_lengths(texts)
+    batch_lengths = RecursiveSplitter(batch_length_function=batch_length)._get_lengths(texts)
+
+    assert lengths == batch_lengths == [3, 1, 3, 0, 1, 1]
+    assert measured_texts == ["мама мыла раму", "папа", "", "книга"]
+    assert batches == [measured_texts]
+    assert RecursiveSplitter(length_function=length)._get_lengths([]) == []
+
+
+def test_huggingface_tokenizer_measures_texts_in_batches():
+    pytest.importorskip("transformers")
+    from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+    from transformers import PreTrainedTokenizerFast
+
+    words = "мама мыла раму Папа читал книгу. Это тест, и ещё тест".split()
+    rng = random.Random(0)
+    tokenizer = Tokenizer(models.WordPiece(unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.train_from_iterator(
+        [" ".join(rng.choices(words, k=50)) for _ in range(200)],
+        trainers.WordPieceTrainer(vocab_size=60, special_tokens=["[UNK]"]),
+    )
+    hf_tokenizer = PreTrainedTokenizerFast(tokenizer_object=tokenizer, unk_token="[UNK]")
+    texts = [" ".join(rng.choices(words, k=rng.randint(0, 30))) for _ in range(50)]
+
+    splitter = RecursiveSplitter.from_huggingface_tokenizer(hf_tokenizer, chunk_size=20)
+
+    assert splitter._batch_length_function is not None
+    assert splitter._get_lengths(texts) == [len(hf_tokenizer.tokenize(text)) for text in texts]
+    text = " ".join(texts)
+    assert splitter.split_text(text) == BaselineRecursiveSplitter.from_huggingface_tokenizer(
+        hf_tokenizer, chunk_size=20, batch_length_function=None
+    ).split_text(text)
+
+
+@Language.component("fake_dependency_parser")
+def fake_dependency_parser(doc: Doc) -> Doc:
+    """Makes each token depend on the previous one, the dependency labels are cycled"""
+    deps = ["nsubj", "nmod", "ROOT", "obj", "nmod"]
+    return Doc(
+        doc.vocab,
+        words=[token.text for token in doc],
+        heads=[max(i - 1, 0) for i in range(len(doc))],
+        deps=[deps[i % len(deps)] for i in range(len(doc))],
+        lemmas=[token.text.lower() for token in doc],
+    )
+
+
+@pytest.fixture
+def fake_spacy_model(monkeypatch):
+    nlp = spacy.blank("ru")
+    nlp.add_pipe("fake_dependency_parser")
+    monkeypatch.setitem(key_words_splitter._spacy_models, "fake_model", nlp)
+    return "fake_model"
+
+
+def test_keyword_extractor_pipe_is_equal_to_single_texts(fake_spacy_model):
+    texts = [f"Мама {i} мыла раму очень долго и Папа читал книгу" for i in range(50)]
+    texts += ["", "слово", "Кот"]
+    extractor = KeywordExtractor(fake_spacy_model)
+
+    expected = [
+        (*extractor.get_object_action_pair(text), sorted(extractor.get_keywords(text)))
+        for text in texts
+    ]
+    features = [
+        (obj, action, sorted(keywords))
+        for obj, action, keywords in extractor.pipe(texts, batch_size=8)
+    ]
+
+    assert features == expected
+    assert any(keywords for _, _, keywords in expected)
+
+    appender = MultiMetadataAppender(spacy_model=fake_spacy_model, batch_size=8, chunk_size=1000)
+    docs = appender.split_documents([Document(page_content=text) for text in texts])
+    assert [
+        (doc.metadata["object"], doc.metadata["action"], sorted(doc.metadata["keywords"]))
+        for doc in docs
+    ] == expected
+
+
+def _merge_documents_one_by_one(documents: list, chunk_size: int, length_function) -> list:
+    """Merges the documents measuring every merged text as ChunkMerger did before the lengths were summed"""
+    chunks = []
+    for doc in documents:
+        key = (doc.metadata["headings"][0] if doc.metadata["headings"] else "", doc.metadata["source"])
+        if chunks and chunks[-1][0] == key:
+            merged_text = " ".join((chunks[-1][1], doc.page_content))
+            if length_function(merged_text) <= chunk_size:
+                chunks[-1][1] = merged_text
+                chunks[-1][2].update(doc.metadata["keywords"])
+                continue
+        chunks.append([key, doc.page_content, set(doc.metadata["keywords"])])
+    return [(text, keywords) for _, text, keywords in chunks if text]
+
+
+@pytest.mark.parametrize("length_function", [len, lambda text: len(text.split())], ids=["chars", "words"])
+def test_chunk_merger_is_equal_to_merging_one_by_one(length_function):
+    rng = random.Random(0)
+    words = ["мама", "мыла", "раму", "", "Папа", "читал", "книгу."]
+    for _ in range(50):
+        documents = [
+            Document(
+                page_content=" ".join(rng.choices(words, k=rng.randint(0, 20))),
+                metadata={
+                    "headings": rng.choice([[], ["A"], ["B", "C"]]),
+                    "source": rng.choice(["first", "second"]),
+                    "keywords": rng.sample(words[:3], k=2),
+                    "object": rng.choice(words),
+                },
+            )
+            for _ in range(rng.randint(0, 100))
+        ]
+        chunk_size = rng.randint(5, 150)
+
+        chunks = ChunkMerger(
+            chunk_size=chunk_size, chunk_overlap=0, length_function=length_function
+        ).split_documents(documents)
+
+        assert [
+            (chunk.page_content, set(filter(None, chunk.metadata["keywords"].split(", "))))
+            for chunk in chunks
+        ] == _merge_documents_one_by_one(documents, chunk_size, length_function)
+
+
+SENTENCE_PARTS = ["Мама мыла раму", ". ", "1. ", "первый пункт", "Второй", " ", "2.", "\n", "а. ", "Итог"]
+
+
+def _random_paragraphs(count: int) -> list:
+    rng = random.Random(0)
+    return ["".join(rng.choices(SENTENCE_PARTS, k=rng.randint(0, 40))) for _ in range(count)]
+
+
+def test_sentences_splitter_splits_texts_in_batch_as_one_by_one():
+    texts = _random_paragraphs(500)
+    splitter = SentencesSplitter(chunk_size=100, chunk_overlap=0)
+
+    sentences = splitter.split_texts(texts)
+
+    assert sentences == [splitter.split_text(text) for text in texts]
+    # The separators pattern is compiled once, the splitting itself is not changed
+    pattern = " | ".join(splitter._separators)
+    assert sentences == [
+        fix_list_dots_separators([x.strip() for x in re.split(pattern, text)]) for text in texts
+    ]
+
+
+def test_spacy_sentences_splitter_splits_texts_in_batch_as_one_by_one():
+    texts = ["Первое предложение. Второе! Третье?", "", *_random_paragraphs(100)]
+    splitter = SentencesSplitter(backend="spacy", chunk_size=100, chunk_overlap=0)
+
+    sentences = splitter.split_texts(texts)
+
+    assert sentences == [splitter.split_text(text) for text in texts]
+    assert sentences[0] == ["Первое предложение.", "Второе!", "Третье?"]
+    with pytest.raises(ValueError):
+        SentencesSplitter(backend="unknown")
+
+
+class CountingStore(InMemoryStore):
+    def __init__(self):
+        super().__init__()
+        self.mget_calls = []
+        self.mset_calls = 0
+
+    def mget(self, keys):
+        self.mget_calls.append(list(keys))
+        return super().mget(keys)
+
+    def mset(self, key_value_pairs):
+        self.mset_calls += 1
+        return super().mset(key_value_pairs)
+
+
+def test_parent_documents_are_stored_once_and_expanded():
+    paragraphs = _random_paragraphs(50)
+    documents = [
+        Document(page_content=text, metadata={"source": i % 3})
+        for i, text in enumerate(paragraphs + paragraphs[:10])
+    ]
+    store = CountingStore()
+
+    div_docs = DivMetadataSentencesSplitter(chunk_size=100, chunk_overlap=0).split_documents(documents)
+    sentences = DivMetadataSentencesSplitter(
+        parent_store=store, chunk_size=100, chunk_overlap=0
+    ).split_documents(documents)
+
+    assert all("div" not in doc.metadata for doc in documents)
+    assert all("div" not in doc.metadata and "div_id" in doc.metadata for doc in sentences)
+    assert store.mset_calls == 1
+    assert len(list(store.yield_keys())) == len(set(paragraphs))
+
+    expanded = expand_parent_documents([*sentences, Document(page_content="no parent")], store)
+
+    assert len(store.mget_calls) == 1
+    assert len(store.mget_calls[0]) == len(set(doc.metadata["div_id"] for doc in sentences))
+    assert expanded[-1] == Document(page_content="no parent")
+    assert [(doc.page_content, doc.metadata["div"], doc.metadata["source"]) for doc in expanded[:-1]] == [
+        (doc.page_content, doc.metadata["div"], doc.metadata["source"]) for doc in div_docs
+    ]
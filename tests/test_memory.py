@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from protollm.agents.agent_utils.memory import ChromaMemory, StoreMemory
+from protollm.agents.agent_utils.states import initialize_state
+
+WORDS = ["water", "cancer", "molecule"]
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds the texts by the keywords they contain"""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(word in text.lower()) + 0.01 for word in WORDS]
+
+
+def _make_memory() -> StoreMemory:
+    memory = StoreMemory.from_embeddings(KeywordEmbeddings(), dims=len(WORDS), top_k=1)
+    memory.add("1", ["Water is H2O", "Cancer is treated by chemotherapy"])
+    memory.add("2", ["Molecule of user 2"])
+    return memory
+
+
+def test_store_memory_searches_by_meaning_per_user():
+    memory = _make_memory()
+
+    assert memory.search("1", "What is water?") == ["Water is H2O"]
+    assert memory.search("1", "How to treat cancer?") == ["Cancer is treated by chemotherapy"]
+    assert "Molecule of user 2" not in memory.search("1", "molecule", k=2)
+    assert asyncio.run(memory.asearch("2", "molecule")) == ["Molecule of user 2"]
+
+
+def test_initial_state_contains_relevant_memories():
+    state = initialize_state("What is water?", "1", memory=_make_memory())
+
+    assert state["last_memory"] == "- Water is H2O"
+    assert state["input"] == "What is water?"
+
+    assert initialize_state("What is water?", "1")["last_memory"] == ""
+
+
+def test_chroma_memory_is_persisted(tmp_path):
+    pytest.importorskip("langchain_chroma")
+    memory = ChromaMemory(KeywordEmbeddings(), persist_directory=tmp_path, top_k=1)
+    memory.add("1", ["Water is H2O", "Cancer is treated by chemotherapy"])
+    asyncio.run(memory.aadd("2", ["Molecule of user 2"]))
+    del memory
+
+    assert (tmp_path / "chroma.sqlite3").exists()
+    memory = ChromaMemory(KeywordEmbeddings(), persist_directory=tmp_path, top_k=1)
+
+    assert memory.search("1", "What is water?") == ["Water is H2O"]
+    assert memory.search("1", "How to treat cancer?") == ["Cancer is treated by chemotherapy"]
+    assert "Molecule of user 2" not in memory.search("1", "molecule", k=3)
+    assert asyncio.run(memory.asearch("2", "molecule")) == ["Molecule of user 2"]
@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from protollm.agents.agent_utils import retry
+from protollm.agents.agent_utils.retry import (ErrorKind, RetriesExhaustedError,
+                                               RetryPolicy, arun_with_retry,
+                                               classify_error, run_with_retry)
+
+
+class FakeCall:
+    """Raises the given errors one by one, then returns the result"""
+
+    def __init__(self, errors: list, result="result"):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class RateLimitError(Exception):
+    pass
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    delays = []
+
+    async def fake_async_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(retry.time, "sleep", delays.append)
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_async_sleep)
+    return delays
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (OutputParserException("bad json"), ErrorKind.parse),
+        (StatusError(429), ErrorKind.transient),
+        (StatusError(503), ErrorKind.transient),
+        (StatusError(401), ErrorKind.fatal),
+        (TimeoutError(), ErrorKind.transient),
+        (RateLimitError(), ErrorKind.transient),
+        (ValueError(), ErrorKind.other),
+    ],
+)
+def test_classify_error(error, kind):
+    assert classify_error(error) is kind
+
+
+def test_retry_policy_from_config():
+    assert RetryPolicy.from_config({"configurable": {"max_retries": 3}}) == RetryPolicy(
+        max_retries=3
+    )
+    assert RetryPolicy.from_config(
+        {"configurable": {"max_retries": 3, "retry_policy": {"deadline": 10}}}
+    ) == RetryPolicy(max_retries=3, deadline=10)
+
+    policy = RetryPolicy(max_retries=5)
+    assert RetryPolicy.from_config({"configurable": {"retry_policy": policy}}) is policy
+
+
+def test_parse_error_is_repaired():
+    call = FakeCall([OutputParserException("bad json")])
+
+    result = run_with_retry(call, RetryPolicy(max_retries=3), "Test", repair=lambda e: "repaired")
+
+    assert result == "repaired"
+    assert call.calls == 1
+
+
+def test_parse_error_is_retried_without_delay(delays):
+    call = FakeCall([OutputParserException("bad json")])
+
+    assert run_with_retry(call, RetryPolicy(max_retries=3), "Test", repair=lambda e: None) == "result"
+    assert call.calls == 2
+    assert delays == [0.0]
+
+
+def test_transient_error_is_retried_with_backoff(delays):
+    call = FakeCall([StatusError(503), TimeoutError()])
+    policy = RetryPolicy(max_retries=3, initial_delay=1.0, backoff=2.0, jitter=0)
+
+    assert run_with_retry(call, policy, "Test") == "result"
+    assert call.calls == 3
+    assert delays == [1.0, 2.0]
+
+
+def test_fatal_error_is_not_retried(delays):
+    call = FakeCall([StatusError(400)])
+
+    with pytest.raises(RetriesExhaustedError) as error_info:
+        run_with_retry(call, RetryPolicy(max_retries=3), "Test")
+
+    assert isinstance(error_info.value.__cause__, StatusError)
+    assert call.calls == 1
+    assert delays == []
+
+
+def test_retries_are_exhausted(delays):
+    call = FakeCall([ValueError()] * 3)
+
+    with pytest.raises(RetriesExhaustedError):
+        run_with_retry(call, RetryPolicy(max_retries=3, jitter=0), "Test")
+
+    assert call.calls == 3
+    assert len(delays) == 2
+
+
+def test_no_attempt_is_started_after_deadline(delays):
+    call = FakeCall([StatusError(503)])
+    policy = RetryPolicy(max_retries=3, initial_delay=10, jitter=0)
+
+    with pytest.raises(RetriesExhaustedError):
+        run_with_retry(call, policy, "Test", deadline=retry.time.monotonic() + 5)
+
+    assert call.calls == 1
+    assert delays == []
+
+
+def test_policy_deadline_is_counted_from_call(delays):
+    call = FakeCall([StatusError(503)])
+    policy = RetryPolicy(max_retries=3, initial_delay=10, jitter=0, deadline=5)
+
+    with pytest.raises(RetriesExhaustedError):
+        run_with_retry(call, policy, "Test")
+
+    assert call.calls == 1
+
+
+def test_async_retry(delays):
+    call = FakeCall([StatusError(503)])
+
+    async def acall():
+        return call()
+
+    policy = RetryPolicy(max_retries=2, initial_delay=1.0, jitter=0)
+
+    assert asyncio.run(arun_with_retry(acall, policy, "Test")) == "result"
+    assert call.calls == 2
+    assert delays == [1.0]
+
+
+def test_async_fatal_error_is_not_retried(delays):
+    call = FakeCall([StatusError(403)])
+
+    async def acall():
+        return call()
+
+    with pytest.raises(RetriesExhaustedError):
+        asyncio.run(arun_with_retry(acall, RetryPolicy(max_retries=3), "Test"))
+
+    assert call.calls == 1
+
+
+def test_async_attempt_is_cancelled_at_deadline():
+    call = FakeCall([])
+
+    async def acall():
+        call()
+        await asyncio.Event().wait()
+
+    async def run():
+        deadline = retry.time.monotonic() + 0.2
+        with pytest.raises(RetriesExhaustedError) as error_info:
+            await arun_with_retry(acall, RetryPolicy(max_retries=3), "Test", deadline=deadline)
+        return error_info.value, retry.time.monotonic() - deadline
+
+    error, delay = asyncio.run(run())
+
+    assert isinstance(error.__cause__, TimeoutError)
+    assert classify_error(error.__cause__) is ErrorKind.transient
+    assert call.calls == 1
+    assert delay < 0.5
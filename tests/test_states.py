@@ -0,0 +1,90 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.store.memory import InMemoryStore
+from langgraph.types import Command
+
+from protollm.agents.agent_utils.states import (EARLIER_STEPS_TASK,
+                                                MAX_NODES_CALLS,
+                                                MAX_PAST_STEPS,
+                                                BoundedInMemoryStore,
+                                                load_transcript,
+                                                merge_nodes_calls,
+                                                merge_past_steps,
+                                                offload_nodes_calls)
+from protollm.agents.universal_agents import with_offloaded_transcripts
+
+
+def _transcript(text: str) -> list:
+    return [HumanMessage(content=text), AIMessage(content=f"answer to {text}")]
+
+
+def test_merge_past_steps_compacts_older_steps():
+    steps = [(f"task {i}", f"result {i}") for i in range(MAX_PAST_STEPS + 2)]
+
+    merged = merge_past_steps(steps[:5], steps[3:])
+
+    assert merged[0] == (EARLIER_STEPS_TASK, "task 0; task 1")
+    assert merged[1:] == steps[2:]
+    assert merge_past_steps(merged, merged) == merged
+
+
+def test_offloaded_nodes_calls_are_loaded_from_injected_store():
+    store = InMemoryStore()
+    config = {"configurable": {"transcripts_store": store}}
+
+    nodes_calls = offload_nodes_calls([("agent", _transcript("a"))], config)
+    node_name, reference = nodes_calls[0]
+
+    assert node_name == "agent"
+    assert load_transcript(reference, config) == [
+        ["human", "a"],
+        ["ai", "answer to a"],
+    ]
+    assert load_transcript(reference) is None
+    assert offload_nodes_calls(nodes_calls, config) == nodes_calls
+
+
+def test_merge_nodes_calls_keeps_last_calls_without_offloading():
+    calls = [(f"agent {i}", f"transcript:{i}") for i in range(MAX_NODES_CALLS + 1)]
+    raw_call = ("agent", _transcript("a"))
+
+    merged = merge_nodes_calls(calls[:10], calls)
+
+    assert merged == calls[1:]
+    assert merge_nodes_calls([], [raw_call]) == [raw_call]
+
+
+def test_agent_transcripts_are_offloaded_by_node_wrapper():
+    store = InMemoryStore()
+    config = {"configurable": {"transcripts_store": store}}
+
+    def agent_node(state, config):
+        return Command(update={"nodes_calls": [("agent", _transcript(state["task"]))]})
+
+    async def async_agent_node(state):
+        return {"nodes_calls": [("async_agent", _transcript(state["task"]))]}
+
+    command = with_offloaded_transcripts(agent_node)({"task": "a"}, config)
+    update = asyncio.run(
+        with_offloaded_transcripts(async_agent_node)({"task": "b"}, config)
+    )
+
+    for (_, reference), task in [
+        (command.update["nodes_calls"][0], "a"),
+        (update["nodes_calls"][0], "b"),
+    ]:
+        assert load_transcript(reference, config)[0] == ["human", task]
+
+
+def test_bounded_store_keeps_last_items():
+    store = BoundedInMemoryStore(max_items=2)
+    for key in ["a", "b", "c"]:
+        store.put(("namespace",), key, {"value": key})
+
+    assert store.get(("namespace",), "a") is None
+    assert store.get(("namespace",), "b").value == {"value": "b"}
+    assert store.get(("namespace",), "c").value == {"value": "c"}
+
+    asyncio.run(store.aput(("namespace",), "d", {"value": "d"}))
+    assert store.get(("namespace",), "b") is None
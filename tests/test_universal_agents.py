@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from langgraph.types import Command
+
+from protollm.agents import universal_agents
+from protollm.agents.universal_agents import _AgentsCache, _get_chain, _get_parallel_run
+
+
+def _build_chain(llm, prompts: dict):
+    return llm, dict(prompts)
+
+
+def test_chain_is_built_once_for_same_values():
+    llm = object()
+    prompts = {"problem_statement": "a"}
+
+    chain = _get_chain(_build_chain, llm, prompts)
+
+    assert _get_chain(_build_chain, llm, dict(prompts)) is chain
+    assert _get_chain(_build_chain, object(), prompts) is not chain
+
+
+def test_chain_is_rebuilt_after_prompts_are_changed():
+    llm = object()
+    prompts = {"problem_statement": "a"}
+    chain = _get_chain(_build_chain, llm, prompts)
+
+    prompts["problem_statement"] = "b"
+
+    assert _get_chain(_build_chain, llm, prompts) == (llm, {"problem_statement": "b"})
+    assert chain == (llm, {"problem_statement": "a"})
+
+
+def test_agents_cache_is_bounded(monkeypatch):
+    cache = _AgentsCache(max_size=2)
+    monkeypatch.setattr(universal_agents, "_agents_cache", cache)
+    llm = object()
+
+    chains = [_get_chain(_build_chain, llm, {"prompt": str(i)}) for i in range(3)]
+
+    assert len(cache._entries) == 2
+    assert _get_chain(_build_chain, llm, {"prompt": "2"}) is chains[2]
+    assert _get_chain(_build_chain, llm, {"prompt": "0"}) is not chains[0]
+
+
+def _agent_a(state, config):
+    return Command(update={"past_steps": {(state["task"], "A")}})
+
+
+def _agent_b(state, config):
+    return Command(update={"past_steps": {(state["task"], "B")}})
+
+
+def test_parallel_subgraph_is_compiled_once_and_runs_same_agent_twice():
+    config = {"configurable": {"scenario_agent_funcs": {"a": _agent_a, "b": _agent_b}}}
+    state = {"input": "q", "plan": [], "past_steps": set(), "nodes_calls": set()}
+    response = SimpleNamespace(next=["a", "b", "a"])
+
+    subgraph, subgraph_state = _get_parallel_run(state, config, ["t1", "t2", "t3"], response)
+    same_subgraph, _ = _get_parallel_run(state, config, ["t4", "t5", "t6"], response)
+    other_subgraph, _ = _get_parallel_run(state, config, "t1", SimpleNamespace(next=["b"]))
+
+    assert same_subgraph is subgraph
+    assert other_subgraph is not subgraph
+    assert subgraph_state["parallel_tasks"] == {"a": "t1", "b": "t2", "a_2": "t3"}
+    result = subgraph.invoke(subgraph_state, config)
+    assert set(result["past_steps"]) == {("t1", "A"), ("t2", "B"), ("t3", "A")}
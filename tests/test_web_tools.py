@@ -0,0 +1,57 @@
+import asyncio
+
+from langchain_core.tools import tool
+
+from protollm.tools.web_tools import CachedTool, TTLCache
+
+
+def _make_search_tool(calls: list):
+    @tool
+    def search(query: str) -> str:
+        """Searches the query"""
+        calls.append(query)
+        return f"result of {query}"
+
+    return search
+
+
+def test_cached_tool_reuses_results_of_structured_tool():
+    calls = []
+    cached_tool = CachedTool(_make_search_tool(calls))
+
+    assert cached_tool.invoke({"query": "a"}) == "result of a"
+    assert cached_tool.invoke({"query": "a"}) == "result of a"
+    assert cached_tool.invoke("a") == "result of a"
+    assert cached_tool.invoke({"query": "b"}) == "result of b"
+    assert calls == ["a", "b"]
+
+
+def test_cached_tool_async_invoke():
+    calls = []
+    cached_tool = CachedTool(_make_search_tool(calls))
+
+    async def run():
+        return [
+            await cached_tool.ainvoke({"query": "a"}),
+            await cached_tool.ainvoke({"query": "a"}),
+        ]
+
+    assert asyncio.run(run()) == ["result of a", "result of a"]
+    assert cached_tool.invoke({"query": "a"}) == "result of a"
+    assert calls == ["a"]
+
+
+def test_ttl_cache_evicts_expired_and_least_recently_used_entries():
+    cache = TTLCache(ttl=3600, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    expired_cache = TTLCache(ttl=-1)
+    expired_cache.set("a", 1)
+    assert expired_cache.get("a") is None